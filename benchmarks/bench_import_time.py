@@ -0,0 +1,70 @@
+# benchmarks/bench_import_time.py
+# 测量 import geedl 及常用入口的导入耗时，可设置上限作为回归检查（超出时以非零状态退出）
+#
+# Usage:
+#     python benchmarks/bench_import_time.py --repeats 5 --max-ms 50
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+DEFAULT_STATEMENTS = [
+    'import geedl',
+    'import geedl.local.basic.analysis',
+    'from geedl import GEEExecutor',
+    'from geedl import get_any_year_data',
+]
+
+
+def _top_level_imports(statement):
+    """
+    在新的解释器中执行语句，返回 -X importtime 报告的顶层模块及其累计耗时（微秒）。
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name[1:].startswith(' '):  # 嵌套导入的模块名带有额外缩进
+            rows.append((int(cumulative), name.strip()))
+    return rows
+
+
+def import_time(statement, repeats):
+    """
+    返回语句导入耗时的中位数（毫秒，不含解释器启动本身的导入）与其中最慢的顶层模块。
+    """
+    startup = {name for _, name in _top_level_imports('pass')}
+    totals, slowest = [], (0, '')
+    for _ in range(repeats):
+        rows = [(cumulative, name) for cumulative, name in _top_level_imports(statement) if name not in startup]
+        totals.append(sum(cumulative for cumulative, _ in rows) / 1000)
+        slowest = max(rows, default=(0, ''))
+    return statistics.median(totals), slowest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the import time of geedl entry points.")
+    parser.add_argument('--statements', nargs='+', default=DEFAULT_STATEMENTS)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help="fail if 'import geedl' takes longer than this (milliseconds)")
+    args = parser.parse_args()
+
+    print(f"{'statement':<40}{'median (ms)':>13}  slowest top-level module")
+    results = {}
+    for statement in args.statements:
+        median, (cumulative, name) = import_time(statement, args.repeats)
+        results[statement] = median
+        print(f"{statement:<40}{median:>13.1f}  {name} ({cumulative / 1000:.1f} ms)")
+
+    if args.max_ms is not None and results.get('import geedl', 0) > args.max_ms:
+        print(f"'import geedl' took {results['import geedl']:.1f} ms, above the {args.max_ms} ms limit.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_landsat_loader.py
+# 对比 get_any_year_data（逐系列 map + merge）与 get_harmonized_landsat（单次 map）的计算图大小与请求延迟
+#
+# Usage (needs an authenticated Earth Engine session):
+#     python benchmarks/bench_landsat_loader.py --project my-project --start 2000-01-01 --end 2020-12-31
+
+import argparse
+import json
+import time
+
+import ee
+
+from geedl.cloud.data_loader import get_any_year_data, get_harmonized_landsat
+
+BANDS = ['blue', 'green', 'red', 'nir', 'swir1', 'swir2']
+
+
+def graph_stats(obj):
+    encoded = ee.serializer.encode(obj, for_cloud_api=True)
+    return len(encoded.get('values', {})), len(json.dumps(encoded))
+
+
+def request_latency(collection, roi, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        collection.median().reduceRegion(ee.Reducer.mean(), roi, 30).getInfo()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the Landsat loaders.")
+    parser.add_argument('--project', default=None)
+    parser.add_argument('--start', default='2000-01-01')
+    parser.add_argument('--end', default='2020-12-31')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    ee.Initialize(project=args.project)
+    roi = ee.Geometry.Point(116.4, 39.9).buffer(3000)
+    date_range = [args.start, args.end]
+
+    builders = {
+        'any_year': lambda: get_any_year_data(date_range, roi, bands=BANDS),
+        'harmonized': lambda: get_harmonized_landsat(date_range, roi, bands=BANDS),
+        'harmonized+coef': lambda: get_harmonized_landsat(date_range, roi, bands=BANDS, harmonize=True),
+    }
+
+    print(f"{'loader':<18}{'nodes':>8}{'bytes':>10}{'build (ms)':>12}{'request (s)':>13}")
+    for name, build in builders.items():
+        start = time.perf_counter()
+        collection = build()
+        build_ms = (time.perf_counter() - start) * 1000
+        nodes, size = graph_stats(collection)
+        latency = request_latency(collection, roi, args.repeats)
+        print(f"{name:<18}{nodes:>8}{size:>10}{build_ms:>12.1f}{latency:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
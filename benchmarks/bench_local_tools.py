@@ -0,0 +1,73 @@
+# benchmarks/bench_local_tools.py
+# 对比本地工具的 NumPy 进程内引擎与 WhiteboxTools 子进程在大尺寸合成 DEM 上的耗时
+#
+# Usage (needs rasterio and whitebox):
+#     python benchmarks/bench_local_tools.py --size 4000 --repeats 3
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+
+from geedl.local.basic import analysis, management
+
+
+def synthetic_dem(path, size, seed=0):
+    """
+    写出一幅带起伏的合成 DEM（UTM 坐标，30 m 像元）。
+    """
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size] / size
+    dem = (800 * np.sin(3 * x) * np.cos(2 * y) + 300 * x + rng.normal(0, 2, (size, size))).astype('float32')
+    profile = dict(driver='GTiff', width=size, height=size, count=1, dtype='float32', crs='EPSG:32650',
+                   transform=from_origin(500000, 4000000, 30, 30), nodata=-9999, tiled=True,
+                   blockxsize=512, blockysize=512)
+    with rasterio.open(path, 'w', **profile) as dst:
+        dst.write(dem, 1)
+    return path
+
+
+def tool_cases(dem, out_dir):
+    return {
+        'slope': lambda engine: analysis.slope(dem, os.path.join(out_dir, f'slope_{engine}.tif'), engine=engine),
+        'aspect': lambda engine: analysis.aspect(dem, os.path.join(out_dir, f'aspect_{engine}.tif'), engine=engine),
+        'hillshade': lambda engine: analysis.hillshade(dem, os.path.join(out_dir, f'hs_{engine}.tif'), engine=engine),
+        'reclassify': lambda engine: analysis.reclassify(
+            dem, os.path.join(out_dir, f'rc_{engine}.tif'), None, "1;-1000;0;2;0;500;3;500;5000", engine=engine),
+        'resample': lambda engine: management.resample(
+            dem, os.path.join(out_dir, f'rs_{engine}.tif'), 90, "BILINEAR", engine=engine),
+    }
+
+
+def best_time(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the NumPy engine with the WhiteboxTools subprocess.")
+    parser.add_argument('--size', type=int, default=4000, help="DEM width and height in pixels")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--tools', nargs='+', default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        dem = synthetic_dem(os.path.join(out_dir, 'dem.tif'), args.size)
+        cases = tool_cases(dem, out_dir)
+        print(f"{'tool':<12}{'numpy (s)':>12}{'whitebox (s)':>14}{'speedup':>10}")
+        for name in args.tools or cases:
+            native = best_time(lambda: cases[name]('numpy'), args.repeats)
+            whitebox = best_time(lambda: cases[name]('whitebox'), args.repeats)
+            print(f"{name:<12}{native:>12.2f}{whitebox:>14.2f}{whitebox / native:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/offline_ee.py
+# 离线 ee 后端：用录制的算法签名与 API 描述文档初始化 ee（无需认证与网络），网络请求交给可替换的应答函数，用于离线构建并度量计算图
+#
+# Usage:
+#     from offline_ee import initialize_offline
+#     backend = initialize_offline()        # 使用 earthengine-api 自带的 tests/algorithms.json 等录制文件
+#
+# Record the algorithm list of a live session (needs an authenticated Earth Engine session):
+#     python benchmarks/offline_ee.py --record benchmarks/algorithms.json --project my-project
+
+import argparse
+import json
+import os
+import sys
+
+import ee
+
+# Run from a source checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geedl.cloud import fake_ee  # noqa: E402
+from geedl.cloud.fake_ee import load_algorithms  # noqa: E402
+
+
+class OfflineBackend:
+    def __init__(self, responder=None):
+        """
+        替代 ee.data._execute_cloud_call：记录每个请求，并由 responder(method_id, body) 返回响应。
+
+        responder 返回 None 或未设置时，请求以 ee.EEException 失败，保证离线运行不会意外访问网络。
+        """
+        self.responder = responder
+        self.calls = []
+
+    def __call__(self, call, num_retries=None):
+        method = getattr(call, 'methodId', None) or 'unknown'
+        body = getattr(call, 'body', None)
+        self.calls.append(method)
+        response = self.responder(method, json.loads(body) if body else None) if self.responder else None
+        if response is None:
+            raise ee.EEException(f"The offline backend has no response for {method}.")
+        return response
+
+
+def initialize_offline(responder=None, algorithms=None):
+    """
+    使用录制的算法签名初始化 ee，并把所有网络请求交给 OfflineBackend。
+
+    参数:
+        responder (callable): 应答函数 (method_id, body) -> 响应字典（如 {'result': ...}），默认不应答。
+        algorithms (str): 录制的算法列表路径。默认使用 earthengine-api 自带的列表。
+
+    返回:
+        OfflineBackend: 已安装的后端（calls 属性记录全部请求）。
+    """
+    backend = OfflineBackend(responder)
+    fake_ee.initialize_offline(algorithms, project='offline')
+    ee.data._execute_cloud_call = backend
+    return backend
+
+
+def record_algorithms(path, project=None):
+    """
+    在已认证的会话中录制 algorithms.list 的原始响应。
+    """
+    ee.Initialize(project=project)
+    original = ee.data._execute_cloud_call
+    captured = {}
+
+    def capture(call, *args, **kwargs):
+        captured['response'] = original(call, *args, **kwargs)
+        return captured['response']
+
+    ee.data._execute_cloud_call = capture
+    try:
+        ee.data.getAlgorithms()
+    finally:
+        ee.data._execute_cloud_call = original
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(captured['response'], f)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record the Earth Engine algorithm list for offline benchmarks.")
+    parser.add_argument('--record', required=True, help="Output JSON path")
+    parser.add_argument('--project', default=None)
+    args = parser.parse_args()
+    print(f"Recorded {len(load_algorithms(record_algorithms(args.record, args.project)))} algorithms to {args.record}")
+
+
+if __name__ == '__main__':
+    main()
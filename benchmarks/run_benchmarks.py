@@ -0,0 +1,288 @@
+# benchmarks/run_benchmarks.py
+# 离线基准测试套件：云端构建函数的计算图大小与构建耗时（参数扫描，离线 ee 后端），本地栅格工具在不同尺寸合成 DEM 上的耗时，并与基线对比
+#
+# Usage (offline, from a source checkout; the local cases need rasterio and are skipped without it):
+#     python benchmarks/run_benchmarks.py                      # run and compare with benchmarks/baselines.json
+#     python benchmarks/run_benchmarks.py --sizes 512 1024 2048 --repeats 5 --output results.json
+#     python benchmarks/run_benchmarks.py --compare-times      # also gate on timings (baseline machine only)
+#     python benchmarks/run_benchmarks.py --update-baseline    # store the current results as the baseline
+#
+# Exits with status 1 when a case regresses: a graph grows by more than --graph-tolerance, or, with
+# --compare-times, a timing of at least --min-compared-ms slows down by more than --time-tolerance.
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Run from a source checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from offline_ee import initialize_offline  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+ROI_BOUNDS = (116.0, 39.0, 118.0, 41.0)
+BANDS = ['blue', 'green', 'red', 'nir', 'swir1', 'swir2']
+INDICES = ['NDVI', 'EVI', 'SAVI', 'NDWI', 'NBR', 'NDMI', 'GNDVI', 'MSAVI', 'OSAVI', 'NIRv',
+           'MNDWI', 'NBR2', 'NDBI', 'EVI2', 'ARVI', 'GCC', 'RGRI', 'VARI', 'WDRVI']
+
+# Timings shorter than this are too noisy to flag, even with --compare-times
+MIN_COMPARED_MS = 50.0
+
+
+def roi_response(method, body):
+    """
+    离线应答：网格生成器 client 模式请求的研究区范围与几何（本套件中唯一的取值请求）。
+    """
+    if method != 'earthengine.projects.value.compute':
+        return None
+    x0, y0, x1, y1 = ROI_BOUNDS
+    ring = [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+    return {'result': {'bounds': [ring], 'geometry': {'type': 'Polygon', 'coordinates': [ring]}}}
+
+
+# ------------------------
+# Cloud Cases
+# ------------------------
+
+def cloud_cases():
+    """
+    返回 {用例名: 构建函数}；每个构建函数返回一个 ee 对象。
+    """
+    import ee
+    from geedl.cloud.data_loader import get_any_year_data, get_harmonized_landsat
+    from geedl.cloud.data_processing import add_spectral_indices
+    from geedl.cloud.gee_utils import generate_hex_grid, generate_rect_grid, imgCol_merge
+
+    roi = ee.Geometry.Rectangle(list(ROI_BOUNDS))
+    study_area = ee.FeatureCollection(roi)
+    image = ee.Image.constant([0.1] * len(BANDS)).rename(BANDS)
+
+    def landsat(years):
+        return get_any_year_data([f'{2023 - years}-01-01', '2022-12-31'], roi, bands=BANDS)
+
+    # get_any_year_data builds every requested series whatever the dates: sweep the series and scene filters
+    series_options = {'L8': ['L8'], 'L8+L9': ['L8', 'L9'], 'L7+L8+L9': ['L7', 'L8', 'L9'], 'all': None}
+    filter_options = {
+        'none': {},
+        'cloud': {'max_cloud_cover': 30},
+        'cloud+path_rows+months': {'max_cloud_cover': 30, 'path_rows': [(123, 32), (123, 33)], 'months': [6, 7, 8]},
+        'cloud+best_n': {'max_cloud_cover': 30, 'best_n_per_tile': 5},
+    }
+
+    cases = {}
+    for label, series in series_options.items():
+        cases[f'get_any_year_data/series={label}'] = (
+            lambda series=series: get_any_year_data(['2018-01-01', '2022-12-31'], roi, bands=BANDS,
+                                                    landsat_series=series))
+    for label, filters in filter_options.items():
+        cases[f'get_any_year_data/filters={label}'] = (
+            lambda filters=filters: get_any_year_data(['2018-01-01', '2022-12-31'], roi, bands=BANDS, **filters))
+    # get_harmonized_landsat only queries the series operating within the date range
+    for years in (1, 5, 10, 20, 40):
+        for harmonize in (False, True):
+            cases[f'get_harmonized_landsat/years={years}/harmonize={harmonize}'] = (
+                lambda years=years, harmonize=harmonize: get_harmonized_landsat(
+                    [f'{2023 - years}-01-01', '2022-12-31'], roi, bands=BANDS, harmonize=harmonize))
+    for interval in (8, 16, 32):
+        for methods in (['median'], ['median', 'p90', 'count']):
+            cases[f'imgCol_merge/interval={interval}/methods={"+".join(methods)}'] = (
+                lambda interval=interval, methods=methods: imgCol_merge(landsat(5), interval, methods))
+    for count in (1, 5, 10, len(INDICES)):
+        for method in ('planner', 'expression'):
+            cases[f'add_spectral_indices/indices={count}/method={method}'] = (
+                lambda count=count, method=method: add_spectral_indices(image, INDICES[:count], False, method))
+    for size in (0.5, 0.2, 0.1):
+        for mode in ('server', 'client'):
+            cases[f'generate_rect_grid/size={size}/mode={mode}'] = (
+                lambda size=size, mode=mode: generate_rect_grid(study_area, size, size, mode=mode))
+            cases[f'generate_hex_grid/radius={size}/mode={mode}'] = (
+                lambda size=size, mode=mode: generate_hex_grid(study_area, size, mode=mode))
+    return cases
+
+
+def run_cloud(repeats):
+    import ee
+    from geedl.cloud.memo import clear_memo_caches
+
+    initialize_offline(roi_response)
+    results = {}
+    for name, build in cloud_cases().items():
+        timings = []
+        for _ in range(repeats):
+            clear_memo_caches()  # Time the construction, not a memo hit
+            start = time.perf_counter()
+            result = build()
+            encoded = ee.serializer.encode(result, for_cloud_api=True)
+            timings.append(time.perf_counter() - start)
+        row = results[f'cloud/{name}'] = {
+            'nodes': len(encoded.get('values', {})),
+            'bytes': len(json.dumps(encoded)),
+            'ms': round(min(timings) * 1000, 3),
+        }
+        print(f"{name:<56}{row['nodes']:>8}{row['bytes']:>10}{row['ms']:>10.1f}")
+    return results
+
+
+# ------------------------
+# Local Cases
+# ------------------------
+
+def mosaic_tiles(dem, out_dir, overlap=32):
+    """
+    将 DEM 切成 2x2 个相互重叠的瓦片，作为镶嵌的输入。
+    """
+    import rasterio
+    from rasterio.windows import Window
+
+    paths = []
+    with rasterio.open(dem) as src:
+        half_w, half_h = src.width // 2, src.height // 2
+        for row0, col0 in ((0, 0), (0, half_w), (half_h, 0), (half_h, half_w)):
+            window = Window(max(col0 - overlap, 0), max(row0 - overlap, 0),
+                            min(half_w + overlap, src.width - max(col0 - overlap, 0)),
+                            min(half_h + overlap, src.height - max(row0 - overlap, 0)))
+            profile = dict(src.profile, width=int(window.width), height=int(window.height),
+                           transform=src.window_transform(window))
+            path = os.path.join(out_dir, f'tile_{row0}_{col0}.tif')
+            with rasterio.open(path, 'w', **profile) as dst:
+                dst.write(src.read(window=window))
+            paths.append(path)
+    return paths
+
+
+def run_local(sizes, repeats):
+    try:
+        from bench_local_tools import best_time, synthetic_dem, tool_cases
+        from geedl.local.mosaic import mosaic_rasters
+    except ImportError as e:
+        print(f"Skipping the local cases: {e}")
+        return {}
+
+    results = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as out_dir:
+            dem = synthetic_dem(os.path.join(out_dir, 'dem.tif'), size)
+            tools = tool_cases(dem, out_dir)
+            cases = {name: (lambda name=name: tools[name]('numpy'))
+                     for name in ('hillshade', 'aspect', 'resample', 'reclassify')}
+            tiles = mosaic_tiles(dem, out_dir)
+            cases['mosaic'] = lambda: mosaic_rasters(tiles, os.path.join(out_dir, 'mosaic.tif'), 'MEAN')
+            for name, case in cases.items():
+                seconds = best_time(case, repeats)
+                row = results[f'local/{name}/size={size}'] = {
+                    'ms': round(seconds * 1000, 3), 'mpix_per_s': round(size * size / 1e6 / seconds, 3)}
+                print(f"{f'{name}/size={size}':<56}{row['ms']:>12.1f}{row['mpix_per_s']:>12.1f}")
+    return results
+
+
+# ------------------------
+# Baselines
+# ------------------------
+
+def compare(results, baseline, graph_tolerance, time_tolerance=None, min_compared_ms=MIN_COMPARED_MS):
+    """
+    与基线逐项对比。time_tolerance 为 None 时只比较计算图大小（耗时受机器负载影响，默认不作为门槛）。
+
+    返回:
+        list: 退化项 [(用例, 指标, 基线值, 当前值)]。
+    """
+    regressions = []
+    for case, metrics in results.items():
+        base = baseline.get(case)
+        if base is None:
+            continue
+        for metric, value in metrics.items():
+            if metric not in base:
+                continue
+            if metric in ('nodes', 'bytes'):
+                regressed = value > base[metric] * (1 + graph_tolerance)
+            elif metric == 'ms' and time_tolerance is not None:
+                regressed = base[metric] >= min_compared_ms and value > base[metric] * (1 + time_tolerance)
+            else:
+                continue
+            if regressed:
+                regressions.append((case, metric, base[metric], value))
+    return regressions
+
+
+def environment():
+    return {
+        'machine': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks of the cloud builders and local raster tools.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[512, 1024, 2048], help="Synthetic DEM sizes (pixels)")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--skip-cloud', action='store_true')
+    parser.add_argument('--skip-local', action='store_true')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help="Write the results to the baseline file")
+    parser.add_argument('--graph-tolerance', type=float, default=0.0, help="Allowed relative graph growth")
+    parser.add_argument('--compare-times', action='store_true', help="Also flag timing regressions")
+    parser.add_argument('--time-tolerance', type=float, default=0.5, help="Allowed relative slowdown")
+    parser.add_argument('--min-compared-ms', type=float, default=MIN_COMPARED_MS,
+                        help="Shortest baseline timing compared with --compare-times")
+    parser.add_argument('--output', default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    if not args.skip_cloud:
+        print(f"{'cloud case':<56}{'nodes':>8}{'bytes':>10}{'ms':>10}")
+        results.update(run_cloud(args.repeats))
+    if not args.skip_local:
+        print(f"\n{'local case':<56}{'ms':>12}{'Mpix/s':>12}")
+        results.update(run_local(args.sizes, args.repeats))
+
+    report = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        stored = {'environment': environment(), 'results': {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                stored = json.load(f)
+        stored['environment'] = report['environment']
+        stored['results'].update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if args.compare_times and baseline.get('environment', {}).get('machine') != report['environment']['machine']:
+        print("\nNote: the baseline was recorded on a different machine; compare timings with care.")
+    regressions = compare(results, baseline['results'], args.graph_tolerance,
+                          args.time_tolerance if args.compare_times else None, args.min_compared_ms)
+    missing = sorted(set(results) - set(baseline['results']))
+    if missing:
+        print(f"\n{len(missing)} case(s) have no baseline yet: {', '.join(missing)}")
+    if not regressions:
+        print(f"\nNo regressions against {args.baseline}.")
+        return 0
+    print(f"\n{'regression':<56}{'metric':>8}{'baseline':>12}{'current':>12}")
+    for case, metric, base, value in regressions:
+        print(f"{case:<56}{metric:>8}{base:>12.1f}{value:>12.1f}")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
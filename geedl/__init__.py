@@ -1,29 +1,86 @@
 # geedl/__init__.py
+# 子模块及其导出的名称均在首次访问时才导入：import geedl 本身不会加载 ee、IPython 或 Whitebox
 
+import importlib
+import os
 
+# 可按属性访问的子模块，如 geedl.data_loader
+_SUBMODULES = {
+    'data_loader': '.cloud.data_loader',
+    'data_processing': '.cloud.data_processing',
+    'gee_utils': '.cloud.gee_utils',
+    'notebook_utils': '.cloud.notebook_utils',
+    'plotter': '.cloud.plotter',
+    'para': '.cloud.para',
+    'executor': '.cloud.executor',
+    'exporter': '.cloud.exporter',
+    'task_scheduler': '.cloud.task_scheduler',
+    'memo': '.cloud.memo',
+    'sampling': '.cloud.sampling',
+    'profiling': '.cloud.profiling',
+    'fake_ee': '.cloud.fake_ee',
+    'cloud': '.cloud',
+    'local': '.local',
+}
 
-from .cloud import (
-    data_loader,
-    data_processing,
-    gee_utils,
-    notebook_utils,
-    plotter,
-    para
-)
-
-from .cloud import (
-    data_loader,
-    data_processing,
-    gee_utils,
-    notebook_utils,
-    plotter,
-    para
-)
-
-# 可选向后兼容：
-from .cloud.data_loader import *
-from .cloud.data_processing import *
-from .cloud.gee_utils import *
-from .cloud.notebook_utils import *
-from .cloud.plotter import *
-from .cloud.para import *
\ No newline at end of file
+# 可选向后兼容：这些模块 __all__ 中的名称可直接通过 geedl.<name> 访问
+_STAR_MODULES = [
+    'data_loader',
+    'data_processing',
+    'gee_utils',
+    'notebook_utils',
+    'plotter',
+    'para',
+    'executor',
+    'exporter',
+    'task_scheduler',
+    'memo',
+    'sampling',
+    'profiling',
+]
+
+_export_table = None
+
+
+def _module_exports(module_name):
+    """
+    从源码中读取模块的 __all__（不导入模块）。
+    """
+    import ast
+
+    path = os.path.join(os.path.dirname(__file__), *_SUBMODULES[module_name].lstrip('.').split('.')) + '.py'
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(target, 'id', None) == '__all__' for target in node.targets):
+            return ast.literal_eval(node.value)
+    return []
+
+
+def _exports():
+    """
+    返回 {名称: 子模块} 映射；名称重复时以后导入的模块为准（与原先的 import * 顺序一致）。
+    """
+    global _export_table
+    if _export_table is None:
+        _export_table = {name: module_name for module_name in _STAR_MODULES for name in _module_exports(module_name)}
+    return _export_table
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        module = importlib.import_module(_SUBMODULES[name], __name__)
+        globals()[name] = module
+        return module
+    if name == '__all__':
+        return list(_exports())
+    module_name = _exports().get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(__getattr__(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES) | set(_exports()))
@@ -1,15 +1,100 @@
 import ee
 from .para import *
 from .data_processing import *
+from .memo import memoize
+from .profiling import profiled
+
+# -------------------------
+# Scene Metadata Filters
+# -------------------------
+
+# Scene filters that rely on Landsat metadata properties
+_LANDSAT_ONLY_FILTERS = ('max_cloud_cover', 'max_cloud_cover_land', 'path_rows', 'best_n_per_tile')
+
+
+def build_scene_filter(max_cloud_cover=None, max_cloud_cover_land=None, path_rows=None,
+                       doy_range=None, months=None, seasons=None):
+    """
+    Build a server-side filter selecting scenes by their metadata.
+
+    Args:
+        max_cloud_cover (float): Maximum scene CLOUD_COVER, in percent.
+        max_cloud_cover_land (float): Maximum scene CLOUD_COVER_LAND, in percent.
+        path_rows (list): WRS (path, row) pairs to keep, e.g., [(123, 32), (123, 33)].
+        doy_range (tuple): (start, end) day of year, inclusive; wraps around the new year if start > end.
+        months (list): Months to keep (1-12).
+        seasons (list): Season codes to keep, see ``SEASON_MONTHS`` (e.g., ['JJA']).
+
+    Returns:
+        ee.Filter: The combined filter, or None if no filter was requested.
+    """
+    filters = []
+    if max_cloud_cover is not None:
+        filters.append(ee.Filter.lte('CLOUD_COVER', max_cloud_cover))
+    if max_cloud_cover_land is not None:
+        filters.append(ee.Filter.lte('CLOUD_COVER_LAND', max_cloud_cover_land))
+    if path_rows:
+        filters.append(ee.Filter.Or(*[
+            ee.Filter.And(ee.Filter.eq('WRS_PATH', path), ee.Filter.eq('WRS_ROW', row))
+            for path, row in path_rows
+        ]))
+    if doy_range is not None:
+        filters.append(ee.Filter.calendarRange(doy_range[0], doy_range[1], 'day_of_year'))
+
+    month_set = set(months or [])
+    for season in seasons or []:
+        if season not in SEASON_MONTHS:
+            raise ValueError(f"Unsupported season: {season}")
+        month_set.update(SEASON_MONTHS[season])
+    if month_set:
+        filters.append(ee.Filter.Or(*[ee.Filter.calendarRange(month, month, 'month') for month in sorted(month_set)]))
+
+    if not filters:
+        return None
+    return filters[0] if len(filters) == 1 else ee.Filter.And(*filters)
+
+
+def best_scenes_per_tile(collection, n, sort_property='CLOUD_COVER', tile_properties=('WRS_PATH', 'WRS_ROW')):
+    """
+    Keep the ``n`` best scenes of every tile, ranked by a metadata property (lowest first).
+
+    Uses one ``ee.Join`` over the distinct tiles and returns the original scenes, so it can be
+    applied before any pixel-level processing.
+
+    Args:
+        collection (ee.ImageCollection): The input scenes.
+        n (int): Number of scenes to keep per tile.
+        sort_property (str): Property ranking the scenes, ascending (default is 'CLOUD_COVER').
+        tile_properties (tuple): Properties identifying a tile (default is ('WRS_PATH', 'WRS_ROW')).
+
+    Returns:
+        ee.ImageCollection: The selected scenes.
+    """
+    tile_properties = list(tile_properties)
+    conditions = [ee.Filter.equals(leftField=p, rightField=p) for p in tile_properties]
+    condition = conditions[0] if len(conditions) == 1 else ee.Filter.And(*conditions)
+    tiles = ee.Join.saveAll('scenes', ordering=sort_property, ascending=True).apply(
+        primary=collection.distinct(tile_properties),
+        secondary=collection,
+        condition=condition,
+    )
+    best_ids = tiles.map(lambda tile: tile.set(
+        'best_ids', ee.List(tile.get('scenes')).slice(0, n).map(lambda img: ee.Image(img).get('system:index'))
+    )).aggregate_array('best_ids').flatten()
+    return collection.filter(ee.Filter.inList('system:index', best_ids))
+
 
 class DataLoader:
-    def __init__(self, dataset, date_range, roi, bands=None, remove_cloud=True, normalize=True):
+    def __init__(self, dataset, date_range, roi, bands=None, remove_cloud=True, normalize=True, indices=None,
+                 scene_filters=None):
         self.dataset = dataset
         self.date_range = date_range
         self.roi = roi
         self.bands = bands
         self.remove_cloud = remove_cloud
         self.normalize = normalize
+        self.indices = indices
+        self.scene_filters = dict(scene_filters or {})  # Keyword arguments of build_scene_filter, plus 'best_n_per_tile'
         self.cloud_function = None
         self.dataset_ids = DATASET_IDS  # Assuming this is defined globally
 
@@ -24,21 +109,65 @@ class DataLoader:
         else:
             raise ValueError(f"Unsupported dataset: {self.dataset}")
 
+    def selected_bands(self, series):
+        """
+        Get the renamed bands kept for a series: the requested bands (all bands if None),
+        plus the bands needed by ``self.indices``.
+        """
+        bands = list(self.bands) if self.bands else list(RENAMED_BANDS[series])
+        if self.indices:
+            bands += [band for band in required_bands_for_indices(self.indices) if band not in bands]
+        missing = [band for band in bands if band not in RENAMED_BANDS[series]]
+        if missing:
+            raise ValueError(f"Bands {missing} are not available for {series}.")
+        return bands
+
+    def filter_scenes(self, collection):
+        """
+        Apply the metadata scene filters, before any per-pixel work.
+        """
+        options = dict(self.scene_filters)
+        if self.dataset != 'Landsat':
+            unsupported = [key for key in _LANDSAT_ONLY_FILTERS if options.get(key) is not None]
+            if unsupported:
+                raise ValueError(f"Scene filters {unsupported} are only supported for Landsat.")
+        best_n = options.pop('best_n_per_tile', None)
+
+        scene_filter = build_scene_filter(**options)
+        if scene_filter is not None:
+            collection = collection.filter(scene_filter)
+        if best_n:
+            collection = best_scenes_per_tile(collection, best_n)
+        return collection
+
+    def prune_bands(self, collection, series):
+        """
+        Select only the bands that will be used, renamed, plus the QA band when clouds are removed.
+        """
+        bands = self.selected_bands(series)
+        band_map = dict(zip(RENAMED_BANDS[series], ORIGINAL_BANDS[series]))
+        original = [band_map[band] for band in bands]
+        if self.remove_cloud:
+            return collection.select(original + [QA_BANDS[series]], bands + [QA_BANDS[series]])
+        return collection.select(original, bands)
+
     def process_image(self, img, series):
         """
-        Process an image by selecting bands and applying normalization.
+        Process a pruned image: mask clouds, drop the QA band and apply normalization.
         """
-        img = img.select(ORIGINAL_BANDS[series], RENAMED_BANDS[series]).select(self.bands)
+        bands = self.selected_bands(series)
+        masked = self.cloud_function(img) if self.remove_cloud else img
+        result = masked.select(bands)  # QA bits were evaluated once by the cloud function; drop the band
         
         # Apply normalization
         if self.normalize:
             if self.dataset == 'Landsat':
-                img = img.multiply(0.0000275).add(-0.2)  # Landsat normalization
+                result = result.multiply(0.0000275).add(-0.2)  # Landsat normalization
             elif self.dataset == 'MODIS':
-                img = img.multiply(0.0001)  # MODIS normalization
+                result = result.multiply(0.0001)  # MODIS normalization
         
-        # Retain system properties
-        return img.copyProperties(img, ['system:time_start', 'system:time_end', 'system:index'])
+        # Retain system properties of the source image
+        return ee.Image(result.copyProperties(img, ['system:time_start', 'system:time_end', 'system:index']))
 
     def get_image_collection(self, series):
         """
@@ -48,15 +177,16 @@ class DataLoader:
                       .filterBounds(self.roi)
                       .filterDate(self.date_range[0], self.date_range[1]))
 
-        if self.remove_cloud:
-            collection = collection.map(self.cloud_function)
-
+        # Drop scenes by metadata and prune bands before any per-pixel work, then mask and scale in a single map
+        collection = self.filter_scenes(collection)
+        collection = self.prune_bands(collection, series)
         return collection.map(lambda img: self.process_image(img, series))
 
 
 class LandsatProcessor(DataLoader):
-    def __init__(self, date_range, roi, bands=None, remove_cloud=True, normalize=True, landsat_series=None):
-        super().__init__('Landsat', date_range, roi, bands, remove_cloud, normalize)
+    def __init__(self, date_range, roi, bands=None, remove_cloud=True, normalize=True, landsat_series=None, indices=None,
+                 scene_filters=None):
+        super().__init__('Landsat', date_range, roi, bands, remove_cloud, normalize, indices, scene_filters)
         self.landsat_series = landsat_series or ['L5', 'L7', 'L8', 'L9']
         self.set_cloud_function()
 
@@ -68,8 +198,8 @@ class LandsatProcessor(DataLoader):
 
 
 class MODISProcessor(DataLoader):
-    def __init__(self, date_range, roi, bands=None, remove_cloud=True, normalize=True):
-        super().__init__('MODIS', date_range, roi, bands, remove_cloud, normalize)
+    def __init__(self, date_range, roi, bands=None, remove_cloud=True, normalize=True, indices=None, scene_filters=None):
+        super().__init__('MODIS', date_range, roi, bands, remove_cloud, normalize, indices, scene_filters)
         self.set_cloud_function()
 
     def process_series(self):
@@ -79,7 +209,11 @@ class MODISProcessor(DataLoader):
         return self.get_image_collection('MOD09A1')
 
 
-def get_any_year_data(date_range, roi, dataset='Landsat', remove_cloud=True, normalize=True, bands=None, landsat_series=None):
+@profiled
+@memoize
+def get_any_year_data(date_range, roi, dataset='Landsat', remove_cloud=True, normalize=True, bands=None, landsat_series=None,
+                      indices=None, max_cloud_cover=None, max_cloud_cover_land=None, path_rows=None, doy_range=None,
+                      months=None, seasons=None, best_n_per_tile=None):
     """
     Get the image collection for the specified time range and region for Landsat or MODIS datasets.
     
@@ -89,16 +223,35 @@ def get_any_year_data(date_range, roi, dataset='Landsat', remove_cloud=True, nor
         dataset (str): Dataset type ('Landsat' or 'MODIS').
         remove_cloud (bool): Whether to remove clouds from the images.
         normalize (bool): Whether to normalize the images.
-        bands (list): User-defined bands.
+        bands (list): User-defined bands (default is all bands of the series).
         landsat_series (list): Landsat series, e.g., ['L5', 'L7'].
+        indices (list): Spectral indices that will be computed on the result (e.g., ["NDVI"]);
+            the bands they need are kept in addition to ``bands``.
+        max_cloud_cover (float): [Landsat] Maximum scene CLOUD_COVER, in percent.
+        max_cloud_cover_land (float): [Landsat] Maximum scene CLOUD_COVER_LAND, in percent.
+        path_rows (list): [Landsat] WRS (path, row) pairs to keep.
+        doy_range (tuple): (start, end) day of year to keep; wraps around the new year if start > end.
+        months (list): Months to keep (1-12).
+        seasons (list): Seasons to keep, e.g., ['JJA'] (see ``SEASON_MONTHS``).
+        best_n_per_tile (int): [Landsat] Keep only the N least cloudy scenes of each WRS path/row.
+            All scene filters are applied server-side, before cloud masking.
         
     Returns:
         ee.ImageCollection: Processed image collection.
     """
+    scene_filters = {
+        'max_cloud_cover': max_cloud_cover,
+        'max_cloud_cover_land': max_cloud_cover_land,
+        'path_rows': path_rows,
+        'doy_range': doy_range,
+        'months': months,
+        'seasons': seasons,
+        'best_n_per_tile': best_n_per_tile,
+    }
     if dataset == 'Landsat':
-        processor = LandsatProcessor(date_range, roi, bands, remove_cloud, normalize, landsat_series)
+        processor = LandsatProcessor(date_range, roi, bands, remove_cloud, normalize, landsat_series, indices, scene_filters)
     elif dataset == 'MODIS':
-        processor = MODISProcessor(date_range, roi, bands, remove_cloud, normalize)
+        processor = MODISProcessor(date_range, roi, bands, remove_cloud, normalize, indices, scene_filters)
     else:
         raise ValueError(f"Unsupported dataset: {dataset}")
     
@@ -114,8 +267,102 @@ def get_any_year_data(date_range, roi, dataset='Landsat', remove_cloud=True, nor
     return merged_collection.sort('system:time_start')
 
 
+def _clip_date_range(date_range, series):
+    """
+    Intersect the requested date range with the operational window of a Landsat series.
+
+    Returns:
+        tuple: The (start, end) dates to query, or None if the series has no data in the range.
+        Dates that are not 'YYYY-MM-DD' strings (e.g. ee.Date) are passed through unchanged.
+    """
+    start, end = date_range
+    series_start, series_end = SERIES_DATE_RANGES.get(series, (None, None))
+    if not (isinstance(start, str) and isinstance(end, str)):
+        return start, end
+    if series_start and series_start > start:
+        start = series_start
+    if series_end and series_end < end:
+        end = series_end
+    return (start, end) if start < end else None
+
+
+@profiled
+@memoize
+def get_harmonized_landsat(date_range, roi, bands=None, remove_cloud=True, normalize=True,
+                           harmonize=False, landsat_series=None, indices=None):
+    """
+    Get a single harmonized Landsat collection with one mapped function for all series.
+
+    Each series is filtered to the part of ``date_range`` within its operational window (series
+    without data in the range are not queried) and reduced to the requested bands plus QA_PIXEL
+    with a renaming ``select``. The series are merged once, then cloud masking, band selection,
+    scaling and optional TM/ETM+ to OLI harmonization are applied in a single ``map``.
+
+    Args:
+        date_range (list): Start and end dates, e.g., ['2020-01-01', '2020-12-31'].
+        roi (ee.Geometry): Region of interest.
+        bands (list): Renamed bands to return (default is ['blue', 'green', 'red', 'nir', 'swir1', 'swir2']).
+        remove_cloud (bool): Whether to remove clouds from the images.
+        normalize (bool): Whether to scale the images to surface reflectance.
+        harmonize (bool): Whether to harmonize L5/L7 reflectance to L8/L9 OLI (requires ``normalize``),
+            using ``ETM_TO_OLI_COEFFICIENTS``.
+        landsat_series (list): Landsat series, e.g., ['L5', 'L7'] (default is all four).
+        indices (list): Spectral indices that will be computed on the result; the bands they need are kept too.
+
+    Returns:
+        ee.ImageCollection: Processed image collection sorted by time.
+    """
+    bands = list(bands or RENAMED_BANDS['L5'])
+    if indices:
+        bands += [band for band in required_bands_for_indices(indices) if band not in bands]
+    landsat_series = landsat_series or ['L5', 'L7', 'L8', 'L9']
+    if harmonize and not normalize:
+        raise ValueError("harmonize requires normalize=True.")
+    if harmonize and any(band not in ETM_TO_OLI_COEFFICIENTS for band in bands):
+        raise ValueError(f"Harmonization coefficients are only available for {list(ETM_TO_OLI_COEFFICIENTS)}.")
+
+    merged = None
+    for series in landsat_series:
+        window = _clip_date_range(date_range, series)
+        if window is None:
+            continue
+        band_map = dict(zip(RENAMED_BANDS[series], ORIGINAL_BANDS[series]))
+        missing = [band for band in bands if band not in band_map]
+        if missing:
+            raise ValueError(f"Bands {missing} are not available for {series}.")
+        collection = (ee.ImageCollection(DATASET_IDS[series])
+                      .filterBounds(roi)
+                      .filterDate(window[0], window[1])
+                      .select([band_map[band] for band in bands] + [QA_BANDS[series]], bands + [QA_BANDS[series]]))
+        merged = collection if merged is None else merged.merge(collection)
+
+    if merged is None:
+        return ee.ImageCollection([])
+
+    if harmonize:
+        slopes = ee.Image.constant([ETM_TO_OLI_COEFFICIENTS[band][0] - 1 for band in bands])
+        intercepts = ee.Image.constant([ETM_TO_OLI_COEFFICIENTS[band][1] for band in bands])
+        etm_sensors = ee.List(['LANDSAT_5', 'LANDSAT_7'])
+
+    def prepare(img):
+        masked = rm_landsat_cloud(img) if remove_cloud else img
+        result = masked.select(bands)
+        if normalize:
+            result = result.multiply(0.0000275).add(-0.2)
+        if harmonize:
+            # 1 for TM/ETM+ scenes, 0 for OLI: blends the coefficients without a server-side If
+            is_etm = ee.Number(etm_sensors.contains(img.get('SPACECRAFT_ID')))
+            result = result.multiply(slopes.multiply(is_etm).add(1)).add(intercepts.multiply(is_etm))
+        return ee.Image(result.copyProperties(img, img.propertyNames()))
+
+    return merged.map(prepare).sort('system:time_start')
+
+
 __all__ = [
     "get_any_year_data",   # Main function to get the image data
+    "get_harmonized_landsat",  # Single-map Landsat loader with optional cross-sensor harmonization
+    "build_scene_filter",  # Server-side scene filter from metadata (cloud cover, path/row, dates)
+    "best_scenes_per_tile",  # Keep the N best scenes of each WRS tile
     "LandsatProcessor",    # Class for processing Landsat data
     "MODISProcessor",      # Class for processing MODIS data
     "DataLoader"           # Base class for data loading and processing
@@ -3,6 +3,12 @@
 
 from .para import *
 from .notebook_utils import *
+from .index_planner import get_index_plan
+from .memo import cached_getInfo, memoize
+from .profiling import profiled
+from .executor import get_executor
+from .task_scheduler import ACTIVE_STATES
+import math
 import ee
 
 # -------------------------
@@ -20,9 +26,9 @@ def rm_landsat_cloud(image):
         ee.Image: The cloud-masked Landsat image with clouds and cloud shadow pixels removed.
     """
     qa = image.select('QA_PIXEL')  # Quality control band for Landsat
-    cloud_mask = qa.bitwiseAnd(1 << 3).eq(0)  # Cloud bit flag
-    cloud_shadow_mask = qa.bitwiseAnd(1 << 4).eq(0)  # Cloud shadow bit flag
-    return image.updateMask(cloud_mask.And(cloud_shadow_mask))
+    # Cloud (bit 3) and cloud shadow (bit 4) flags, tested in a single bitwiseAnd
+    clear = qa.bitwiseAnd((1 << 3) | (1 << 4)).eq(0)
+    return image.updateMask(clear)
 
 
 def rm_modis_cloud(image):
@@ -36,10 +42,9 @@ def rm_modis_cloud(image):
         ee.Image: The cloud-masked MODIS image with clouds and cloud shadows removed.
     """
     qa = image.select('StateQA')  # Quality control band for MODIS
-    cloud_state_clear = qa.bitwiseAnd(3).eq(0)  # Clear state (Bits 0-1)
-    no_cloud_shadow = qa.bitwiseAnd(1 << 2).eq(0)  # No cloud shadow (Bit 2)
-    no_internal_cloud = qa.bitwiseAnd(1 << 10).eq(0)  # No internal cloud (Bit 10)
-    return image.updateMask(cloud_state_clear.And(no_cloud_shadow).And(no_internal_cloud))
+    # Clear state (Bits 0-1), no cloud shadow (Bit 2) and no internal cloud (Bit 10), tested in a single bitwiseAnd
+    clear = qa.bitwiseAnd(3 | (1 << 2) | (1 << 10)).eq(0)
+    return image.updateMask(clear)
 
 
 def rm_MCD43A4_cloud(image):
@@ -66,7 +71,36 @@ def rm_MCD43A4_cloud(image):
 # Spectral Indices Calculation
 # -----------------------------
 
-def add_spectral_indices(image, indices, keep_original=True):
+def _load_index_catalog():
+    """
+    Load the awesome-spectral-indices catalog and the default values of its constants.
+
+    Both JSON files go through the ``json_fetch`` cache, so only the first call of a process
+    (or none, when the on-disk cache is fresh) touches the network.
+
+    Returns:
+        tuple: (spectral indices dict, constant default values dict).
+    """
+    spectral_indices = json_fetch(SPECTRAL_INDICES_URL)["SpectralIndices"]
+    constants = json_fetch(CONSTANTS_URL)
+    constant_values = {key: value["default"] for key, value in constants.items() if value["default"] is not None}
+    return spectral_indices, constant_values
+
+
+def required_bands_for_indices(indices):
+    """
+    Return the renamed bands (see ``RENAMED_BANDS``) needed to compute a set of spectral indices.
+
+    Args:
+        indices (list): List of spectral indices (e.g., ["NDVI", "EVI"]).
+
+    Returns:
+        list: Band names such as ['nir', 'red'], in the order they are first used.
+    """
+    return [BAND_MAPPING[symbol] for symbol in get_index_plan(indices).bands]
+
+
+def add_spectral_indices(image, indices, keep_original=True, method='planner'):
     """
     Calculate and add the specified spectral indices to a single image.
 
@@ -76,15 +110,20 @@ def add_spectral_indices(image, indices, keep_original=True):
         keep_original (bool): Whether to keep the original image bands.
             - True: Returns an image with both original bands and computed indices.
             - False: Returns an image containing only the computed indices.
+        method (str): How the indices are built.
+            - 'planner': Compile all formulas into one graph with shared subexpressions (default).
+            - 'expression': Build one ``image.expression`` per index.
 
     Returns:
         ee.Image: The image with the computed spectral indices.
     """
-    # Fetch the spectral indices and constants data from the JSON file
-    
-    spectral_indices = json_fetch(SPECTRAL_INDICES_URL)["SpectralIndices"]
-    constants = json_fetch(CONSTANTS_URL)
-    constant_values = {key: value["default"] for key, value in constants.items() if value["default"] is not None}
+    if method == 'planner':
+        return get_index_plan(indices).apply(image, keep_original)
+    elif method != 'expression':
+        raise ValueError(f"Unsupported method: {method}")
+
+    # Fetch the spectral indices and constants data from the (cached) JSON catalog
+    spectral_indices, constant_values = _load_index_catalog()
 
     result_image = image  # Start with the original image
 
@@ -107,7 +146,8 @@ def add_spectral_indices(image, indices, keep_original=True):
     return result_image if keep_original else result_image.select(indices)
 
 
-def add_spectral_indices_to_collection(imgcol, indices, keep_original=True):
+@profiled
+def add_spectral_indices_to_collection(imgcol, indices, keep_original=True, method='planner'):
     """
     Calculate and add the specified spectral indices to each image in an image collection.
 
@@ -117,48 +157,196 @@ def add_spectral_indices_to_collection(imgcol, indices, keep_original=True):
         keep_original (bool): Whether to keep the original image bands.
             - True: Returns an image collection with both original bands and computed indices.
             - False: Returns an image collection containing only the computed indices.
+        method (str): 'planner' (default) or 'expression', see ``add_spectral_indices``.
 
     Returns:
         ee.ImageCollection: The image collection with the computed spectral indices.
     """
-    return imgcol.map(lambda img: add_spectral_indices(img, indices, keep_original))
+    return imgcol.map(lambda img: add_spectral_indices(img, indices, keep_original, method))
 
 
 # ----------------------------
 # Terrain Analysis Functions
 # ----------------------------
 
+# Largest scale ratio aggregated by one reduceResolution step (its maxPixels limit is 65535)
+_MAX_REDUCE_FACTOR = 128
+_TERRAIN_MEAN_BANDS = ['elevation', 'slope', 'hillshade', 'aspect_sin', 'aspect_cos']
+
+
+def _terrain_base(dem):
+    """
+    Terrain layers at the native DEM resolution; aspect is kept as the sine and cosine that can be averaged.
+    """
+    elevation = ee.Image(dem).select([0], ['elevation'])
+    aspect = ee.Terrain.aspect(elevation).multiply(math.pi / 180)
+    return ee.Image.cat([
+        elevation,
+        ee.Terrain.slope(elevation).rename('slope'),
+        ee.Terrain.hillshade(elevation).toFloat().rename('hillshade'),
+        aspect.sin().rename('aspect_sin'),
+        aspect.cos().rename('aspect_cos'),
+        elevation.reduceNeighborhood(ee.Reducer.stdDev(), ee.Kernel.square(1)).rename('roughness'),
+    ])
+
+
+def _terrain_downscale(level, level_scale, scale, projection):
+    """
+    Aggregate a pyramid level to a coarser scale with reduceResolution.
+
+    Mean-type layers (elevation, slope, hillshade, aspect sine / cosine) are averaged;
+    roughness becomes the standard deviation of the finer elevation inside each output pixel.
+    """
+    max_pixels = min(int(math.ceil(scale / level_scale) + 1) ** 2, 65535)
+    means = level.select(_TERRAIN_MEAN_BANDS).reduceResolution(ee.Reducer.mean(), maxPixels=max_pixels)
+    roughness = (level.select('elevation')
+                 .reduceResolution(ee.Reducer.stdDev(), maxPixels=max_pixels)
+                 .rename('roughness'))
+    return means.addBands(roughness).reproject(crs=projection, scale=scale)
+
+
+def _terrain_layers(level, features, tpi_radius):
+    """
+    Select the requested features of a pyramid level, deriving aspect and TPI at the level's scale.
+    """
+    elevation = level.select('elevation')
+    layers = {
+        'elevation': elevation,
+        'slope': level.select('slope'),
+        'aspect': (level.select('aspect_sin').atan2(level.select('aspect_cos'))
+                   .multiply(180 / math.pi).add(360).mod(360).rename('aspect')),
+        'hillshade': level.select('hillshade'),
+        'tpi': elevation.subtract(elevation.focal_mean(tpi_radius, 'square', 'pixels')).rename('tpi'),
+        'roughness': level.select('roughness'),
+    }
+    return ee.Image.cat([layers[feature] for feature in features])
+
+
+def _running_exports(executor):
+    """
+    Return the descriptions of the account's export tasks that are queued or running.
+    """
+    return {task.get('description') for task in executor.call(ee.data.getTaskList) if task.get('state') in ACTIVE_STATES}
+
+
+def _export_terrain_layer(image, asset_id, region, scale):
+    """
+    Start the export of a pyramid level to its cache asset.
+
+    ``start`` is called once, without retries: a start that fails after the server created the
+    task would otherwise queue a duplicate export to the same asset.
+    """
+    task = ee.batch.Export.image.toAsset(
+        image=image.toFloat(),
+        description=asset_id.split('/')[-1],
+        assetId=asset_id,
+        region=region,
+        scale=scale,
+        maxPixels=1e13,
+    )
+    task.start()
+
+
+@memoize
+def _terrain_pyramid_graph(region, scales, features, dem, dem_scale, tpi_radius, resample_method):
+    """
+    Build the computed pyramid levels (no requests, so the result can be memoized).
+    """
+    projection = ee.Image(dem).projection()
+    level = _terrain_base(dem)
+    level_scale = dem_scale
+    pyramid = {}
+    for scale in sorted(set(scales)):
+        # Aggregate step by step, so each reduceResolution stays under its input pixel limit
+        while scale > level_scale:
+            next_scale = min(scale, level_scale * _MAX_REDUCE_FACTOR)
+            level = _terrain_downscale(level, level_scale, next_scale, projection)
+            level_scale = next_scale
+        image = _terrain_layers(level, features, tpi_radius)
+        if scale < dem_scale:
+            image = image.resample(resample_method)
+        pyramid[scale] = image.clip(region)
+    return pyramid
+
+
+@profiled
+def terrain_pyramid(region, scales, features=None, dem=TERRAIN_DEM, tpi_radius=3, resample_method='bilinear',
+                    cache_asset=None, export_missing=False, executor=None, dem_scale=None):
+    """
+    Build terrain features at several scales from one DEM, each level aggregated from the previous one.
+
+    Coarser levels are derived with ``reduceResolution`` (means, with aspect averaged through its
+    sine and cosine and roughness as the standard deviation of the finer elevation) instead of
+    forcing the computation at the target scale with ``reproject``. Scales finer than the DEM are
+    only resampled. TPI is computed at each level's own scale.
+
+    Args:
+        region (ee.Geometry): The region of interest; every level is clipped to it.
+        scales (list): Output resolutions in meters (e.g., [30, 90, 250, 1000]).
+        features (list, optional): Features to return (default is ``TERRAIN_FEATURES``: elevation, slope,
+            aspect, hillshade, tpi, roughness).
+        dem (str): DEM asset ID (default is ``TERRAIN_DEM``, SRTM 30 m).
+        tpi_radius (int): Radius in pixels of the TPI neighborhood (default is 3).
+        resample_method (str): Resampling of levels finer than the DEM (default is 'bilinear').
+        cache_asset (str, optional): Asset ID prefix of precomputed levels, stored as '<prefix>_<scale>m'.
+            Existing assets are read instead of recomputed; they are checked on every call, so a level
+            is read from its asset as soon as its export has finished. Use one prefix per region and feature list.
+        export_missing (bool): Start an export to the cache asset of every missing level that has no export
+            queued or running yet (default is False).
+        executor (GEEExecutor, optional): Executor used for the asset checks and exports (default is the shared executor).
+        dem_scale (float, optional): Native resolution of the DEM in meters (default is ``TERRAIN_DEM_SCALE``
+            for ``TERRAIN_DEM``; for another DEM its nominal scale, fetched once and cached).
+
+    Returns:
+        dict: Scale -> ee.Image with the requested features, for every requested scale.
+    """
+    features = list(features or TERRAIN_FEATURES)
+    unknown = [feature for feature in features if feature not in TERRAIN_FEATURES]
+    if unknown:
+        raise ValueError(f"Unsupported terrain features: {unknown}")
+    executor = executor or get_executor()
+    if dem_scale is None and dem == TERRAIN_DEM:
+        dem_scale = TERRAIN_DEM_SCALE
+    elif dem_scale is None:  # Custom DEM: one request, cached for the session
+        dem_scale = cached_getInfo(ee.Image(dem).projection().nominalScale(), executor=executor)
+
+    pyramid = dict(_terrain_pyramid_graph(region, sorted(set(scales)), features, dem, dem_scale, tpi_radius,
+                                          resample_method))
+    if cache_asset:
+        asset_ids = {scale: f"{cache_asset}_{scale:g}m".replace('.', '_') for scale in pyramid}
+        missing = []
+        for scale, asset_id in asset_ids.items():
+            if executor.call(ee.data.getInfo, asset_id) is not None:
+                pyramid[scale] = ee.Image(asset_id)
+            else:
+                missing.append(scale)
+        if export_missing and missing:
+            # A level whose export is still queued or running is not exported again
+            running = _running_exports(executor)
+            for scale in missing:
+                if asset_ids[scale].split('/')[-1] not in running:
+                    _export_terrain_layer(pyramid[scale], asset_ids[scale], region, scale)
+    return pyramid
+
+
+@profiled
+@memoize
 def calculate_terrain_features(region, resolution, resample_method='bilinear'):
     """
     Calculate terrain features (elevation, slope, and aspect) for a given region.
 
     Args:
         region (ee.Geometry): The region of interest for terrain feature calculation.
-        resolution (int): The target resolution for resampling (in meters).
-        resample_method (str): Resampling method to use. Default is 'bilinear'.
+        resolution (int): The target resolution (in meters).
+        resample_method (str): Resampling method used below the native DEM resolution. Default is 'bilinear'.
 
     Returns:
         ee.Image: An image containing the terrain features (elevation, slope, aspect),
-                  resampled to the specified resolution and clipped to the region.
+                  aggregated to the specified resolution (see ``terrain_pyramid``) and clipped to the region.
     """
-    # Load SRTM data (30m resolution)
-    srtm = ee.Image('USGS/SRTMGL1_003')
-
-    # Calculate slope and aspect
-    slope = ee.Terrain.slope(srtm)
-    aspect = ee.Terrain.aspect(srtm)
-
-    # Combine terrain features (elevation, slope, aspect) into one image
-    terrain_image = srtm.addBands(slope).addBands(aspect).rename(['elevation', 'slope', 'aspect'])
-
-    # Resample to the specified resolution
-    terrain_image_resampled = terrain_image.resample(resample_method)  # Apply resampling method
-    terrain_image_resampled = terrain_image_resampled.reproject(
-        crs=srtm.projection(),
-        scale=resolution  # Set the target resolution
-    ).clip(region)  # Clip the image to the region of interest
-
-    return terrain_image_resampled
+    pyramid = terrain_pyramid(region, [resolution], ['elevation', 'slope', 'aspect'],
+                              resample_method=resample_method)
+    return pyramid[resolution]
 
 
 
@@ -168,8 +356,10 @@ __all__ = [
     "rm_landsat_cloud", 
     "rm_modis_cloud", 
     "rm_MCD43A4_cloud", 
+    "required_bands_for_indices", 
     "add_spectral_indices", 
     "add_spectral_indices_to_collection", 
+    "terrain_pyramid", 
     "calculate_terrain_features", 
 ]
 
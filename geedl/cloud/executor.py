@@ -0,0 +1,220 @@
+# executor.py
+# 统一的 GEE 请求执行器：线程池并发、限流重试（指数退避）与单次调用超时
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Fragments of error messages that mean "try again later" (rate limits, transient backend errors).
+# A bare 'quota' is not enough: storage and asset quota errors are permanent.
+RETRYABLE_MESSAGES = (
+    '429',
+    'too many requests',
+    'too many concurrent',
+    'requests per minute',
+    'rate limit',
+    'resource_exhausted',
+    'resource exhausted',
+    '503',
+    'service unavailable',
+    'backend error',
+    'deadline exceeded',
+    'timed out',
+)
+
+
+def is_retryable_error(error):
+    """
+    Decide whether a failed Earth Engine call is worth retrying.
+
+    Args:
+        error (Exception): The exception raised by the call.
+
+    Returns:
+        bool: True for timeouts, HTTP 429/503 responses and rate-limit errors.
+    """
+    if isinstance(error, TimeoutError):
+        return True
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    if status in (429, 503):
+        return True
+    message = str(error).lower()
+    return any(fragment in message for fragment in RETRYABLE_MESSAGES)
+
+
+def _call_with_timeout(fn, args, kwargs, timeout):
+    """
+    Run a call in a helper thread and give up waiting after ``timeout`` seconds.
+
+    The helper thread is a daemon: a request that never returns cannot be cancelled, but it
+    no longer blocks the worker, which is free to retry.
+    """
+    result = {}
+
+    def target():
+        try:
+            result['value'] = fn(*args, **kwargs)
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"Call to {getattr(fn, '__name__', fn)} timed out after {timeout} s")
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+
+class GEEExecutor:
+    def __init__(self, max_workers=8, max_retries=5, backoff_base=1.0, backoff_max=60.0,
+                 timeout=None, retry_on=is_retryable_error, sleep=time.sleep):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers (int): Maximum number of concurrent Earth Engine calls (default is 8).
+            max_retries (int): Number of retries of a retryable failure before giving up (default is 5).
+            backoff_base (float): Delay before the first retry, in seconds; doubled on every retry (default is 1.0).
+            backoff_max (float): Upper bound of the retry delay, in seconds (default is 60.0).
+            timeout (float, optional): Per-call timeout in seconds; a timed out call counts as retryable (default is None).
+            retry_on (callable): Predicate deciding whether an exception is retryable (default is ``is_retryable_error``).
+            sleep (callable): Function used to wait between retries; replaceable in tests (default is ``time.sleep``).
+        """
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.retry_on = retry_on
+        self.sleep = sleep
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='geedl')
+            return self._pool
+
+    def _backoff(self, attempt):
+        """
+        Return the delay before retry number ``attempt`` (exponential, with jitter).
+        """
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Run a call in the current thread, retrying retryable failures with exponential backoff.
+
+        Args:
+            fn (callable): The function to call, e.g. ``ee.data.listAssets`` or ``obj.getInfo``.
+            *args, **kwargs: Arguments passed to ``fn``.
+
+        Returns:
+            The return value of ``fn``.
+
+        Raises:
+            Exception: The last error if it is not retryable or the retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            try:
+                if self.timeout is None:
+                    return fn(*args, **kwargs)
+                return _call_with_timeout(fn, args, kwargs, self.timeout)
+            except Exception as e:
+                if attempt >= self.max_retries or not self.retry_on(e):
+                    raise
+                self.sleep(self._backoff(attempt))
+                attempt += 1
+
+    def submit(self, fn, *args, retry=True, **kwargs):
+        """
+        Schedule a call on the thread pool.
+
+        Args:
+            fn (callable): The function to call.
+            *args, **kwargs: Arguments passed to ``fn``.
+            retry (bool): Retry the call as ``call`` does (default is True). Pass False when ``fn``
+                already retries its own requests through this executor, so retries do not nest.
+
+        Returns:
+            concurrent.futures.Future: A future resolving to the return value of ``fn``.
+        """
+        if not retry:
+            return self._get_pool().submit(fn, *args, **kwargs)
+        return self._get_pool().submit(self.call, fn, *args, **kwargs)
+
+    def map(self, fn, *iterables, ordered=True):
+        """
+        Run ``fn`` over the items of the iterables concurrently.
+
+        Args:
+            fn (callable): The function to call for each item.
+            *iterables: Argument iterables, as for the built-in ``map``.
+            ordered (bool): Yield results in input order (True, default) or as soon as they complete (False).
+
+        Yields:
+            The results of the calls. An exception raised by a call is re-raised when its result is reached.
+        """
+        futures = [self.submit(fn, *args) for args in zip(*iterables)]
+        try:
+            for future in (futures if ordered else as_completed(futures)):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self, wait=True):
+        """
+        Shut down the thread pool. The executor creates a new pool if it is used again.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+_default_executor = None
+
+
+def get_executor():
+    """
+    Return the process-wide executor shared by geedl functions, creating it on first use.
+
+    Returns:
+        GEEExecutor: The shared executor.
+    """
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = GEEExecutor()
+    return _default_executor
+
+
+def set_executor(executor):
+    """
+    Replace the process-wide executor, e.g. to change the concurrency cap or the retry policy.
+
+    Args:
+        executor (GEEExecutor): The executor used by geedl functions from now on.
+    """
+    global _default_executor
+    _default_executor = executor
+
+
+__all__ = [
+    "GEEExecutor",
+    "is_retryable_error",
+    "get_executor",
+    "set_executor",
+]
@@ -0,0 +1,304 @@
+# exporter.py
+# 分块并发下载 GEE 影像到本地 GeoTIFF / Zarr，支持自动拆分超限请求与断点续传
+
+import hashlib
+import itertools
+import json
+import os
+import time
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import numpy as np
+import ee
+
+from .executor import get_executor
+from .profiling import profiled
+from .notebook_utils import _read_json, _write_json_atomic
+
+try:
+    import rasterio
+    from rasterio.transform import Affine
+    from rasterio.windows import Window
+except ImportError:
+    rasterio = None
+
+try:
+    import zarr
+except ImportError:
+    zarr = None
+
+# Limits of a single computePixels / getPixels request
+MAX_REQUEST_BYTES = 48 * 1024 * 1024
+MAX_REQUEST_DIMENSION = 32768
+
+# The resume manifest is saved after this many finished tiles or seconds, and when the export stops
+_MANIFEST_SAVE_EVERY = 50
+_MANIFEST_SAVE_SECONDS = 10.0
+
+# Error messages meaning "the request is too large", answered by splitting the window
+_TOO_LARGE_MESSAGES = ('request size', 'too large', 'must be less than or equal to', 'payload')
+
+# ee.Image methods casting to each output data type
+_EE_CASTS = {
+    'uint8': 'toUint8',
+    'int8': 'toInt8',
+    'uint16': 'toUint16',
+    'int16': 'toInt16',
+    'uint32': 'toUint32',
+    'int32': 'toInt32',
+    'float32': 'toFloat',
+    'float64': 'toDouble',
+}
+
+
+class PixelWindow(namedtuple('PixelWindow', ['col', 'row', 'width', 'height'])):
+    """
+    A rectangle of the output raster, in pixels (column/row offsets from the top-left corner).
+    """
+    __slots__ = ()
+
+    @property
+    def key(self):
+        return f"{self.col}_{self.row}_{self.width}_{self.height}"
+
+    def split(self):
+        """
+        Split the window in two along its longer side.
+        """
+        if self.width >= self.height:
+            half = self.width // 2
+            return [PixelWindow(self.col, self.row, half, self.height),
+                    PixelWindow(self.col + half, self.row, self.width - half, self.height)]
+        half = self.height // 2
+        return [PixelWindow(self.col, self.row, self.width, half),
+                PixelWindow(self.col, self.row + half, self.width, self.height - half)]
+
+
+def _tile_bounds(tiles, executor):
+    """
+    Return (min_x, min_y, max_x, max_y) of every tile.
+
+    ``tiles`` can be an ee.FeatureCollection (e.g. from ``generate_rect_grid``, fetched with one request),
+    a list of ``Tile`` objects from ``gee_utils`` or a list of bounds tuples.
+    """
+    if isinstance(tiles, ee.FeatureCollection):
+        boxes = executor.call(tiles.map(
+            lambda f: ee.Feature(None, {'bbox': f.geometry().bounds().coordinates().get(0)})
+        ).aggregate_array('bbox').getInfo)
+        return [(ring[0][0], ring[0][1], ring[2][0], ring[2][1]) for ring in boxes]
+    return [tuple(tile.bounds) if hasattr(tile, 'bounds') else tuple(tile) for tile in tiles]
+
+
+def _window_from_bounds(bounds, origin_x, origin_y, scale):
+    """
+    Snap tile bounds to the output pixel grid.
+    """
+    col0 = int(np.floor((bounds[0] - origin_x) / scale + 1e-9))
+    col1 = int(np.ceil((bounds[2] - origin_x) / scale - 1e-9))
+    row0 = int(np.floor((origin_y - bounds[3]) / scale + 1e-9))
+    row1 = int(np.ceil((origin_y - bounds[1]) / scale - 1e-9))
+    return PixelWindow(col0, row0, max(col1 - col0, 1), max(row1 - row0, 1))
+
+
+def _fits(window, n_bands, itemsize, max_request_bytes):
+    return (window.width <= MAX_REQUEST_DIMENSION and window.height <= MAX_REQUEST_DIMENSION
+            and window.width * window.height * n_bands * itemsize <= max_request_bytes)
+
+
+def _request_windows(window, n_bands, itemsize, max_request_bytes):
+    """
+    Subdivide a window until every part fits in a single request.
+    """
+    if _fits(window, n_bands, itemsize, max_request_bytes):
+        return [window]
+    return [part for half in window.split() for part in _request_windows(half, n_bands, itemsize, max_request_bytes)]
+
+
+def _is_too_large(error):
+    message = str(error).lower()
+    return any(fragment in message for fragment in _TOO_LARGE_MESSAGES)
+
+
+class _GeoTiffWriter:
+    """
+    Windowed writer of a tiled GeoTIFF; reopened in update mode when resuming.
+    """
+
+    def __init__(self, path, width, height, count, dtype, origin, scale, crs, nodata, resume, block_size=512):
+        if rasterio is None:
+            raise ImportError("rasterio is required to write GeoTIFF files.")
+        if resume and os.path.exists(path):
+            self.dataset = rasterio.open(path, 'r+')
+        else:
+            self.dataset = rasterio.open(
+                path, 'w', driver='GTiff', width=width, height=height, count=count, dtype=dtype,
+                crs=crs, transform=Affine(scale, 0, origin[0], 0, -scale, origin[1]), nodata=nodata,
+                tiled=True, blockxsize=block_size, blockysize=block_size, compress='deflate', BIGTIFF='IF_SAFER',
+            )
+
+    def write(self, window, data):
+        self.dataset.write(data, window=Window(window.col, window.row, window.width, window.height))
+
+    def close(self):
+        self.dataset.close()
+
+
+class _ZarrWriter:
+    """
+    Writer of a chunked Zarr array of shape (bands, rows, columns), with the georeferencing in its attributes.
+    """
+
+    def __init__(self, path, width, height, count, dtype, origin, scale, crs, nodata, resume, block_size=512):
+        if zarr is None:
+            raise ImportError("zarr is required to write Zarr stores.")
+        mode = 'a' if resume and os.path.exists(path) else 'w'
+        self.array = zarr.open(path, mode=mode, shape=(count, height, width), chunks=(1, block_size, block_size),
+                               dtype=dtype, fill_value=nodata)
+        self.array.attrs.update({'crs': crs, 'transform': [scale, 0, origin[0], 0, -scale, origin[1]], 'nodata': nodata})
+
+    def write(self, window, data):
+        self.array[:, window.row:window.row + window.height, window.col:window.col + window.width] = data
+
+    def close(self):
+        pass
+
+
+@profiled
+def export_tiles(image, tiles, out_path, scale, crs='EPSG:4326', bands=None, dtype='float32', nodata=None,
+                 out_format=None, composite='median', max_request_bytes=MAX_REQUEST_BYTES,
+                 resume=True, executor=None, pixel_source=None):
+    """
+    Download an image tile by tile and stream the pixels into one local GeoTIFF or Zarr store.
+
+    Tiles are requested concurrently through the executor with ``ee.data.computePixels``. Tiles larger
+    than the request limits are subdivided before they are sent, and again whenever the server rejects
+    a request as too large. Pixels are written window by window, so the mosaic is never held in memory.
+    Completed tiles are recorded in '<out_path>.manifest.json'; rerunning the same export resumes.
+
+    Args:
+        image (ee.Image or ee.ImageCollection): The image to export; a collection is reduced with ``composite`` first.
+        tiles: Tiles covering the export, in ``crs`` units: an ee.FeatureCollection (e.g. from ``generate_rect_grid``),
+            a list of ``Tile`` objects, or a list of (min_x, min_y, max_x, max_y) tuples.
+        out_path (str): Output path; '.zarr' selects the Zarr writer, anything else a GeoTIFF.
+        scale (float): Pixel size in ``crs`` units (degrees for the default EPSG:4326).
+        crs (str): Output coordinate reference system (default is 'EPSG:4326').
+        bands (list, optional): Bands to export (default is all bands, read with one request).
+        dtype (str): Output data type (default is 'float32').
+        nodata (float, optional): Value stored for masked pixels (default is NaN for float types, 0 otherwise).
+        out_format (str, optional): 'GTiff' or 'zarr', overriding the choice by file extension.
+        composite (str): Reducer method applied to an ee.ImageCollection (default is 'median').
+        max_request_bytes (int): Largest payload of a single request (default is ``MAX_REQUEST_BYTES``).
+        resume (bool): Skip the tiles recorded in an existing manifest (default is True).
+        executor (GEEExecutor, optional): Executor running the downloads (default is the shared executor).
+        pixel_source (callable, optional): Replacement of ``ee.data.computePixels`` taking the request dict
+            and returning a structured or (rows, cols, bands) NumPy array, e.g. a fake endpoint for tests.
+
+    Returns:
+        str: ``out_path``.
+    """
+    executor = executor or get_executor()
+    pixel_source = pixel_source or ee.data.computePixels
+    dtype = np.dtype(dtype)
+    if nodata is None:
+        nodata = float('nan') if dtype.kind == 'f' else 0
+
+    if isinstance(image, ee.ImageCollection):
+        image = getattr(image, composite)()
+    if bands is None:
+        bands = executor.call(image.bandNames().getInfo)
+    expression = getattr(image.select(bands).unmask(nodata), _EE_CASTS[dtype.name])()
+
+    # Output grid: union of the tile bounds, with the origin at its top-left corner
+    bounds = _tile_bounds(tiles, executor)
+    if not bounds:
+        raise ValueError("No tiles to export.")
+    origin = (min(b[0] for b in bounds), max(b[3] for b in bounds))
+    windows = [_window_from_bounds(b, origin[0], origin[1], scale) for b in bounds]
+    width = max(w.col + w.width for w in windows)
+    height = max(w.row + w.height for w in windows)
+
+    # Resume: reuse the manifest only if it describes the same export
+    manifest_path = f"{out_path}.manifest.json"
+    signature = hashlib.sha1(json.dumps(
+        [crs, scale, origin, width, height, list(bands), dtype.name, sorted(w.key for w in windows)]
+    ).encode('utf-8')).hexdigest()
+    manifest = _read_json(manifest_path) if resume else None
+    if not manifest or manifest.get('signature') != signature:
+        manifest = {'signature': signature, 'done': []}
+        resume = False
+    done = set(manifest['done'])
+
+    out_format = out_format or ('zarr' if out_path.rstrip('/').endswith('.zarr') else 'GTiff')
+    writer_class = _ZarrWriter if out_format.lower() == 'zarr' else _GeoTiffWriter
+    writer = writer_class(out_path, width, height, len(bands), dtype.name, origin, scale, crs, nodata, resume)
+
+    def fetch(window):
+        """
+        Download one window, splitting it when the server rejects it as too large.
+        """
+        params = {
+            'expression': expression,
+            'fileFormat': 'NUMPY_NDARRAY',
+            'bandIds': list(bands),
+            'grid': {
+                'dimensions': {'width': window.width, 'height': window.height},
+                'affineTransform': {
+                    'scaleX': scale, 'shearX': 0, 'translateX': origin[0] + window.col * scale,
+                    'shearY': 0, 'scaleY': -scale, 'translateY': origin[1] - window.row * scale,
+                },
+                'crsCode': crs,
+            },
+        }
+        try:
+            data = executor.call(pixel_source, params)
+        except Exception as e:
+            if not _is_too_large(e) or (window.width <= 1 and window.height <= 1):
+                raise
+            return [part for half in window.split() for part in fetch(half)]
+        if data.dtype.names:  # Structured array with one field per band
+            data = np.stack([data[name] for name in data.dtype.names])
+        else:
+            data = np.moveaxis(data.reshape(window.height, window.width, -1), -1, 0)
+        return [(window, data.astype(dtype, copy=False))]
+
+    def fetch_tile(tile_window):
+        parts = _request_windows(tile_window, len(bands), dtype.itemsize, max_request_bytes)
+        return tile_window, [piece for part in parts for piece in fetch(part)]
+
+    # Download with a bounded number of tiles in flight; write from this thread only. Only the pixel
+    # requests are retried: retrying a whole tile would download its finished sub-windows again
+    pending = iter([w for w in windows if w.key not in done])
+    in_flight = deque(executor.submit(fetch_tile, w, retry=False)
+                      for w in itertools.islice(pending, 2 * executor.max_workers))
+    unsaved, saved_at = 0, time.monotonic()
+    try:
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                in_flight.remove(future)
+                tile_window, pieces = future.result()
+                for window, data in pieces:
+                    writer.write(window, data)
+                manifest['done'].append(tile_window.key)
+                unsaved += 1
+                # Rewriting the whole manifest per tile would cost O(n^2) I/O on large tilings
+                if unsaved >= _MANIFEST_SAVE_EVERY or time.monotonic() - saved_at >= _MANIFEST_SAVE_SECONDS:
+                    _write_json_atomic(manifest_path, manifest)
+                    unsaved, saved_at = 0, time.monotonic()
+                for next_window in itertools.islice(pending, 1):
+                    in_flight.append(executor.submit(fetch_tile, next_window, retry=False))
+    finally:
+        for future in in_flight:
+            future.cancel()
+        writer.close()
+        if unsaved:  # After close, so every tile marked done is on disk
+            _write_json_atomic(manifest_path, manifest)
+    return out_path
+
+
+__all__ = [
+    "MAX_REQUEST_BYTES",
+    "PixelWindow",
+    "export_tiles",
+]
@@ -0,0 +1,1350 @@
+# fake_ee.py
+# 离线 Earth Engine 替身：内存中的资产树与小型合成影像集，拦截 ee.data 调用（资产增删改查、getInfo/computeValue），可注入延迟与错误，用于测试、压测与计算图试运行
+
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+import numpy as np
+import ee
+
+from .para import DATASET_IDS, ORIGINAL_BANDS, QA_BANDS, SERIES_DATE_RANGES, TERRAIN_DEM
+
+# Default error of the error injection: recognized as retryable by GEEExecutor
+RATE_LIMIT_MESSAGE = "429 Too Many Requests: Quota exceeded, rate limit reached."
+
+# ee.data functions served by the fake backend
+_DATA_FUNCTIONS = ('listAssets', 'listImages', 'getAsset', 'getInfo', 'createAsset', 'createFolder',
+                   'copyAsset', 'renameAsset', 'deleteAsset', 'computeValue')
+
+_CONTAINERS = ('FOLDER', 'IMAGE_COLLECTION')
+
+# Meters per degree at the equator, used for the nominal scale of the synthetic EPSG:4326 bands
+_METERS_PER_DEGREE = 111319.49
+
+_installed = []  # The installed fake backend, if any
+
+
+# ------------------------
+# Offline Initialization
+# ------------------------
+
+def _recorded_file(name):
+    return os.path.join(os.path.dirname(ee.__file__), 'tests', name)
+
+
+def load_algorithms(path=None):
+    """
+    Load a recorded ``algorithms.list`` response in the format returned by ``ee.data.getAlgorithms()``.
+
+    Args:
+        path (str, optional): Recorded JSON file (default is the list shipped with earthengine-api in ``ee/tests``).
+
+    Returns:
+        dict: The algorithm signatures.
+    """
+    from ee import _cloud_api_utils
+
+    path = path or _recorded_file('algorithms.json')
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No recorded algorithm list at {path}; record one from a live session.")
+    with open(path, encoding='utf-8') as f:
+        return _cloud_api_utils.convert_algorithms(json.load(f))
+
+
+def _install_offline_resources():
+    """
+    Build the Cloud API request objects from the discovery document shipped with earthengine-api.
+    """
+    from ee import _cloud_api_utils
+
+    with open(_recorded_file('cloud_api_discovery_document.json'), encoding='utf-8') as f:
+        document = json.load(f)
+    state = ee.data._get_state()
+    for attribute, raw in (('cloud_api_resource', False), ('cloud_api_resource_raw', True)):
+        setattr(state, attribute, _cloud_api_utils.build_cloud_resource_from_document(
+            document, headers_supplier=ee.data._make_request_headers,
+            response_inspector=ee.data._handle_response_headers, raw=raw))
+
+
+def _offline_patches(algorithms=None):
+    signatures = load_algorithms(algorithms)
+    return {
+        (ee.data, '_install_cloud_api_resource'): _install_offline_resources,
+        (ee.data, 'getAlgorithms'): lambda: signatures,
+        (ee.deprecation, '_FetchDataCatalogStac'): lambda: {'links': []},
+    }
+
+
+def initialize_offline(algorithms=None, project='fake-project'):
+    """
+    Initialize the ee library without credentials or network, from recorded algorithm signatures.
+
+    ee objects can then be built and serialized; requests still need a backend (see ``FakeEarthEngine``).
+
+    Args:
+        algorithms (str, optional): Recorded algorithm list (default is the one shipped with earthengine-api).
+        project (str): Cloud project reported by the library (default is 'fake-project').
+    """
+    for (owner, name), value in _offline_patches(algorithms).items():
+        setattr(owner, name, value)
+    ee.Reset()
+    ee.Initialize(None, '', project=project)
+
+
+# ------------------------
+# Values
+# ------------------------
+
+class _Date(int):
+    """Milliseconds since the epoch, fetched as an ee Date."""
+
+
+class _DateRange(tuple):
+    """(start, end) in milliseconds, end excluded."""
+
+
+class _Element:
+    """
+    An image or feature: band metadata (images only), properties and an optional GeoJSON geometry.
+    """
+
+    def __init__(self, kind, bands=None, properties=None, geometry=None):
+        self.kind = kind
+        self.bands = list(bands or [])
+        self.properties = dict(properties or {})
+        self.geometry = geometry
+
+    def copy(self, **changes):
+        element = _Element(self.kind, self.bands, self.properties, self.geometry)
+        for name, value in changes.items():
+            setattr(element, name, value)
+        return element
+
+    def get(self, name):
+        return self.geometry if name == '.geo' else self.properties.get(name)
+
+    def band_names(self):
+        return [band['id'] for band in self.bands]
+
+
+class _Collection:
+    def __init__(self, kind, elements, properties=None):
+        self.kind = kind
+        self.elements = list(elements)
+        self.properties = dict(properties or {})
+
+    def copy(self, **changes):
+        collection = _Collection(self.kind, self.elements, self.properties)
+        for name, value in changes.items():
+            setattr(collection, name, value)
+        return collection
+
+    def get(self, name):
+        return self.properties.get(name)
+
+
+class _Reducer:
+    def __init__(self, outputs):
+        self.outputs = outputs  # [(output name, function of a list of values)]
+
+
+class _Join:
+    def __init__(self, kind, **options):
+        self.kind = kind
+        self.options = options
+
+
+def _band(name, precision='float', scale=30):
+    degrees = scale / _METERS_PER_DEGREE
+    return {'id': name, 'data_type': {'type': 'PixelType', 'precision': precision}, 'crs': 'EPSG:4326',
+            'crs_transform': [degrees, 0, 0, 0, -degrees, 0]}
+
+
+def _image(bands, properties=None, geometry=None, scale=30):
+    return _Element('Image', [_band(name, scale=scale) if isinstance(name, str) else name for name in bands],
+                    properties, geometry)
+
+
+def _to_info(value):
+    """
+    Convert an evaluated value to what ``getInfo()`` returns.
+    """
+    if isinstance(value, _Element):
+        if value.kind == 'Image':
+            info = {'type': 'Image', 'bands': [dict(band) for band in value.bands],
+                    'properties': _to_info(value.properties)}
+            if value.properties.get('system:id') is not None:
+                info['id'] = value.properties['system:id']
+            return info
+        properties = {k: v for k, v in value.properties.items() if k != 'system:index'}
+        return {'type': 'Feature', 'geometry': value.geometry, 'id': value.properties.get('system:index'),
+                'properties': _to_info(properties)}
+    if isinstance(value, _Collection):
+        info = {'type': value.kind, 'features': [_to_info(element) for element in value.elements]}
+        info['bands' if value.kind == 'ImageCollection' else 'columns'] = [] if value.kind == 'ImageCollection' else {}
+        if value.properties:
+            info['properties'] = _to_info(value.properties)
+        return info
+    if isinstance(value, _Date):
+        return {'type': 'Date', 'value': int(value)}
+    if isinstance(value, _DateRange):
+        return {'type': 'DateRange', 'dates': list(value)}
+    if isinstance(value, dict):
+        return {key: _to_info(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_info(item) for item in value]
+    if isinstance(value, (_Reducer, _Join)) or callable(value):
+        raise ee.EEException(f"Cannot fetch a {type(value).__name__.strip('_')} with the fake backend.")
+    return value
+
+
+# ------------------------
+# Dates and Geometries
+# ------------------------
+
+def _millis(value):
+    """
+    Convert an ee date value (milliseconds, ISO string, datetime or Date) to milliseconds since the epoch.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        text = str(value).replace('Z', '+00:00')
+        for fmt in ('%Y', '%Y-%m'):
+            try:
+                parsed = datetime.strptime(text, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def _datetime(millis):
+    return datetime.fromtimestamp(millis / 1000, tz=timezone.utc)
+
+
+def _advance(millis, delta, unit):
+    moment = _datetime(millis)
+    if unit in ('year', 'month'):
+        months = moment.month - 1 + int(delta) * (12 if unit == 'year' else 1)
+        year, month = moment.year + months // 12, months % 12 + 1
+        day = min(moment.day, [31, 29 if year % 4 == 0 and (year % 100 or year % 400 == 0) else 28,
+                               31, 30, 31, 30, 31, 31, 30, 31, 30, 31][month - 1])
+        return _Date(_millis(moment.replace(year=year, month=month, day=day)))
+    seconds = {'week': 604800, 'day': 86400, 'hour': 3600, 'minute': 60, 'second': 1}[unit]
+    return _Date(int(millis + delta * seconds * 1000))
+
+
+def _date_field(millis, field):
+    """
+    Calendar field of a date, as used by ``ee.Filter.calendarRange`` and ``ee.Date.get``.
+    """
+    moment = _datetime(millis)
+    if field == 'day_of_year':
+        return moment.timetuple().tm_yday
+    if field == 'day_of_week':
+        return moment.isoweekday()
+    if field == 'week_of_year':
+        return moment.isocalendar()[1]
+    return getattr(moment, {'day_of_month': 'day'}.get(field, field))
+
+
+def _format_date(millis, pattern):
+    tokens = {'yyyy': '%Y', 'MM': '%m', 'dd': '%d', 'HH': '%H', 'mm': '%M', 'ss': '%S', 'DDD': '%j'}
+    pattern = pattern or "yyyy-MM-dd'T'HH:mm:ss"
+    converted = re.sub('|'.join(tokens), lambda match: tokens[match.group(0)], pattern.replace("'", ''))
+    return _datetime(millis).strftime(converted)
+
+
+def _coordinates(geometry):
+    """
+    Yield every (x, y) vertex of a GeoJSON geometry.
+    """
+    if geometry is None:
+        return
+    if geometry.get('type') == 'GeometryCollection':
+        for part in geometry['geometries']:
+            yield from _coordinates(part)
+        return
+    stack = [geometry.get('coordinates', [])]
+    while stack:
+        item = stack.pop()
+        if item and isinstance(item[0], (int, float)):
+            yield item[0], item[1]
+        else:
+            stack.extend(item)
+
+
+def _bbox(geometry):
+    points = list(_coordinates(geometry))
+    if not points:
+        return None
+    xs, ys = zip(*points)
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _bbox_polygon(bounds):
+    x0, y0, x1, y1 = bounds
+    return {'type': 'Polygon', 'coordinates': [[[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]]}
+
+
+def _rectangle(coordinates, **_):
+    flat = list(np.ravel(coordinates))
+    return _bbox_polygon((min(flat[0], flat[2]), min(flat[1], flat[3]), max(flat[0], flat[2]), max(flat[1], flat[3])))
+
+
+def _geometry(value):
+    """
+    GeoJSON geometry of a geometry, element or collection operand.
+    """
+    if isinstance(value, _Element):
+        return value.geometry
+    if isinstance(value, _Collection):
+        return {'type': 'GeometryCollection', 'geometries': [e.geometry for e in value.elements if e.geometry]}
+    return value
+
+
+def _intersects(left, right):
+    """
+    Bounding-box test; a side without geometry (e.g. a synthetic image without footprint) always intersects.
+    """
+    a, b = _bbox(_geometry(left)), _bbox(_geometry(right))
+    if a is None or b is None:
+        return True
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+# ------------------------
+# Graph Functions
+# ------------------------
+
+_FUNCTIONS = {}
+
+
+def _function(*names):
+    def register(fn):
+        for name in names:
+            _FUNCTIONS[name] = fn
+        return fn
+    return register
+
+
+def _operands(leftField=None, leftValue=None, rightField=None, rightValue=None):
+    """
+    Return a function (left element, right element) -> (left operand, right operand) for a binary filter.
+    In ``Collection.filter`` both elements are the tested element; in ``Join.apply`` they are the primary and secondary.
+    """
+    def resolve(left, right):
+        lhs = left.get(leftField) if leftField is not None else leftValue
+        rhs = right.get(rightField) if rightField is not None else rightValue
+        return lhs, rhs
+    return resolve
+
+
+def _comparison(test):
+    def build(fake, **args):
+        operands = _operands(**{k: v for k, v in args.items() if k in ('leftField', 'leftValue', 'rightField', 'rightValue')})
+
+        def apply(left, right):
+            lhs, rhs = operands(left, right)
+            if lhs is None or rhs is None:
+                return False
+            return test(lhs, rhs)
+        return apply
+    return build
+
+
+for _name, _test in {
+    'Filter.equals': lambda a, b: a == b,
+    'Filter.notEquals': lambda a, b: a != b,
+    'Filter.lessThan': lambda a, b: a < b,
+    'Filter.lessThanOrEquals': lambda a, b: a <= b,
+    'Filter.greaterThan': lambda a, b: a > b,
+    'Filter.greaterThanOrEquals': lambda a, b: a >= b,
+    'Filter.listContains': lambda a, b: b in a,
+    'Filter.stringContains': lambda a, b: b in a,
+    'Filter.stringStartsWith': lambda a, b: a.startswith(b),
+    'Filter.stringEndsWith': lambda a, b: a.endswith(b),
+    'Filter.dateRangeContains': lambda a, b: a[0] <= _millis(b) < a[1],
+}.items():
+    _FUNCTIONS[_name] = _comparison(_test)
+
+
+@_function('Filter.intersects')
+def _filter_intersects(fake, leftField=None, leftValue=None, rightField=None, rightValue=None, maxError=None):
+    operands = _operands(leftField, leftValue, rightField, rightValue)
+    return lambda left, right: _intersects(*operands(left, right))
+
+
+@_function('Filter.maxDifference')
+def _filter_max_difference(fake, difference, leftField=None, rightValue=None, rightField=None, leftValue=None):
+    operands = _operands(leftField, leftValue, rightField, rightValue)
+
+    def apply(left, right):
+        lhs, rhs = operands(left, right)
+        return lhs is not None and rhs is not None and abs(lhs - rhs) <= difference
+    return apply
+
+
+@_function('Filter.calendarRange')
+def _filter_calendar_range(fake, start, end=None, field='day_of_year'):
+    end = start if end is None else end
+
+    def apply(left, right):
+        millis = left.get('system:time_start')
+        if millis is None:
+            return False
+        value = _date_field(millis, field)
+        return start <= value <= end if start <= end else (value >= start or value <= end)
+    return apply
+
+
+_FUNCTIONS['Filter.and'] = lambda fake, filters: lambda l, r: all(f(l, r) for f in filters)
+_FUNCTIONS['Filter.or'] = lambda fake, filters: lambda l, r: any(f(l, r) for f in filters)
+_FUNCTIONS['Filter.not'] = lambda fake, filter: lambda l, r: not filter(l, r)
+
+
+# Collections
+
+@_function('ImageCollection.load')
+def _collection_load(fake, id, version=None):
+    return fake._load_collection(id)
+
+
+@_function('Image.load')
+def _image_load(fake, id, version=None):
+    return fake._load_image(id)
+
+
+@_function('ImageCollection.fromImages')
+def _from_images(fake, images):
+    return _Collection('ImageCollection', images)
+
+
+@_function('ImageCollection.merge')
+def _merge(fake, collection1, collection2):
+    return _Collection('ImageCollection', collection1.elements + collection2.elements)
+
+
+@_function('Collection')
+def _feature_collection(fake, features):
+    return _Collection('FeatureCollection', [
+        feature if isinstance(feature, _Element) else _Element('Feature', geometry=feature) for feature in features
+    ])
+
+
+@_function('Collection.filter')
+def _collection_filter(fake, collection, filter):
+    return collection.copy(elements=[element for element in collection.elements if filter(element, element)])
+
+
+@_function('Collection.map')
+def _collection_map(fake, collection, baseAlgorithm, dropNulls=False):
+    results = [baseAlgorithm(element) for element in collection.elements]
+    results = [result for result in results if result is not None]
+    kind = collection.kind
+    if results:
+        kind = 'ImageCollection' if all(getattr(r, 'kind', None) == 'Image' for r in results) else 'FeatureCollection'
+    return _Collection(kind, results, collection.properties)
+
+
+@_function('Collection.limit')
+def _collection_limit(fake, collection, limit=None, key=None, ascending=True):
+    elements = collection.elements
+    if key is not None:
+        present = [element for element in elements if element.get(key) is not None]
+        missing = [element for element in elements if element.get(key) is None]
+        elements = sorted(present, key=lambda element: element.get(key), reverse=not ascending) + missing
+    if limit is not None:
+        elements = elements[:int(limit)]
+    return collection.copy(elements=elements)
+
+
+@_function('Collection.distinct')
+def _collection_distinct(fake, collection, properties):
+    properties = [properties] if isinstance(properties, str) else properties
+    seen, kept = set(), []
+    for element in collection.elements:
+        key = json.dumps([element.get(name) for name in properties], sort_keys=True, default=str)
+        if key not in seen:
+            seen.add(key)
+            kept.append(element)
+    return collection.copy(elements=kept)
+
+
+@_function('Collection.flatten')
+def _collection_flatten(fake, collection):
+    elements = [inner for outer in collection.elements for inner in outer.elements]
+    kind = 'ImageCollection' if elements and all(e.kind == 'Image' for e in elements) else 'FeatureCollection'
+    return _Collection(kind, elements)
+
+
+@_function('Collection.geometry')
+def _collection_geometry(fake, collection, maxError=None):
+    return _geometry(collection)
+
+
+_FUNCTIONS['Collection.bounds'] = lambda fake, collection, **_: (
+    _bbox_polygon(_bbox(_geometry(collection)) or (0, 0, 0, 0)))
+_FUNCTIONS['Collection.size'] = lambda fake, collection: len(collection.elements)
+_FUNCTIONS['Collection.first'] = lambda fake, collection: collection.elements[0] if collection.elements else None
+_FUNCTIONS['Collection.toList'] = lambda fake, collection, count, offset=0: (
+    collection.elements[int(offset):int(offset) + int(count)])
+
+
+def _column(collection, property):
+    return [element.get(property) for element in collection.elements if element.get(property) is not None]
+
+
+_FUNCTIONS['AggregateFeatureCollection.array'] = lambda fake, collection, property: _column(collection, property)
+_FUNCTIONS['AggregateFeatureCollection.count'] = lambda fake, collection, property: len(_column(collection, property))
+_FUNCTIONS['AggregateFeatureCollection.count_distinct'] = lambda fake, collection, property: (
+    len(set(map(str, _column(collection, property)))))
+for _name, _reduce in (('min', min), ('max', max), ('sum', sum)):
+    _FUNCTIONS[f'AggregateFeatureCollection.{_name}'] = (
+        lambda fake, collection, property, _reduce=_reduce: _reduce(_column(collection, property)))
+_FUNCTIONS['AggregateFeatureCollection.mean'] = lambda fake, collection, property: float(np.mean(_column(collection, property)))
+_FUNCTIONS['AggregateFeatureCollection.first'] = lambda fake, collection, property: (_column(collection, property) or [None])[0]
+
+
+@_function('Collection.reduceColumns')
+def _reduce_columns(fake, collection, reducer, selectors, weightSelectors=None):
+    values = _column(collection, selectors[0])
+    return {name: fn(values) for name, fn in reducer.outputs}
+
+
+@_function('ImageCollection.reduce')
+def _collection_reduce(fake, collection, reducer, parallelScale=1):
+    first = collection.elements[0].band_names() if collection.elements else []
+    return _image([f'{band}_{name}' for band in first for name, _ in reducer.outputs])
+
+
+def _composite(fake, collection, **_):
+    return _image(collection.elements[0].bands if collection.elements else [])
+
+
+for _name in ('ImageCollection.mosaic', 'ImageCollection.qualityMosaic'):
+    _FUNCTIONS[_name] = _composite
+
+
+# Reducers
+
+def _percentile(values, percentile):
+    return float(np.percentile(values, percentile)) if values else None
+
+
+_REDUCERS = {
+    'min': lambda values: min(values) if values else None,
+    'max': lambda values: max(values) if values else None,
+    'sum': lambda values: sum(values),
+    'mean': lambda values: float(np.mean(values)) if values else None,
+    'median': lambda values: _percentile(values, 50),
+    'count': len,
+    'first': lambda values: values[0] if values else None,
+    'last': lambda values: values[-1] if values else None,
+    'stdDev': lambda values: float(np.std(values, ddof=1)) if len(values) > 1 else None,
+    'variance': lambda values: float(np.var(values, ddof=1)) if len(values) > 1 else None,
+    'countDistinct': lambda values: len(set(map(str, values))),
+    'toList': list,
+}
+for _name, _reduce in _REDUCERS.items():
+    _FUNCTIONS[f'Reducer.{_name}'] = (
+        lambda fake, _name=_name, _reduce=_reduce, **_: _Reducer([('list' if _name == 'toList' else _name, _reduce)]))
+
+
+@_function('Reducer.percentile')
+def _reducer_percentile(fake, percentiles, outputNames=None, **_):
+    names = outputNames or [f'p{p:g}' for p in percentiles]
+    return _Reducer([(name, lambda values, p=p: _percentile(values, p)) for name, p in zip(names, percentiles)])
+
+
+@_function('Reducer.combine')
+def _reducer_combine(fake, reducer1, reducer2, outputPrefix='', sharedInputs=False):
+    return _Reducer(reducer1.outputs + [(outputPrefix + name, fn) for name, fn in reducer2.outputs])
+
+
+# Joins
+
+_FUNCTIONS['Join.saveAll'] = lambda fake, matchesKey, ordering=None, ascending=True, measureKey=None, outer=False: (
+    _Join('saveAll', key=matchesKey, ordering=ordering, ascending=ascending, outer=outer))
+_FUNCTIONS['Join.saveFirst'] = lambda fake, matchKey, ordering=None, ascending=True, measureKey=None, outer=False: (
+    _Join('saveFirst', key=matchKey, ordering=ordering, ascending=ascending, outer=outer))
+_FUNCTIONS['Join.simple'] = lambda fake: _Join('simple')
+_FUNCTIONS['Join.inverted'] = lambda fake: _Join('inverted')
+_FUNCTIONS['Join.inner'] = lambda fake, primaryKey='primary', secondaryKey='secondary', measureKey=None: (
+    _Join('inner', primary=primaryKey, secondary=secondaryKey))
+
+
+@_function('Join.apply')
+def _join_apply(fake, join, primary, secondary, condition):
+    options = join.options
+    joined = []
+    for left in primary.elements:
+        matches = [right for right in secondary.elements if condition(left, right)]
+        if join.kind == 'simple':
+            joined += [left] if matches else []
+        elif join.kind == 'inverted':
+            joined += [] if matches else [left]
+        elif join.kind == 'inner':
+            joined += [_Element('Feature', properties={options['primary']: left, options['secondary']: right})
+                       for right in matches]
+        else:
+            if options['ordering']:
+                matches = _collection_limit(fake, _Collection(secondary.kind, matches), None, options['ordering'],
+                                            options['ascending']).elements
+            if not matches and not options['outer']:
+                continue
+            value = matches if join.kind == 'saveAll' else (matches[0] if matches else None)
+            joined.append(left.copy(properties=dict(left.properties, **{options['key']: value})))
+    kind = 'FeatureCollection' if join.kind == 'inner' else primary.kind
+    return _Collection(kind, joined)
+
+
+# Elements and images
+
+@_function('Element.get')
+def _element_get(fake, object, property):
+    return object.get(property)
+
+
+@_function('Element.set')
+def _element_set(fake, object, key, value):
+    return object.copy(properties=dict(object.properties, **{key: value}))
+
+
+@_function('Element.setMulti')
+def _element_set_multi(fake, object, properties):
+    return object.copy(properties=dict(object.properties, **properties))
+
+
+@_function('Element.copyProperties', 'Image.copyProperties')
+def _copy_properties(fake, destination=None, source=None, properties=None, exclude=None):
+    names = properties if properties is not None else [k for k in source.properties if not k.startswith('system:')]
+    copied = {name: source.properties[name] for name in names
+              if name in source.properties and name not in (exclude or [])}
+    return destination.copy(properties=dict(destination.properties, **copied))
+
+
+_FUNCTIONS['Element.propertyNames'] = lambda fake, element: list(element.properties)
+_FUNCTIONS['Element.toDictionary'] = lambda fake, element, properties=None: {
+    k: v for k, v in element.properties.items() if properties is None or k in properties}
+_FUNCTIONS['Feature'] = lambda fake, geometry=None, metadata=None: _Element('Feature', properties=metadata,
+                                                                           geometry=geometry)
+_FUNCTIONS['Feature.geometry'] = lambda fake, feature, **_: feature.geometry
+_FUNCTIONS['Image.bandNames'] = lambda fake, image: image.band_names()
+_FUNCTIONS['Image.date'] = lambda fake, image: _Date(image.get('system:time_start'))
+
+
+@_function('Image.constant')
+def _image_constant(fake, value):
+    values = value if isinstance(value, list) else [value]
+    return _image(['constant'] if len(values) == 1 else [f'constant_{i}' for i in range(len(values))])
+
+
+@_function('Image.select')
+def _image_select(fake, input, bandSelectors, newNames=None):
+    names = input.band_names()
+    selected = []
+    for selector in bandSelectors:
+        if isinstance(selector, int):
+            matched = [selector]
+        else:
+            matched = [i for i, name in enumerate(names) if re.fullmatch(selector, name)]
+        if not matched:
+            raise ee.EEException(f"Image.select: Pattern '{selector}' did not match any bands.")
+        selected += matched
+    bands = [dict(input.bands[i]) for i in selected]
+    if newNames is not None:
+        if len(newNames) != len(bands):
+            raise ee.EEException("Image.select: The number of new names must match the number of selected bands.")
+        for band, name in zip(bands, newNames):
+            band['id'] = name
+    return input.copy(bands=bands)
+
+
+@_function('Image.rename')
+def _image_rename(fake, input, names):
+    if len(names) != len(input.bands):
+        raise ee.EEException(f"Image.rename: Expected {len(input.bands)} names, got {len(names)}.")
+    return input.copy(bands=[dict(band, id=name) for band, name in zip(input.bands, names)])
+
+
+@_function('Image.addBands')
+def _image_add_bands(fake, dstImg, srcImg, names=None, overwrite=False):
+    added = [dict(band) for band in srcImg.bands if names is None or band['id'] in names]
+    if overwrite:
+        replaced = {band['id'] for band in added}
+        return dstImg.copy(bands=[band for band in dstImg.bands if band['id'] not in replaced] + added)
+    # Like the server, rename a duplicated band with the first free '_1', '_2', ... suffix
+    taken = set(dstImg.band_names())
+    for band in added:
+        name, suffix = band['id'], 1
+        while name in taken:
+            name, suffix = f"{band['id']}_{suffix}", suffix + 1
+        band['id'] = name
+        taken.add(name)
+    return dstImg.copy(bands=dstImg.bands + added)
+
+
+@_function('Image.parseExpression')
+def _parse_expression(fake, expression, argName='DEFAULT_EXPRESSION_IMAGE', vars=None):
+    """
+    Return the expression as a function of its variables; the result has a single band named after the
+    first band of the first image variable (image math keeps the name of the left operand).
+    """
+    def evaluate(**variables):
+        for name in vars or []:
+            value = variables.get(name)
+            if name != argName and isinstance(value, _Element) and value.bands:
+                return _image([value.bands[0]['id']])
+        return _image(['constant'])
+    return evaluate
+
+
+@_function('Image.projection')
+def _image_projection(fake, image):
+    if not image.bands:
+        raise ee.EEException("Image.projection: The image has no bands.")
+    return {'type': 'Projection', 'crs': image.bands[0]['crs'], 'transform': image.bands[0]['crs_transform']}
+
+
+@_function('Projection.nominalScale')
+def _nominal_scale(fake, proj):
+    return abs(proj['transform'][0]) * (_METERS_PER_DEGREE if proj['crs'] == 'EPSG:4326' else 1)
+
+
+_FUNCTIONS['Image.normalizedDifference'] = lambda fake, input, bandNames=None: _image(['nd'])
+_FUNCTIONS['Image.reduce'] = lambda fake, image, reducer: _image([name for name, _ in reducer.outputs])
+
+# Pixel operations that keep the image properties; other Image functions return a new image without them
+_KEEPS_PROPERTIES = ('Image.updateMask', 'Image.mask', 'Image.selfMask', 'Image.unmask', 'Image.clip',
+                     'Image.clipToCollection', 'Image.reproject', 'Image.resample', 'Image.setDefaultProjection')
+_IMAGE_ARGUMENTS = ('image', 'input', 'image1', 'dstImg', 'value')
+
+
+def _pixel_operation(name, args):
+    """
+    Dry-run result of a pixel operation: the bands of its (first) input image.
+    """
+    for key in _IMAGE_ARGUMENTS + tuple(args):
+        value = args.get(key)
+        if isinstance(value, _Element) and value.kind == 'Image':
+            return value.copy(properties=value.properties if name in _KEEPS_PROPERTIES else {})
+    return None
+
+
+# Numbers, lists, dictionaries and strings
+
+for _name, _op in {
+    'add': lambda a, b: a + b, 'subtract': lambda a, b: a - b, 'multiply': lambda a, b: a * b,
+    'divide': lambda a, b: a / b, 'pow': lambda a, b: a ** b, 'mod': lambda a, b: math.fmod(a, b),
+    'min': min, 'max': max, 'eq': lambda a, b: int(a == b), 'neq': lambda a, b: int(a != b),
+    'lt': lambda a, b: int(a < b), 'lte': lambda a, b: int(a <= b), 'gt': lambda a, b: int(a > b),
+    'gte': lambda a, b: int(a >= b), 'and': lambda a, b: int(bool(a) and bool(b)),
+    'or': lambda a, b: int(bool(a) or bool(b)),
+}.items():
+    _FUNCTIONS[f'Number.{_name}'] = lambda fake, left, right, _op=_op: _op(left, right)
+for _name, _op in {
+    'floor': math.floor, 'ceil': math.ceil, 'round': round, 'abs': abs, 'sqrt': math.sqrt, 'log': math.log,
+    'exp': math.exp, 'int': int, 'toInt': int, 'long': int, 'toLong': int, 'float': float, 'toFloat': float,
+    'double': float, 'toDouble': float, 'not': lambda a: int(not a),
+}.items():
+    _FUNCTIONS[f'Number.{_name}'] = lambda fake, input, _op=_op: _op(input)
+_FUNCTIONS['Number.parse'] = lambda fake, input, radix=10: float(input) if radix == 10 else int(input, radix)
+
+
+@_function('List.sequence')
+def _list_sequence(fake, start, end=None, step=None, count=None):
+    if count is not None:
+        step = (end - start) / (count - 1) if count > 1 else 0
+        return [start + i * step for i in range(int(count))]
+    step = 1 if step is None else step
+    n = int(math.floor((end - start) / step + 1e-9)) + 1
+    return [start + i * step for i in range(max(n, 0))]
+
+
+def _flatten(items):
+    for item in items:
+        if isinstance(item, list):
+            yield from _flatten(item)
+        else:
+            yield item
+
+
+@_function('List.iterate')
+def _list_iterate(fake, list, function, first):
+    result = first
+    for item in list:
+        result = function(item, result)
+    return result
+
+
+_FUNCTIONS['List.map'] = lambda fake, list, baseAlgorithm, dropNulls=False: [
+    result for result in map(baseAlgorithm, list) if not (dropNulls and result is None)]
+_FUNCTIONS['List.slice'] = lambda fake, list, start, end=None, step=None: list[start:end:step]
+_FUNCTIONS['List.flatten'] = lambda fake, list: [*_flatten(list)]
+_FUNCTIONS['List.contains'] = lambda fake, list, element: element in list
+_FUNCTIONS['List.size'] = lambda fake, list: len(list)
+_FUNCTIONS['List.length'] = lambda fake, list: len(list)
+_FUNCTIONS['List.get'] = lambda fake, list, index: list[int(index)]
+_FUNCTIONS['List.cat'] = lambda fake, list, other: list + other
+_FUNCTIONS['List.add'] = lambda fake, list, element: list + [element]
+_FUNCTIONS['List.reverse'] = lambda fake, list: list[::-1]
+_FUNCTIONS['List.distinct'] = lambda fake, list: [item for i, item in enumerate(list) if item not in list[:i]]
+_FUNCTIONS['List.sort'] = lambda fake, list, keys=None: [
+    item for _, item in sorted(zip(keys or list, list), key=lambda pair: pair[0])]
+_FUNCTIONS['List.indexOf'] = lambda fake, list, element: list.index(element) if element in list else -1
+_FUNCTIONS['List.zip'] = lambda fake, list, other: [[a, b] for a, b in zip(list, other)]
+_FUNCTIONS['List.reduce'] = lambda fake, list, reducer: (
+    {name: fn(list) for name, fn in reducer.outputs} if len(reducer.outputs) > 1 else reducer.outputs[0][1](list))
+
+
+@_function('Dictionary.get')
+def _dictionary_get(fake, dictionary, key, defaultValue=None):
+    if key not in dictionary and defaultValue is None:
+        raise ee.EEException(f"Dictionary.get: Dictionary does not contain key: {key}.")
+    return dictionary.get(key, defaultValue)
+
+
+_FUNCTIONS['Dictionary'] = lambda fake, input=None: dict(input or {})
+_FUNCTIONS['Dictionary.set'] = lambda fake, dictionary, key, value: dict(dictionary, **{key: value})
+_FUNCTIONS['Dictionary.keys'] = lambda fake, dictionary: sorted(dictionary)
+_FUNCTIONS['Dictionary.values'] = lambda fake, dictionary, keys=None: [dictionary[k] for k in (keys or sorted(dictionary))]
+_FUNCTIONS['Dictionary.contains'] = lambda fake, dictionary, key: key in dictionary
+_FUNCTIONS['Dictionary.size'] = lambda fake, dictionary: len(dictionary)
+_FUNCTIONS['Dictionary.combine'] = lambda fake, first, second, overwrite=True: (
+    dict(first, **second) if overwrite else dict(second, **first))
+_FUNCTIONS['Dictionary.fromLists'] = lambda fake, keys, values: dict(zip(keys, values))
+_FUNCTIONS['String'] = lambda fake, input: str(input)
+_FUNCTIONS['String.cat'] = lambda fake, string1, string2: string1 + string2
+_FUNCTIONS['String.length'] = lambda fake, string: len(string)
+_FUNCTIONS['String.slice'] = lambda fake, string, start, end=None: string[start:end]
+_FUNCTIONS['String.split'] = lambda fake, string, regex, flags=None: re.split(regex, string)
+_FUNCTIONS['String.replace'] = lambda fake, input, regex, replacement, flags=None: re.sub(
+    regex, replacement.replace('$', '\\'), input, count=0 if flags and 'g' in flags else 1)
+_FUNCTIONS['String.toUpperCase'] = lambda fake, string: string.upper()
+_FUNCTIONS['String.toLowerCase'] = lambda fake, string: string.lower()
+
+# Dates
+
+_FUNCTIONS['Date'] = lambda fake, value, timeZone=None: _Date(_millis(value))
+_FUNCTIONS['Date.millis'] = lambda fake, input: int(input)
+_FUNCTIONS['Date.fromYMD'] = lambda fake, year, month, day, timeZone=None: _Date(
+    _millis(datetime(int(year), int(month), int(day), tzinfo=timezone.utc)))
+_FUNCTIONS['Date.advance'] = lambda fake, date, delta, unit, timeZone=None: _advance(date, delta, unit)
+_FUNCTIONS['Date.get'] = lambda fake, date, unit, timeZone=None: _date_field(date, unit)
+_FUNCTIONS['Date.format'] = lambda fake, date, format=None, timeZone=None: _format_date(date, format)
+_FUNCTIONS['Date.difference'] = lambda fake, date, start, unit: (
+    (_millis(date) - _millis(start)) / 1000 / {'week': 604800, 'day': 86400, 'hour': 3600, 'minute': 60,
+                                               'second': 1, 'year': 31556952, 'month': 2629746}[unit])
+_FUNCTIONS['DateRange'] = lambda fake, start, end=None, timeZone=None: _DateRange(
+    (_millis(start), _millis(end) if end is not None else _millis(start) + 1))
+
+# Geometries
+
+_FUNCTIONS['GeometryConstructors.Point'] = lambda fake, coordinates, **_: {'type': 'Point', 'coordinates': coordinates}
+_FUNCTIONS['GeometryConstructors.MultiPoint'] = lambda fake, coordinates, **_: {'type': 'MultiPoint', 'coordinates': coordinates}
+_FUNCTIONS['GeometryConstructors.LineString'] = lambda fake, coordinates, **_: {'type': 'LineString', 'coordinates': coordinates}
+_FUNCTIONS['GeometryConstructors.Polygon'] = lambda fake, coordinates, **_: {'type': 'Polygon', 'coordinates': coordinates}
+_FUNCTIONS['GeometryConstructors.MultiPolygon'] = lambda fake, coordinates, **_: {'type': 'MultiPolygon', 'coordinates': coordinates}
+_FUNCTIONS['GeometryConstructors.Rectangle'] = lambda fake, coordinates, **_: _rectangle(coordinates)
+_FUNCTIONS['Geometry.bounds'] = lambda fake, geometry, **_: _bbox_polygon(_bbox(geometry) or (0, 0, 0, 0))
+_FUNCTIONS['Geometry.coordinates'] = lambda fake, geometry: geometry['coordinates']
+_FUNCTIONS['Geometry.type'] = lambda fake, geometry: geometry['type']
+
+
+class _Closure:
+    """
+    A function definition of the graph, called by ``map``, ``iterate`` and filters of the evaluator.
+    """
+
+    def __init__(self, evaluator, names, body, env):
+        self.evaluator, self.names, self.body, self.env = evaluator, names, body, env
+
+    def __call__(self, *args):
+        return self.evaluator.reference(self.body, dict(self.env, **dict(zip(self.names, args))))
+
+
+class _Evaluator:
+    """
+    Interpret a serialized ee expression (``ee.serializer.encode(obj, for_cloud_api=True)``).
+    """
+
+    def __init__(self, fake, expression):
+        self.fake = fake
+        self.values = expression['values']
+        self.cache = {}
+
+    def run(self, expression):
+        return self.reference(expression['result'], {})
+
+    def reference(self, name, env):
+        if not env and name in self.cache:
+            return self.cache[name]
+        value = self.value(self.values[name], env)
+        if not env:
+            self.cache[name] = value
+        return value
+
+    def value(self, node, env):
+        if 'constantValue' in node:
+            return node['constantValue']
+        if 'integerValue' in node:
+            return int(node['integerValue'])
+        if 'valueReference' in node:
+            return self.reference(node['valueReference'], env)
+        if 'argumentReference' in node:
+            return env[node['argumentReference']]
+        if 'arrayValue' in node:
+            return [self.value(item, env) for item in node['arrayValue'].get('values', [])]
+        if 'dictionaryValue' in node:
+            return {key: self.value(item, env) for key, item in node['dictionaryValue'].get('values', {}).items()}
+        if 'functionDefinitionValue' in node:
+            definition = node['functionDefinitionValue']
+            return _Closure(self, definition.get('argumentNames', []), definition['body'], env)
+        if 'functionInvocationValue' in node:
+            invocation = node['functionInvocationValue']
+            args = {key: self.value(item, env) for key, item in invocation.get('arguments', {}).items()}
+            if 'functionReference' in invocation:
+                return self.reference(invocation['functionReference'], env)(**args)
+            return self.fake._invoke(invocation['functionName'], args)
+        raise ee.EEException(f"The fake backend cannot evaluate the node {sorted(node)}.")
+
+
+# ------------------------
+# Fake Backend
+# ------------------------
+
+class FakeEarthEngine:
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_message=RATE_LIMIT_MESSAGE, seed=None,
+                 datasets=True, dataset_range=('2018-01-01', '2021-01-01'), sleep=time.sleep):
+        """
+        Initialize an in-memory stand-in for the Earth Engine API.
+
+        The fake serves the ``ee.data`` asset functions (listAssets, getAsset, getInfo, createAsset,
+        copyAsset, renameAsset, deleteAsset, ...) from an asset tree, and ``computeValue`` (so every
+        ``getInfo()``) by interpreting the serialized graph over small synthetic image collections.
+        Images only carry band names and properties: metadata queries (sizes, dates, band names,
+        filters, joins, aggregations) are answered exactly, pixel operations only propagate bands,
+        and functions that need pixels (reduceRegion, sample, ...) raise ``ee.EEException`` unless a
+        handler is registered with ``register``.
+
+        Pass it as ``data=`` to ``GEEAssetManager``, or use it as a context manager to patch ``ee.data``
+        and initialize ee offline for the loaders and other ``geedl.cloud`` functions.
+
+        Args:
+            latency (float or dict): Seconds added to every call, or {function name: seconds} with an optional
+                '*' default (default is 0).
+            jitter (float): Random extra latency, as a fraction of ``latency`` (default is 0).
+            error_rate (float or dict): Probability that a call fails with ``error_message``, or {function name:
+                probability} with an optional '*' default (default is 0).
+            error_message (str): Message of the injected ``ee.EEException`` (default is a retryable rate-limit error).
+            seed (int, optional): Seed of the latency, error and synthetic data generators.
+            datasets (bool): Add small synthetic versions of the collections in ``DATASET_IDS`` (default is True).
+            dataset_range (tuple): (start, end) dates of the synthetic collections (default is 2018-2020).
+            sleep (callable): Function used to wait for the latency (default is ``time.sleep``).
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_message = error_message
+        self.sleep = sleep
+        self.calls = Counter()
+        self.errors = Counter()
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._faults = defaultdict(list)
+        self._handlers = {}
+        self._assets = {}                   # Asset path -> {'type', 'image', 'updateTime'}
+        self._children = defaultdict(set)   # Container path -> child paths
+        self._lock = threading.RLock()
+        self._random = random.Random(seed)
+        self._seed = seed
+        self._saved = {}
+        self._initialized = False
+        if datasets:
+            self.add_default_datasets(*dataset_range)
+
+    # Asset tree
+
+    @staticmethod
+    def _parent(path):
+        return path.rsplit('/', 1)[0] if '/' in path else ''
+
+    @staticmethod
+    def _is_root(path):
+        """
+        Roots exist implicitly: '', 'projects/<project>', 'projects/<project>/assets' and 'users/<name>'.
+        """
+        parts = path.split('/') if path else []
+        return (not parts or (parts[0] == 'projects' and len(parts) <= 2)
+                or (parts[0] == 'projects' and len(parts) == 3 and parts[2] == 'assets')
+                or (parts[0] == 'users' and len(parts) == 2))
+
+    def _put(self, path, asset_type, image=None, parents=False):
+        parent = self._parent(path)
+        if parent not in self._assets and not self._is_root(parent):
+            if not parents:
+                raise ee.EEException(f"Asset '{parent}' does not exist or doesn't allow this operation.")
+            self._put(parent, 'FOLDER', parents=True)
+        if image is not None:
+            image = image.copy(properties=dict(image.properties, **{
+                'system:id': path, 'system:index': path.rsplit('/', 1)[-1]}))
+        self._assets[path] = {'type': asset_type, 'image': image,
+                              'updateTime': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')}
+        self._children[parent].add(path)
+
+    def _record(self, path):
+        asset = self._assets[path]
+        record = {'type': asset['type'], 'name': path, 'id': path, 'updateTime': asset['updateTime']}
+        if asset['image'] is not None:
+            record['sizeBytes'] = str(4096 * max(len(asset['image'].bands), 1))
+            record['properties'] = {k: v for k, v in asset['image'].properties.items() if not k.startswith('system:')}
+        return record
+
+    def add_folder(self, path, asset_type='FOLDER'):
+        """
+        Add a folder (or an empty ImageCollection with ``asset_type='IMAGE_COLLECTION'``), creating missing parents.
+        """
+        with self._lock:
+            self._put(path, asset_type, parents=True)
+
+    def add_image(self, path, bands, properties=None, footprint=None, scale=30):
+        """
+        Add an image asset, creating missing parents.
+
+        Args:
+            path (str): Asset path.
+            bands (list): Band names.
+            properties (dict, optional): Image properties, e.g. 'system:time_start' in milliseconds.
+            footprint (dict, optional): GeoJSON footprint, used by ``filterBounds``; None intersects everything.
+            scale (float): Nominal scale of the bands in meters (default is 30).
+        """
+        with self._lock:
+            self._put(path, 'IMAGE', _image(bands, properties, footprint, scale), parents=True)
+
+    def add_collection(self, path, images, scale=30):
+        """
+        Add an ImageCollection with its images.
+
+        Args:
+            path (str): Collection path, e.g. 'projects/p/assets/ndvi' or a public id such as 'LANDSAT/LC08/C02/T1_L2'.
+            images (list): (name, bands, properties) tuples; the image paths are '<path>/<name>'.
+            scale (float): Nominal scale of the bands in meters (default is 30).
+        """
+        with self._lock:
+            self._put(path, 'IMAGE_COLLECTION', parents=True)
+            for name, bands, properties in images:
+                self._put(f'{path}/{name}', 'IMAGE', _image(bands, properties, scale=scale))
+
+    def synthetic_collection(self, path, bands, start, end, every_days=16, tiles=((123, 32),), prefix='IMG',
+                             properties=None, scale=30):
+        """
+        Add a collection with one image per tile every ``every_days`` days between ``start`` and ``end``.
+
+        Each image has 'system:time_start', 'CLOUD_COVER' and 'CLOUD_COVER_LAND' (random, reproducible
+        with ``seed``), 'WRS_PATH' and 'WRS_ROW', plus ``properties``.
+
+        Returns:
+            int: Number of images added.
+        """
+        rng = random.Random(f'{self._seed}:{path}')
+        start_ms, end_ms = _millis(start), _millis(end)
+        images = []
+        for path_number, row in tiles:
+            millis = start_ms
+            while millis < end_ms:
+                cloud = round(rng.random() * 100, 2)
+                images.append((f'{prefix}_{path_number:03d}{row:03d}_{_format_date(millis, "yyyyMMdd")}', bands, dict(
+                    properties or {}, **{'system:time_start': millis, 'system:time_end': millis,
+                                         'CLOUD_COVER': cloud, 'CLOUD_COVER_LAND': cloud,
+                                         'WRS_PATH': path_number, 'WRS_ROW': row})))
+                millis += every_days * 86400000
+        images.sort(key=lambda image: image[2]['system:time_start'])
+        self.add_collection(path, images, scale)
+        return len(images)
+
+    def add_default_datasets(self, start='2018-01-01', end='2021-01-01'):
+        """
+        Add synthetic versions of the collections in ``DATASET_IDS`` within their operational windows
+        (Landsat every 16 days on two WRS tiles, MODIS every 8 days) and the terrain DEM.
+        """
+        for series, collection_id in DATASET_IDS.items():
+            window_start, window_end = SERIES_DATE_RANGES.get(series, (None, None))
+            first = max(start, window_start) if window_start else start
+            last = min(end, window_end) if window_end else end
+            bands = ORIGINAL_BANDS[series] + [QA_BANDS[series]]
+            if series.startswith('L'):
+                self.synthetic_collection(collection_id, bands, first, last, 16, ((123, 32), (123, 33)),
+                                          prefix=series, properties={'SPACECRAFT_ID': f'LANDSAT_{series[1:]}'})
+            else:
+                self.synthetic_collection(collection_id, bands, first, last, 8, ((0, 0),), prefix=series, scale=500)
+        self.add_image(TERRAIN_DEM, ['elevation'])
+
+    def _load_collection(self, path):
+        with self._lock:
+            asset = self._assets.get(path)
+            if asset is None or asset['type'] != 'IMAGE_COLLECTION':
+                raise ee.EEException(f"ImageCollection.load: ImageCollection asset '{path}' not found.")
+            images = [self._assets[child]['image'] for child in sorted(self._children[path])
+                      if self._assets[child]['image'] is not None]
+        images.sort(key=lambda image: (image.get('system:time_start') is None, image.get('system:time_start') or 0))
+        return _Collection('ImageCollection', images)
+
+    def _load_image(self, path):
+        with self._lock:
+            asset = self._assets.get(path)
+            if asset is None or asset['image'] is None:
+                raise ee.EEException(f"Image.load: Image asset '{path}' not found.")
+            return asset['image']
+
+    # Latency and error injection
+
+    @staticmethod
+    def _setting(value, method):
+        if isinstance(value, dict):
+            return value.get(method, value.get('*', 0))
+        return value
+
+    def fail_next(self, method, times=1, error=None):
+        """
+        Make the next ``times`` calls of ``method`` (e.g. 'copyAsset') fail.
+
+        Args:
+            method (str): Name of the ee.data function.
+            times (int): Number of failing calls (default is 1).
+            error (Exception, optional): Raised error (default is ``ee.EEException(error_message)``).
+        """
+        with self._lock:
+            self._faults[method] += [error or ee.EEException(self.error_message)] * times
+
+    def _serve(self, method, fn, *args):
+        with self._lock:
+            self.calls[method] += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            fault = self._faults[method].pop(0) if self._faults[method] else None
+            if fault is None and self._random.random() < self._setting(self.error_rate, method):
+                fault = ee.EEException(self.error_message)
+            delay = self._setting(self.latency, method) * (1 + self.jitter * self._random.random())
+        try:
+            if delay:
+                self.sleep(delay)
+            if fault is not None:
+                with self._lock:
+                    self.errors[method] += 1
+                raise fault
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self):
+        """
+        Return the number of calls and injected errors per function, and the highest number of concurrent calls.
+        """
+        with self._lock:
+            return {'calls': dict(self.calls), 'errors': dict(self.errors), 'max_in_flight': self.max_in_flight}
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls.clear()
+            self.errors.clear()
+            self.max_in_flight = 0
+
+    # ee.data API
+
+    def listAssets(self, params):
+        def list_assets():
+            options = {'parent': params} if isinstance(params, str) else params
+            parent = options['parent']
+            with self._lock:
+                if parent not in self._assets and not self._is_root(parent):
+                    raise ee.EEException(f"Asset '{parent}' does not exist or doesn't allow this operation.")
+                children = sorted(self._children[parent])
+                offset = int(options.get('pageToken') or 0)
+                size = int(options.get('pageSize') or 1000)
+                response = {'assets': [self._record(path) for path in children[offset:offset + size]]}
+            if offset + size < len(children):
+                response['nextPageToken'] = str(offset + size)
+            return response
+        return self._serve('listAssets', list_assets)
+
+    def listImages(self, params):
+        response = self.listAssets(params)
+        return {'images': [asset for asset in response['assets'] if asset['type'] == 'IMAGE']}
+
+    def getAsset(self, asset_id):
+        def get_asset():
+            with self._lock:
+                if asset_id not in self._assets:
+                    raise ee.EEException(f"Asset '{asset_id}' not found.")
+                return self._record(asset_id)
+        return self._serve('getAsset', get_asset)
+
+    def getInfo(self, asset_id):
+        def get_info():
+            with self._lock:
+                return self._record(asset_id) if asset_id in self._assets else None
+        return self._serve('getInfo', get_info)
+
+    def createAsset(self, value, path=None, properties=None):
+        def create_asset():
+            asset_path = path or value.get('name') or value.get('id')
+            asset_type = value['type'].upper()
+            with self._lock:
+                if asset_path in self._assets:
+                    raise ee.EEException(f"Cannot overwrite asset '{asset_path}'.")
+                self._put(asset_path, asset_type)
+                return self._record(asset_path)
+        return self._serve('createAsset', create_asset)
+
+    def createFolder(self, path):
+        return self.createAsset({'type': 'FOLDER'}, path)
+
+    def copyAsset(self, sourceId, destinationId, allowOverwrite=False):
+        def copy_asset():
+            with self._lock:
+                self._copy(sourceId, destinationId, allowOverwrite)
+        return self._serve('copyAsset', copy_asset)
+
+    def _copy(self, source, destination, overwrite):
+        asset = self._assets.get(source)
+        if asset is None:
+            raise ee.EEException(f"Asset '{source}' not found.")
+        if asset['type'] == 'FOLDER':
+            raise ee.EEException(f"Cannot copy folder '{source}'.")
+        if destination in self._assets and not overwrite:
+            raise ee.EEException(f"Cannot overwrite asset '{destination}'.")
+        self._put(destination, asset['type'], asset['image'])
+        for child in sorted(self._children[source]):
+            self._copy(child, f"{destination}/{child.rsplit('/', 1)[-1]}", overwrite)
+
+    def renameAsset(self, sourceId, destinationId):
+        def rename_asset():
+            with self._lock:
+                self._copy(sourceId, destinationId, False)
+                self._delete(sourceId, recursive=True)
+        return self._serve('renameAsset', rename_asset)
+
+    def deleteAsset(self, assetId):
+        def delete_asset():
+            with self._lock:
+                self._delete(assetId)
+        return self._serve('deleteAsset', delete_asset)
+
+    def _delete(self, path, recursive=False):
+        if path not in self._assets:
+            raise ee.EEException(f"Asset '{path}' not found.")
+        if self._children[path]:
+            if not recursive:
+                raise ee.EEException(f"Cannot delete asset '{path}': it is not empty.")
+            for child in list(self._children[path]):
+                self._delete(child, recursive=True)
+        del self._assets[path]
+        self._children.pop(path, None)
+        self._children[self._parent(path)].discard(path)
+
+    def computeValue(self, obj):
+        expression = ee.serializer.encode(obj, for_cloud_api=True)
+        return self._serve('computeValue', lambda: _to_info(_Evaluator(self, expression).run(expression)))
+
+    # Graph evaluation
+
+    def register(self, name, handler):
+        """
+        Serve an ee function the fake cannot evaluate, e.g. ``register('Image.reduceRegion', lambda **args: {...})``.
+
+        Args:
+            name (str): Function name in the serialized graph, such as 'Image.reduceRegion'.
+            handler (callable): Called with the evaluated arguments as keywords; images are passed as internal
+                elements with ``bands`` and ``properties`` attributes.
+        """
+        self._handlers[name] = handler
+
+    def _invoke(self, name, args):
+        if name in self._handlers:
+            return self._handlers[name](**args)
+        if name in _FUNCTIONS:
+            return _FUNCTIONS[name](self, **args)
+        if name.startswith('reduce.'):
+            return _composite(self, **args)
+        if name.startswith('Image.'):
+            result = _pixel_operation(name, args)
+            if result is not None:
+                return result
+        raise ee.EEException(f"The fake backend cannot evaluate '{name}'; serve it with FakeEarthEngine.register().")
+
+    # Installation
+
+    def install(self, initialize=True, algorithms=None):
+        """
+        Patch ``ee.data`` so that every request is served by this fake; other requests (computePixels,
+        exports, ...) raise ``ee.EEException`` instead of reaching the network.
+
+        Args:
+            initialize (bool): Also initialize ee offline from the recorded algorithm list (default is True).
+            algorithms (str, optional): Recorded algorithm list, see ``load_algorithms``.
+
+        Returns:
+            FakeEarthEngine: self.
+        """
+        if _installed:
+            raise RuntimeError("A fake Earth Engine backend is already installed.")
+
+        def unsupported(call, *args, **kwargs):
+            raise ee.EEException(f"The fake backend does not serve {getattr(call, 'methodId', call)}.")
+
+        patches = {(ee.data, name): getattr(self, name) for name in _DATA_FUNCTIONS}
+        patches[(ee.data, '_execute_cloud_call')] = unsupported
+        if initialize:
+            patches.update(_offline_patches(algorithms))
+        self._saved = {key: getattr(*key) for key in patches}
+        for (owner, name), value in patches.items():
+            setattr(owner, name, value)
+        _installed.append(self)
+        if initialize:
+            ee.Reset()
+            ee.Initialize(None, '', project='fake-project')
+            self._initialized = True
+        return self
+
+    def uninstall(self):
+        """
+        Restore the patched ``ee.data`` functions (and reset ee if ``install`` initialized it).
+        """
+        for (owner, name), value in self._saved.items():
+            setattr(owner, name, value)
+        self._saved = {}
+        if self in _installed:
+            _installed.remove(self)
+        if self._initialized:
+            ee.Reset()
+            self._initialized = False
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+
+__all__ = [
+    "FakeEarthEngine",
+    "RATE_LIMIT_MESSAGE",
+    "initialize_offline",
+    "load_algorithms",
+]
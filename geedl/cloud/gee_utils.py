@@ -1,13 +1,187 @@
 # gee_utils.py
 # 工具函数，用于操作 GEE 平台上的数据、资产，帮助管理 GEE 数据集
 
+import hashlib
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime, timezone
+import numpy as np
 import ee
 
+from .executor import get_executor
+from .profiling import profiled
+from .notebook_utils import _read_json, _write_json_atomic
+
+# Asset types that can contain other assets
+_CONTAINER_TYPES = ('FOLDER', 'IMAGE_COLLECTION')
+
+# Completed items between two saves of a resumable copy/delete manifest
+_MANIFEST_SAVE_EVERY = 100
+
+try:
+    from shapely import STRtree
+    from shapely.geometry import shape as _shape, Polygon as _Polygon
+except ImportError:  # shapely >= 2.0 is optional, used for exact client-side grid filtering
+    STRtree = None
+
 # ------------------------
 # Feacol Functions
 # ------------------------
 
-def generate_rect_grid(study_area, grid_width=1.5, grid_height=1.5):
+def _sequence(start, end, step):
+    """
+    Client-side equivalent of ``ee.List.sequence(start, end, step)``: start, start + step, ... up to end (inclusive).
+    """
+    count = int(np.floor((end - start) / step + 1e-9)) + 1
+    return start + np.arange(max(count, 0)) * step
+
+
+def _roi_info(study_area, with_geometry, executor=None):
+    """
+    Fetch the bounds of the study area (as computed by ``bounds()`` on the server) and, optionally,
+    its geometry as GeoJSON, in a single request.
+
+    Returns:
+        tuple: ((min_lon, min_lat, max_lon, max_lat), GeoJSON geometry or None).
+    """
+    request = {'bounds': study_area.bounds().coordinates()}
+    if with_geometry:
+        request['geometry'] = study_area.geometry()
+    info = (executor or get_executor()).call(ee.Dictionary(request).getInfo)
+    ring = info['bounds'][0]
+    bounds = (ring[0][0], ring[0][1], ring[2][0], ring[2][1])
+    return bounds, info.get('geometry')
+
+
+def _rect_cells(bounds, grid_width, grid_height):
+    """
+    Compute the rectangular cells of ``generate_rect_grid`` as an (n, 4) array of [x0, y0, x1, y1], in the same order.
+    """
+    lons = _sequence(bounds[0], bounds[2], grid_width)
+    lats = _sequence(bounds[1], bounds[3], grid_height)
+    lon, lat = np.meshgrid(lons, lats, indexing='ij')  # Longitude-major, like the nested ee.List.map
+    lon, lat = lon.ravel(), lat.ravel()
+    return np.stack([lon, lat, lon + grid_width, lat + grid_height], axis=1)
+
+
+def _hex_cells(bounds, radius):
+    """
+    Compute the hexagons of ``generate_hex_grid`` as an (n, 6, 2) array of vertices, in the same order.
+    """
+    xmin, ymin, xmax, ymax = bounds
+    sqrt_3 = np.sqrt(3)
+    r_half = radius / 2
+    r_half_sqrt_3 = r_half * sqrt_3
+    step_x = radius * 3
+    step_y = radius * sqrt_3
+
+    centers = []
+    for xx, yy in ((_sequence(xmin, xmax + radius, step_x), _sequence(ymin, ymax + radius, step_y)),
+                   (_sequence(xmin - radius * 1.5, xmax + radius, step_x), _sequence(ymin + r_half_sqrt_3, ymax + radius, step_y))):
+        x, y = np.meshgrid(xx, yy, indexing='ij')
+        centers.append(np.stack([x.ravel(), y.ravel()], axis=1))
+    x, y = np.concatenate(centers).T
+
+    vertices_x = np.stack([x - radius, x - r_half, x + r_half, x + radius, x + r_half, x - r_half], axis=1)
+    vertices_y = np.stack([y, y - r_half_sqrt_3, y - r_half_sqrt_3, y, y + r_half_sqrt_3, y + r_half_sqrt_3], axis=1)
+    return np.stack([vertices_x, vertices_y], axis=2)
+
+
+def _polygon_parts(geometry):
+    """
+    Yield the outer rings of every polygon in a GeoJSON geometry.
+    """
+    kind = geometry['type']
+    if kind == 'Polygon':
+        yield geometry['coordinates'][0]
+    elif kind == 'MultiPolygon':
+        for polygon in geometry['coordinates']:
+            yield polygon[0]
+    elif kind == 'GeometryCollection':
+        for part in geometry['geometries']:
+            yield from _polygon_parts(part)
+
+
+def _prefilter_cells(cell_bboxes, cell_polygons, roi_geometry, margin=0.0, chunk_size=100000):
+    """
+    Return the indices (in grid order) of the cells intersecting the ROI.
+
+    With shapely, an STR-tree over the cells is queried with the ROI (buffered by ``margin``).
+    Without it, cells are kept when their bounding box overlaps the bounding box of any ROI
+    polygon, which is a superset of the intersecting cells.
+    """
+    if STRtree is not None:
+        roi = _shape(roi_geometry)
+        if margin:
+            roi = roi.buffer(margin)
+        tree = STRtree([_Polygon(polygon) for polygon in cell_polygons])
+        return np.sort(tree.query(roi, predicate='intersects'))
+
+    parts = np.array([
+        [min(p[0] for p in ring) - margin, min(p[1] for p in ring) - margin,
+         max(p[0] for p in ring) + margin, max(p[1] for p in ring) + margin]
+        for ring in _polygon_parts(roi_geometry)
+    ])
+    if parts.size == 0:
+        return np.arange(len(cell_bboxes))
+    keep = []
+    for start in range(0, len(cell_bboxes), chunk_size):
+        boxes = cell_bboxes[start:start + chunk_size, None, :]
+        overlap = ((boxes[..., 0] <= parts[:, 2]) & (boxes[..., 2] >= parts[:, 0]) &
+                   (boxes[..., 1] <= parts[:, 3]) & (boxes[..., 3] >= parts[:, 1])).any(axis=1)
+        keep.append(np.nonzero(overlap)[0] + start)
+    return np.concatenate(keep)
+
+
+def _cells_to_feature_collection(cells, to_geometry, batch_size):
+    """
+    Upload cell coordinates as compact ``ee.List`` literals, turned into features by one server-side map per batch.
+    """
+    batches = [
+        ee.FeatureCollection(ee.List(cells[start:start + batch_size].tolist()).map(
+            lambda coords: ee.Feature(to_geometry(coords))))
+        for start in range(0, len(cells), batch_size)
+    ]
+    return ee.FeatureCollection(batches).flatten() if batches else ee.FeatureCollection([])
+
+
+def _cells_to_geojson(polygons):
+    """
+    Convert (n, k, 2) polygon vertices into a GeoJSON FeatureCollection with closed rings.
+    """
+    features = []
+    for i, polygon in enumerate(polygons.tolist()):
+        ring = polygon + [polygon[0]]
+        features.append({
+            'type': 'Feature',
+            'id': i,
+            'geometry': {'type': 'Polygon', 'coordinates': [ring]},
+            'properties': {},
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def _client_grid(study_area, roi_geometry, cells, polygons, to_geometry, margin, mode, batch_size):
+    """
+    Shared tail of the client-side grid generators: prefilter locally, then upload or return GeoJSON.
+    """
+    bboxes = np.concatenate([polygons.min(axis=1), polygons.max(axis=1)], axis=1)
+
+    if mode == 'geojson':
+        return _cells_to_geojson(polygons[_prefilter_cells(bboxes, polygons, roi_geometry)])
+
+    # The local test only has to be a superset: the server-side filterBounds keeps the result
+    # identical to the server mode, including cells that only touch the ROI along geodesic edges
+    keep = _prefilter_cells(bboxes, polygons, roi_geometry, margin=margin)
+    return _cells_to_feature_collection(cells[keep], to_geometry, batch_size).filterBounds(study_area)
+
+
+@profiled
+def generate_rect_grid(study_area, grid_width=1.5, grid_height=1.5, mode='server', batch_size=5000, executor=None):
     """
     Generate a rectangular grid within the given study area.
 
@@ -15,10 +189,26 @@ def generate_rect_grid(study_area, grid_width=1.5, grid_height=1.5):
         study_area (ee.FeatureCollection): The region of interest (study area).
         grid_width (float): The grid cell width (longitude direction) in degrees (default is 1.5).
         grid_height (float): The grid cell height (latitude direction) in degrees (default is 1.5).
+        mode (str): Where the cells are computed.
+            - 'server': Build every cell with nested ``ee.List.map`` calls (default).
+            - 'client': Compute cells locally with NumPy, drop cells far from the ROI and upload the rest
+              in compact batches. The result is identical to 'server'; use it for fine grids over large ROIs.
+            - 'geojson': Compute and filter cells locally and return them as a GeoJSON dict (planar intersection test).
+        batch_size (int): Number of cells per uploaded batch in 'client' mode (default is 5000).
+        executor (GEEExecutor, optional): Executor running the ROI request in 'client'/'geojson' mode.
 
     Returns:
-        ee.FeatureCollection: The generated grid, clipped to the study area.
+        ee.FeatureCollection: The generated grid, clipped to the study area (a GeoJSON dict in 'geojson' mode).
     """
+    if mode in ('client', 'geojson'):
+        bounds, roi_geometry = _roi_info(study_area, with_geometry=True, executor=executor)
+        cells = _rect_cells(bounds, grid_width, grid_height)
+        polygons = cells[:, [[0, 1], [2, 1], [2, 3], [0, 3]]]
+        return _client_grid(study_area, roi_geometry, cells, polygons, ee.Geometry.Rectangle,
+                            max(grid_width, grid_height), mode, batch_size)
+    elif mode != 'server':
+        raise ValueError(f"Unsupported mode: {mode}")
+
     bounds = study_area.bounds()
     coords = bounds.coordinates().get(0)
 
@@ -44,17 +234,29 @@ def generate_rect_grid(study_area, grid_width=1.5, grid_height=1.5):
     return grid_fc.filterBounds(study_area)
 
 
-def generate_hex_grid(study_area, radius=1.5):
+@profiled
+def generate_hex_grid(study_area, radius=1.5, mode='server', batch_size=5000, executor=None):
     """
     Generate a hexagonal grid within the given study area.
 
     Args:
         study_area (ee.FeatureCollection): The region of interest (study area).
         radius (float): The distance from the center to the edge of the hexagon (default is 1.5 degrees).
+        mode (str): 'server' (default), 'client' or 'geojson', see ``generate_rect_grid``.
+        batch_size (int): Number of cells per uploaded batch in 'client' mode (default is 5000).
+        executor (GEEExecutor, optional): Executor running the ROI request in 'client'/'geojson' mode.
 
     Returns:
-        ee.FeatureCollection: The generated hexagonal grid, clipped to the study area.
+        ee.FeatureCollection: The generated hexagonal grid, clipped to the study area (a GeoJSON dict in 'geojson' mode).
     """
+    if mode in ('client', 'geojson'):
+        bounds, roi_geometry = _roi_info(study_area, with_geometry=True, executor=executor)
+        polygons = _hex_cells(bounds, radius)
+        return _client_grid(study_area, roi_geometry, polygons, polygons, lambda ring: ee.Geometry.Polygon([ring]),
+                            2 * radius, mode, batch_size)
+    elif mode != 'server':
+        raise ValueError(f"Unsupported mode: {mode}")
+
     bounds = study_area.bounds()
     coords = bounds.coordinates().get(0)
 
@@ -108,92 +310,608 @@ def generate_hex_grid(study_area, radius=1.5):
     return hex_grid.filterBounds(study_area)
 
 
+# ------------------------
+# Tiling Functions
+# ------------------------
+
+# Approximate length of one degree of latitude / of longitude at the equator, in meters
+_METERS_PER_DEGREE_LAT = 110574.0
+_METERS_PER_DEGREE_LON = 111320.0
+
+
+class Tile(namedtuple('Tile', ['level', 'x', 'y'])):
+    """
+    A cell of the global quadtree tiling of longitude/latitude space.
+
+    Level 0 is the whole world (-180..180, -90..90). Every level splits each tile into 2 x 2
+    children, so a level-z tile spans 360 / 2**z degrees of longitude and 180 / 2**z degrees of
+    latitude. ``x`` counts columns eastwards from -180 and ``y`` counts rows southwards from 90.
+    IDs do not depend on the region or the run, so they can be used to shard jobs.
+    """
+    __slots__ = ()
+
+    @property
+    def id(self):
+        """
+        str: Stable tile ID, 'level/x/y'.
+        """
+        return f"{self.level}/{self.x}/{self.y}"
+
+    @property
+    def quadkey(self):
+        """
+        str: Quadkey of the tile; the quadkey of every ancestor is a prefix of it ('' for the level-0 tile).
+        """
+        digits = []
+        for i in range(self.level, 0, -1):
+            mask = 1 << (i - 1)
+            digits.append(str((1 if self.x & mask else 0) + (2 if self.y & mask else 0)))
+        return ''.join(digits)
+
+    @property
+    def bounds(self):
+        """
+        tuple: (min_lon, min_lat, max_lon, max_lat) of the tile.
+        """
+        width, height = 360.0 / (1 << self.level), 180.0 / (1 << self.level)
+        min_lon = -180.0 + self.x * width
+        max_lat = 90.0 - self.y * height
+        return (min_lon, max_lat - height, min_lon + width, max_lat)
+
+    @property
+    def parent(self):
+        if self.level == 0:
+            return None
+        return Tile(self.level - 1, self.x >> 1, self.y >> 1)
+
+    @property
+    def children(self):
+        x, y = self.x << 1, self.y << 1
+        return [Tile(self.level + 1, x + dx, y + dy) for dy in (0, 1) for dx in (0, 1)]
+
+    @classmethod
+    def from_id(cls, tile_id):
+        """
+        Build a tile from its 'level/x/y' ID.
+        """
+        level, x, y = (int(part) for part in tile_id.split('/'))
+        return cls(level, x, y)
+
+    @classmethod
+    def from_quadkey(cls, quadkey):
+        """
+        Build a tile from its quadkey.
+        """
+        x = y = 0
+        for digit in quadkey:
+            value = int(digit)
+            x = (x << 1) | (value & 1)
+            y = (y << 1) | (value >> 1)
+        return cls(len(quadkey), x, y)
+
+
+def _region_bounds_and_geometry(region, executor=None):
+    """
+    Normalize a region to ((min_lon, min_lat, max_lon, max_lat), GeoJSON geometry or None).
+
+    ``region`` can be a bounds tuple, a GeoJSON geometry dict, or an ee.Geometry / ee.FeatureCollection
+    (fetched with a single request).
+    """
+    if isinstance(region, (tuple, list)) and len(region) == 4:
+        return tuple(float(v) for v in region), None
+    if isinstance(region, dict):
+        points = [point for ring in _polygon_parts(region) for point in ring]
+        if not points:
+            raise ValueError("The region has no polygon coordinates.")
+        lons, lats = zip(*points)
+        return (min(lons), min(lats), max(lons), max(lats)), region
+    if isinstance(region, ee.Geometry):
+        region = ee.FeatureCollection([ee.Feature(region)])
+    return _roi_info(region, with_geometry=True, executor=executor)
+
+
+def _tile_boxes(tiles):
+    return np.array([tile.bounds for tile in tiles], dtype=float).reshape(-1, 4)
+
+
+def _filter_tiles(tiles, geometry):
+    """
+    Keep the tiles intersecting a GeoJSON geometry (bounding boxes of its polygons without shapely).
+    """
+    if geometry is None or not tiles:
+        return list(tiles)
+    boxes = _tile_boxes(tiles)
+    polygons = boxes[:, [[0, 1], [2, 1], [2, 3], [0, 3]]]
+    return [tiles[i] for i in _prefilter_cells(boxes, polygons, geometry)]
+
+
+def tiles_for_region(region, level, executor=None):
+    """
+    Enumerate the tiles of one level overlapping a region, without building the global grid.
+
+    Args:
+        region: (min_lon, min_lat, max_lon, max_lat), a GeoJSON geometry, an ee.Geometry or an ee.FeatureCollection.
+        level (int): Quadtree level (tile size 360 / 2**level by 180 / 2**level degrees).
+        executor (GEEExecutor, optional): Executor running the request when ``region`` is an ee object.
+
+    Returns:
+        list: The overlapping ``Tile`` objects, row by row from the north-west.
+    """
+    bounds, geometry = _region_bounds_and_geometry(region, executor)
+    n = 1 << level
+    width, height = 360.0 / n, 180.0 / n
+    x0 = min(max(int(np.floor((bounds[0] + 180.0) / width)), 0), n - 1)
+    x1 = min(max(int(np.ceil((bounds[2] + 180.0) / width)) - 1, x0), n - 1)
+    y0 = min(max(int(np.floor((90.0 - bounds[3]) / height)), 0), n - 1)
+    y1 = min(max(int(np.ceil((90.0 - bounds[1]) / height)) - 1, y0), n - 1)
+    tiles = [Tile(level, x, y) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+    return _filter_tiles(tiles, geometry)
+
+
+def estimate_tile_pixels(tile, scale, bands=1):
+    """
+    Estimate the number of pixels of a tile at a given scale (equirectangular approximation).
+
+    Args:
+        tile (Tile): The tile.
+        scale (float): Pixel size in meters.
+        bands (int): Number of bands (default is 1).
+
+    Returns:
+        float: Estimated pixel count (times the number of bands).
+    """
+    min_lon, min_lat, max_lon, max_lat = tile.bounds
+    center_lat = np.radians((min_lat + max_lat) / 2)
+    width_m = (max_lon - min_lon) * _METERS_PER_DEGREE_LON * np.cos(center_lat)
+    height_m = (max_lat - min_lat) * _METERS_PER_DEGREE_LAT
+    return float(max(width_m, 0.0) / scale * height_m / scale * bands)
+
+
+def adaptive_tiles(region, scale, max_pixels=1e8, min_level=0, max_level=16, pixel_estimator=None, executor=None):
+    """
+    Cover a region with tiles of mixed levels, splitting every tile whose pixel estimate is too large.
+
+    Args:
+        region: (min_lon, min_lat, max_lon, max_lat), a GeoJSON geometry, an ee.Geometry or an ee.FeatureCollection.
+        scale (float): Pixel size in meters.
+        max_pixels (float): Largest acceptable pixel estimate per tile (default is 1e8).
+        min_level (int): Level of the initial tiles (default is 0).
+        max_level (int): Tiles are never split beyond this level (default is 16).
+        pixel_estimator (callable, optional): ``f(tile, scale) -> float`` returning the work of a tile, e.g. a
+            data-density aware estimate. Defaults to ``estimate_tile_pixels``.
+        executor (GEEExecutor, optional): Executor running the request when ``region`` is an ee object.
+
+    Returns:
+        list: ``Tile`` objects covering the region, sorted by quadkey (so siblings stay adjacent).
+    """
+    estimator = pixel_estimator or estimate_tile_pixels
+    bounds, geometry = _region_bounds_and_geometry(region, executor)
+    pending = tiles_for_region(bounds, min_level)
+    pending = _filter_tiles(pending, geometry)
+    result = []
+    while pending:
+        to_split = []
+        for tile in pending:
+            if tile.level < max_level and estimator(tile, scale) > max_pixels:
+                to_split.extend(tile.children)
+            else:
+                result.append(tile)
+        # Only keep the children that still overlap the region
+        if to_split:
+            boxes = _tile_boxes(to_split)
+            overlap = ((boxes[:, 0] < bounds[2]) & (boxes[:, 2] > bounds[0]) &
+                       (boxes[:, 1] < bounds[3]) & (boxes[:, 3] > bounds[1]))
+            to_split = _filter_tiles([tile for tile, keep in zip(to_split, overlap) if keep], geometry)
+        pending = to_split
+    return sorted(result, key=lambda tile: tile.quadkey)
+
+
+def partition_tiles(tiles, n_workers, weight=None):
+    """
+    Split tiles into balanced work lists (greedy longest-processing-time assignment).
+
+    The assignment only depends on the tiles and their weights, so every worker can compute it
+    independently and pick its own share.
+
+    Args:
+        tiles (list): ``Tile`` objects.
+        n_workers (int): Number of workers.
+        weight (callable, optional): ``f(tile) -> float`` work estimate (default: one unit per tile).
+
+    Returns:
+        list: ``n_workers`` lists of tiles.
+    """
+    weight = weight or (lambda tile: 1.0)
+    loads = [(0.0, worker) for worker in range(n_workers)]
+    heapq.heapify(loads)
+    parts = [[] for _ in range(n_workers)]
+    for tile in sorted(tiles, key=lambda tile: (-weight(tile), tile.id)):
+        load, worker = heapq.heappop(loads)
+        parts[worker].append(tile)
+        heapq.heappush(loads, (load + weight(tile), worker))
+    return parts
+
+
+def tiles_to_feature_collection(tiles, batch_size=5000):
+    """
+    Upload tiles as an ee.FeatureCollection of rectangles with 'tile_id', 'quadkey', 'level', 'x' and 'y' properties.
+
+    Args:
+        tiles (list): ``Tile`` objects.
+        batch_size (int): Number of tiles per uploaded batch (default is 5000).
+
+    Returns:
+        ee.FeatureCollection: One feature per tile, in the given order.
+    """
+    records = [[list(tile.bounds), tile.id, tile.quadkey, tile.level, tile.x, tile.y] for tile in tiles]
+
+    def to_feature(record):
+        record = ee.List(record)
+        return ee.Feature(ee.Geometry.Rectangle(record.get(0)), {
+            'tile_id': record.get(1),
+            'quadkey': record.get(2),
+            'level': record.get(3),
+            'x': record.get(4),
+            'y': record.get(5),
+        })
+
+    batches = [
+        ee.FeatureCollection(ee.List(records[start:start + batch_size]).map(to_feature))
+        for start in range(0, len(records), batch_size)
+    ]
+    return ee.FeatureCollection(batches).flatten() if batches else ee.FeatureCollection([])
+
+
 # ------------------------
 # Image Collection Functions
 # ------------------------
 
-def imgCol_date(imgcol):
+def _metadata_page(imgcol, offset, page_size, cloud_property, footprint):
+    """
+    Build the request returning the metadata records of one page of an image collection.
+    """
+    def to_feature(img):
+        img = ee.Image(img)
+        properties = {
+            'id': img.get('system:id'),
+            'index': img.get('system:index'),
+            'time_start': img.get('system:time_start'),
+            'cloud_cover': img.get(cloud_property),
+        }
+        if footprint:
+            properties['footprint'] = img.get('system:footprint')
+        return ee.Feature(None, properties)
+
+    return ee.FeatureCollection(imgcol.toList(page_size, offset).map(to_feature))
+
+
+@profiled
+def imgCol_metadata(imgcol, page_size=1000, cloud_property='CLOUD_COVER', footprint=False,
+                    as_dataframe=False, cache_dir=None, executor=None):
+    """
+    Scan the metadata of an image collection page by page, without printing anything.
+
+    Pages of ``page_size`` images are requested concurrently through the executor, which keeps every
+    response well below the Earth Engine payload limit. Records are yielded in collection order.
+
+    Args:
+        imgcol (ee.ImageCollection): The input image collection.
+        page_size (int): Number of images per request (default is 1000).
+        cloud_property (str): Image property reported as 'cloud_cover' (default is 'CLOUD_COVER').
+        footprint (bool): Whether to include the 'footprint' GeoJSON of each image (default is False).
+        as_dataframe (bool): Return a pandas DataFrame instead of a generator (default is False).
+        cache_dir (str, optional): Directory caching the records, keyed by the serialized collection expression.
+        executor (GEEExecutor, optional): Executor running the requests (default is the shared executor).
+
+    Returns:
+        generator or pandas.DataFrame: Records with 'id', 'index', 'time_start' (milliseconds),
+        'cloud_cover' and optionally 'footprint'.
+    """
+    records = _scan_metadata(imgcol, page_size, cloud_property, footprint, cache_dir, executor or get_executor())
+    if as_dataframe:
+        import pandas as pd
+        return pd.DataFrame(list(records), columns=['id', 'index', 'time_start', 'cloud_cover'] + (['footprint'] if footprint else []))
+    return records
+
+
+def _scan_metadata(imgcol, page_size, cloud_property, footprint, cache_dir, executor):
+    cache_path = None
+    if cache_dir:
+        key = hashlib.sha1(f"{imgcol.serialize()}|{page_size}|{cloud_property}|{footprint}".encode('utf-8')).hexdigest()
+        cache_path = os.path.join(os.path.expanduser(cache_dir), f"imgcol-{key}.json")
+        cached = _read_json(cache_path)
+        if cached is not None:
+            yield from cached
+            return
+
+    size = executor.call(imgcol.size().getInfo)
+    collected = [] if cache_path else None
+
+    def fetch(offset):
+        return _metadata_page(imgcol, offset, page_size, cloud_property, footprint).getInfo()
+
+    # Keep a bounded number of pages in flight, so memory does not grow with the collection size
+    pending = iter(range(0, size, page_size))
+    in_flight = deque(executor.submit(fetch, offset) for offset in itertools.islice(pending, 2 * executor.max_workers))
+    while in_flight:
+        page = in_flight.popleft().result()
+        for offset in itertools.islice(pending, 1):
+            in_flight.append(executor.submit(fetch, offset))
+        for feature in page['features']:
+            properties = feature.get('properties', {})
+            record = {
+                'id': properties.get('id'),
+                'index': properties.get('index'),
+                'time_start': properties.get('time_start'),
+                'cloud_cover': properties.get('cloud_cover'),
+            }
+            if footprint:
+                record['footprint'] = properties.get('footprint')
+            if collected is not None:
+                collected.append(record)
+            yield record
+
+    if cache_path:
+        _write_json_atomic(cache_path, collected)
+
+
+def imgCol_date(imgcol, executor=None, verbose=True, page_size=1000):
     """
     Print the start date of each image in the image collection, formatted as 'yyyy-MM-dd'.
 
     Args:
         imgcol (ee.ImageCollection): The input image collection.
+        executor (GEEExecutor, optional): Executor running the requests (default is the shared executor).
+        verbose (bool): Whether to print the dates (default is True).
+        page_size (int): Number of images per request, see ``imgCol_metadata`` (default is 1000).
 
     Returns:
         list: A list of start dates for all images in the collection, formatted as 'yyyy-MM-dd'.
     """
-    def format_start_date(image):
-        # Get the start time attribute of the image and format it as 'yyyy-MM-dd'
-        start_date = ee.Date(image.get('system:time_start')).format('yyyy-MM-dd')
-        return ee.Feature(None, {'date': start_date})  # Create a feature with the date
+    dates = [
+        datetime.fromtimestamp(record['time_start'] / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+        for record in imgCol_metadata(imgcol, page_size=page_size, executor=executor)
+        if record['time_start'] is not None
+    ]
+    if verbose:
+        print("Start dates of images in the collection:")
+        for date in dates:
+            print(date)
 
-    # Map the image collection to date features
-    date_features = imgcol.map(format_start_date)
+    return dates
 
-    # Extract the dates and print them
-    dates = date_features.aggregate_array('date').getInfo()
-    print("Start dates of images in the collection:")
-    for date in dates:
-        print(date)
 
-    return dates
+# Aggregation methods of imgCol_merge that ee.ImageCollection implements directly (keeping band names)
+_COLLECTION_REDUCERS = ('mean', 'median', 'min', 'max', 'sum', 'mode', 'count', 'product')
 
 
+def _merge_reducer(method):
+    """
+    Build the ee.Reducer for an aggregation method name ('mean', 'count', 'p90', ...) or pass an ee.Reducer through.
+    """
+    if isinstance(method, ee.Reducer):
+        return method
+    if isinstance(method, str) and method[:1] == 'p' and method[1:].replace('.', '', 1).isdigit():
+        return ee.Reducer.percentile([float(method[1:])])
+    if method in _COLLECTION_REDUCERS or method == 'stdDev':
+        return getattr(ee.Reducer, method)()
+    raise ValueError(f"Unsupported aggregation method: {method}")
+
+
+@profiled
 def imgCol_merge(collection, interval, aggregation_method='median'):
     """
     Merge a time series image collection into aggregated images based on a given time interval.
 
+    Each image is tagged once with the index of its time window, images of the same window are
+    grouped with a single ``ee.Join``, and windows without images are skipped.
+
     Args:
         collection (ee.ImageCollection): The input time series image collection.
         interval (int): The time interval for merging (in days).
-        aggregation_method (str): The aggregation method, can be 'mean', 'median', 'min', or 'max'. Default is 'median'.
+        aggregation_method (str or list): The aggregation method, can be 'mean', 'median', 'min', 'max',
+            'sum', 'count', 'stdDev', a percentile such as 'p90', or an ``ee.Reducer``. Default is 'median'.
+            A list of methods is combined into one reducer pass; the output bands are then named
+            '<band>_<method>' (e.g. 'nir_median', 'nir_count', 'nir_p90').
 
     Returns:
-        ee.ImageCollection: The merged image collection with aggregated images.
-    """
-    # Get the start and end dates of the collection
-    start_date = ee.Date(collection.sort('system:time_start').first().get('system:time_start'))
-    end_date = ee.Date(collection.sort('system:time_start').aggregate_max('system:time_start'))
-    time_range = ee.List.sequence(start_date.millis(), end_date.millis(), interval * 24 * 60 * 60 * 1000)
-
-    def merge_function(start_millis):
-        start = ee.Date(start_millis)
-        end = start.advance(interval, 'day')
-        subset = collection.filterDate(start, end)
-
-        # Apply the aggregation method
-        if aggregation_method == 'mean':
-            aggregated_image = subset.mean()
-        elif aggregation_method == 'median':
-            aggregated_image = subset.median()
-        elif aggregation_method == 'min':
-            aggregated_image = subset.min()
-        elif aggregation_method == 'max':
-            aggregated_image = subset.max()
-        else:
-            raise ValueError(f"Unsupported aggregation method: {aggregation_method}")
-
-        return aggregated_image.set('system:time_start', start.millis())
-
-    # Map the merge function over the time range and return the merged collection
-    merged_collection = time_range.map(merge_function)
-
-    return ee.ImageCollection(merged_collection)
+        ee.ImageCollection: The merged image collection with aggregated images, sorted by time.
+    """
+    methods = aggregation_method if isinstance(aggregation_method, (list, tuple)) else [aggregation_method]
+    if not methods:
+        raise ValueError("At least one aggregation method is required.")
+    reducers = [_merge_reducer(method) for method in methods]  # Validate before building the graph
+
+    # Get the start date of the collection and the window length
+    start_millis = ee.Number(collection.reduceColumns(ee.Reducer.min(), ['system:time_start']).get('min'))
+    interval_millis = interval * 24 * 60 * 60 * 1000
+
+    # Tag every image with the index of its window
+    tagged = collection.map(lambda img: img.set(
+        'merge_bin', ee.Number(img.get('system:time_start')).subtract(start_millis).divide(interval_millis).floor()))
+
+    # One primary element per non-empty window, joined with all images of that window
+    windows = ee.Join.saveAll('merge_images').apply(
+        primary=tagged.distinct('merge_bin'),
+        secondary=tagged,
+        condition=ee.Filter.equals(leftField='merge_bin', rightField='merge_bin'),
+    )
+
+    if len(methods) == 1 and methods[0] in _COLLECTION_REDUCERS:
+        aggregate = lambda images: getattr(images, methods[0])()
+    else:
+        reducer = reducers[0]
+        for other in reducers[1:]:
+            reducer = reducer.combine(other, sharedInputs=True)
+        aggregate = lambda images: images.reduce(reducer)
+
+    def merge_function(window):
+        window_start = start_millis.add(ee.Number(window.get('merge_bin')).multiply(interval_millis))
+        images = ee.ImageCollection.fromImages(window.get('merge_images'))
+        return aggregate(images).set('system:time_start', window_start)
+
+    return ee.ImageCollection(windows.map(merge_function)).sort('system:time_start')
 
 
 # ------------------------
 # Class 
 # ------------------------
 
+class AssetIndex:
+    def __init__(self, lister, ttl=300, clock=time.monotonic):
+        """
+        Initialize a lazily populated index of an asset tree.
+
+        Each folder (or ImageCollection) is listed once, on the first lookup that needs it, and its
+        children are kept in a dict keyed by asset path. Lookups are then local and O(1) until the
+        listing is older than ``ttl`` or invalidated.
+
+        Args:
+            lister (callable): Function returning an iterable of asset records (dicts with 'name' and 'type') for a folder path.
+            ttl (float): Seconds before a folder listing is considered stale, None to never expire (default is 300).
+            clock (callable): Monotonic clock used for the TTL (default is ``time.monotonic``).
+        """
+        self.lister = lister
+        self.ttl = ttl
+        self.clock = clock
+        self._assets = {}   # Asset path -> asset record
+        self._folders = {}  # Folder path -> (time listed, set of child paths)
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _parent(path):
+        return path.rsplit('/', 1)[0]
+
+    def _fresh(self, folder):
+        entry = self._folders.get(folder)
+        return entry is not None and (self.ttl is None or self.clock() - entry[0] < self.ttl)
+
+    def _load(self, folder):
+        """
+        Return the child paths of a folder, listing it only if it is not indexed or stale.
+        """
+        with self._lock:
+            if self._fresh(folder):
+                return self._folders[folder][1]
+        records = list(self.lister(folder))  # Remote call, made outside the lock
+        with self._lock:
+            old = self._folders.get(folder)
+            for path in (old[1] if old else ()):
+                self._assets.pop(path, None)
+            children = set()
+            for record in records:
+                self._assets[record['name']] = record
+                children.add(record['name'])
+            self._folders[folder] = (self.clock(), children)
+            return children
+
+    def children(self, folder):
+        """
+        Return the asset records directly under a folder or ImageCollection.
+        """
+        paths = self._load(folder)
+        with self._lock:
+            return [self._assets[path] for path in sorted(paths) if path in self._assets]
+
+    def get(self, path):
+        """
+        Return the asset record of a path, or None if the asset does not exist.
+        """
+        if path not in self._load(self._parent(path)):
+            return None
+        with self._lock:
+            return self._assets.get(path)
+
+    def exists(self, path):
+        return self.get(path) is not None
+
+    def type(self, path):
+        """
+        Return the asset type ('IMAGE', 'IMAGE_COLLECTION', 'FOLDER', ...), or None if the asset does not exist.
+        """
+        record = self.get(path)
+        return record['type'] if record else None
+
+    def size(self, path):
+        """
+        Return the size in bytes reported by the listing, or None if unknown.
+        """
+        record = self.get(path)
+        size = record.get('sizeBytes') if record else None
+        return int(size) if size is not None else None
+
+    def add(self, path, asset_type, **fields):
+        """
+        Record an asset created by this process, without listing its folder again.
+        """
+        with self._lock:
+            record = dict(fields, name=path, type=asset_type)
+            self._assets[path] = record
+            parent = self._folders.get(self._parent(path))
+            if parent is not None:
+                parent[1].add(path)
+            if asset_type in _CONTAINER_TYPES:
+                self._folders.setdefault(path, (self.clock(), set()))
+
+    def remove(self, path):
+        """
+        Forget a deleted asset and everything indexed below it.
+        """
+        with self._lock:
+            parent = self._folders.get(self._parent(path))
+            if parent is not None:
+                parent[1].discard(path)
+            # Walk the indexed subtree through the child sets: the cost depends on the subtree, not the index
+            stack = [path]
+            while stack:
+                current = stack.pop()
+                self._assets.pop(current, None)
+                entry = self._folders.pop(current, None)
+                if entry is not None:
+                    stack.extend(entry[1])
+
+    def invalidate(self, folder=None):
+        """
+        Drop the listing of a folder (and of the folders below it), or of every folder if None.
+        """
+        with self._lock:
+            if folder is None:
+                self._folders.clear()
+                self._assets.clear()
+                return
+            prefix = folder + '/'
+            for path in [f for f in self._folders if f == folder or f.startswith(prefix)]:
+                del self._folders[path]
+
+
 class GEEAssetManager:
-    def __init__(self, root_path):
+    def __init__(self, root_path, executor=None, data=None, interactive=True, index_ttl=300):
         """
         Initialize the GEEAssetManager with the root directory path.
 
         Args:
             root_path (str): The root path of the GEE asset directory.
+            executor (GEEExecutor, optional): Executor running the asset requests (default is the shared executor).
+            data (module, optional): The ``ee.data`` API, or a stand-in with the same functions (default is ``ee.data``).
+            interactive (bool): Ask for confirmation on the console before destructive actions (default is True).
+                Set to False for batch jobs, where ``input()`` is not available.
+            index_ttl (float): Seconds a folder listing is reused by existence checks (default is 300).
         """
         self.root_path = root_path  # Store the root directory path
+        self.executor = executor or get_executor()
+        self.data = data or ee.data
+        self.interactive = interactive
+        self.index = AssetIndex(self._list_assets, ttl=index_ttl)  # Lazily populated cache of folder listings
+
+    def _call(self, method, *args):
+        """
+        Run an ``ee.data`` method through the executor, with retries on rate-limit errors.
+
+        Args:
+            method (str): Name of the ``ee.data`` function, e.g. 'listAssets'.
+            *args: Arguments passed to the function.
+        """
+        return self.executor.call(getattr(self.data, method), *args)
 
     def _get_full_path(self, sub_path):
         """
@@ -220,15 +938,58 @@ class GEEAssetManager:
         """
         # Print the action to be confirmed
         print(f"Action to be performed: {action_name}")
-        confirmation = input(f"Type 'yes' to confirm the action or 'no' to cancel: ").strip().lower()
 
-        # If skip_confirmation is True, directly perform the action
-        if skip_confirmation or confirmation == 'yes':
+        # If skip_confirmation is True (or the manager is non-interactive), directly perform the action
+        if skip_confirmation or not self.interactive:
+            return True
+
+        confirmation = input(f"Type 'yes' to confirm the action or 'no' to cancel: ").strip().lower()
+        if confirmation == 'yes':
             return True
         else:
             print(f"Action {action_name} was cancelled.")
             return False
 
+    def _list_assets(self, full_path, page_size=1000):
+        """
+        Private method to list the direct children of a folder or ImageCollection, following every result page.
+
+        Args:
+            full_path (str): The full path of the folder or ImageCollection.
+            page_size (int): Number of assets requested per page (default is 1000).
+
+        Yields:
+            dict: The asset records returned by ``ee.data.listAssets``.
+        """
+        page_token = None
+        while True:
+            params = {'parent': full_path, 'pageSize': page_size}
+            if page_token:
+                params['pageToken'] = page_token
+            response = self._call('listAssets', params)
+            for asset in response.get('assets', []):
+                yield asset
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+
+    def _walk_assets(self, full_path):
+        """
+        Private method to list every asset below a folder or ImageCollection, at any depth.
+
+        Returns:
+            list: (asset, depth) pairs, depth 1 being the direct children.
+        """
+        found = []
+        containers = [(full_path, 0)]
+        while containers:
+            path, depth = containers.pop()
+            for asset in self.index.children(path):
+                found.append((asset, depth + 1))
+                if asset['type'] in _CONTAINER_TYPES:
+                    containers.append((asset['name'], depth + 1))
+        return found
+
     def _ensure_asset_exists(self, sub_path, asset_type='IMAGE_COLLECTION'):
         """
         Private method to check if the specified GEE asset exists; do not print anything.
@@ -240,50 +1001,130 @@ class GEEAssetManager:
         Returns:
             bool: True if the asset exists, False if it does not exist.
         """
-        full_path = self._get_full_path(sub_path)  # Get the full path by combining root path and sub-path
-        parent = '/'.join(full_path.split('/')[:-1])
-        assets = ee.data.listAssets(parent).get('assets', [])
-        existing_names = [a['name'] for a in assets]
+        # The parent folder is listed once and then answered from the asset index
+        return self.index.exists(self._get_full_path(sub_path))
+
+    def asset_info(self, sub_path):
+        """
+        Return the listing record of an asset (name, type, sizeBytes, ...), served from the asset index.
 
-        # Return True if the asset exists, False otherwise
-        return full_path in existing_names
+        Args:
+            sub_path (str): The relative path of the asset.
+
+        Returns:
+            dict: The asset record, or None if the asset does not exist.
+        """
+        return self.index.get(self._get_full_path(sub_path))
+
+    def invalidate_index(self, sub_path=None):
+        """
+        Forget cached listings, e.g. after assets were changed outside this manager.
+
+        Args:
+            sub_path (str, optional): The folder to forget (with its subfolders); None forgets everything.
+        """
+        self.index.invalidate(self._get_full_path(sub_path) if sub_path else None)
 
-    def delete_asset_folder(self, sub_path):
+    def _run_manifest_jobs(self, manifest, manifest_path, fn, items, label):
+        """
+        Private method to run ``fn`` over the items not yet marked done in the manifest, concurrently.
+
+        Completed items are appended to ``manifest['done']``, which is saved every
+        ``_MANIFEST_SAVE_EVERY`` completions and at the end, so an interrupted job can resume
+        (the callers save the listing itself before starting).
+
+        Returns:
+            int: The number of failed items.
+        """
+        done = set(manifest['done'])
+        pending = [item for item in items if item not in done]
+        failures = 0
+        for count, (item, error) in enumerate(self.executor.map(fn, pending, ordered=False), start=1):
+            if error is None:
+                manifest['done'].append(item)
+                print(f"{label}: {item}")
+            else:
+                failures += 1
+                print(f"Failed: {item}: {error}")
+            if manifest_path and count % _MANIFEST_SAVE_EVERY == 0:
+                _write_json_atomic(manifest_path, manifest)
+        if manifest_path:
+            _write_json_atomic(manifest_path, manifest)
+        return failures
+
+    def delete_asset_folder(self, sub_path, skip_confirmation=False, manifest_path=None):
         """
         Recursively delete all child assets under a specified GEE folder or ImageCollection,
         then delete the folder itself after confirmation.
 
+        Children are deleted concurrently, deepest first. With ``manifest_path``, the listing and the
+        deleted assets are recorded in a JSON manifest, and a rerun resumes without listing again.
+
         Args:
             sub_path (str): The relative path of the folder or ImageCollection to delete.
+            skip_confirmation (bool): If True, delete without asking for confirmation (default is False).
+            manifest_path (str, optional): Path of the JSON manifest used to resume an interrupted deletion.
         """
         full_path = self._get_full_path(sub_path)  # Get the full path by combining root path and sub-path
         action_name = f"Delete Folder and Assets: {full_path}"
-        
-        if self._confirm_action(action_name, skip_confirmation=False):
+
+        if self._confirm_action(action_name, skip_confirmation=skip_confirmation):
             try:
-                print(f"Deleting assets under {full_path}...")
-                children = ee.data.listAssets(full_path).get('assets', [])
-                if not children:
+                manifest = _read_json(manifest_path) if manifest_path else None
+                if not manifest or manifest.get('action') != 'delete' or manifest.get('source') != full_path:
+                    print(f"Listing assets under {full_path}...")
+                    levels = {}
+                    for asset, depth in self._walk_assets(full_path):
+                        levels.setdefault(depth, []).append(asset['name'])
+                    manifest = {
+                        'action': 'delete',
+                        'source': full_path,
+                        'levels': [levels[depth] for depth in sorted(levels)],
+                        'done': [],
+                    }
+                    if manifest_path:  # Save the listing now, so an early interruption does not lose it
+                        _write_json_atomic(manifest_path, manifest)
+
+                if not manifest['levels']:
                     print(f"No children found in: {full_path}")
-                else:
-                    for asset in children:
-                        ee.data.deleteAsset(asset['name'])
-                        print(f"Deleted: {asset['name']}")
-                ee.data.deleteAsset(full_path)
+
+                def delete_one(name):
+                    try:
+                        self._call('deleteAsset', name)
+                        self.index.remove(name)
+                        return name, None
+                    except Exception as e:
+                        return name, e
+
+                # Containers can only be deleted once empty: go level by level, deepest first
+                failures = 0
+                for names in reversed(manifest['levels']):
+                    failures += self._run_manifest_jobs(manifest, manifest_path, delete_one, names, 'Deleted')
+                if failures:
+                    print(f"{failures} assets could not be deleted; folder {full_path} was kept.")
+                    return
+                self._call('deleteAsset', full_path)
+                self.index.remove(full_path)
                 print(f"Deleted folder: {full_path}")
             except Exception as e:
                 print(f"Error deleting assets under {full_path}:\n{e}")
         else:
             print("Deletion process was cancelled by the user.")
 
-    def copy_imagecollection(self, src_full_path, dst_sub_path, asset_type='IMAGE_COLLECTION'):
+    def copy_imagecollection(self, src_full_path, dst_sub_path, asset_type='IMAGE_COLLECTION',
+                             skip_confirmation=False, manifest_path=None):
         """
         Copy all images from one Earth Engine ImageCollection to another, with flexible asset types.
 
+        Images are listed page by page and copied concurrently. With ``manifest_path``, the listing and
+        the copied images are recorded in a JSON manifest, and a rerun resumes without listing again.
+
         Args:
             src_full_path (str): The relative **FULL** path of the source ImageCollection asset (can be public or private).
             dst_sub_path (str): The relative path of the target ImageCollection or folder asset (must already exist).
             asset_type (str): The type of the asset to create at the destination (default is 'IMAGE_COLLECTION', can be 'folder').
+            skip_confirmation (bool): If True, copy without asking for confirmation (default is False).
+            manifest_path (str, optional): Path of the JSON manifest used to resume an interrupted copy.
         """
         src_full_path = src_full_path  # Get the full source path
         dst_full_path = self._get_full_path(dst_sub_path)  # Get the full destination path
@@ -293,45 +1134,65 @@ class GEEAssetManager:
         print_message = f"Successfully copied image collection from {src_full_path} to {dst_full_path}"
 
         # Confirm action
-        if self._confirm_action(action_name, skip_confirmation=False):
-            # Ensure the destination path exists, create it if necessary
-            if not self._ensure_asset_exists(dst_sub_path, asset_type=asset_type):
-                # If asset type is folder, create a folder; if IMAGE_COLLECTION, create an image collection
-                if asset_type == 'FOLDER':
-                    ee.data.createAsset({'type': 'FOLDER'}, dst_full_path)
-                else:
-                    ee.data.createAsset({'type': 'IMAGE_COLLECTION'}, dst_full_path)
-
-            # List all the assets in the source directory
-            assets = ee.data.listAssets(src_full_path).get('assets', [])
-            
-            if not assets:
+        if self._confirm_action(action_name, skip_confirmation=skip_confirmation):
+            manifest = _read_json(manifest_path) if manifest_path else None
+            if (not manifest or manifest.get('action') != 'copy'
+                    or manifest.get('source') != src_full_path or manifest.get('destination') != dst_full_path):
+                # Ensure the destination path exists, create it if necessary
+                if not self._ensure_asset_exists(dst_sub_path, asset_type=asset_type):
+                    # If asset type is folder, create a folder; if IMAGE_COLLECTION, create an image collection
+                    if asset_type == 'FOLDER':
+                        self._call('createAsset', {'type': 'FOLDER'}, dst_full_path)
+                    else:
+                        self._call('createAsset', {'type': 'IMAGE_COLLECTION'}, dst_full_path)
+                    self.index.add(dst_full_path, 'FOLDER' if asset_type == 'FOLDER' else 'IMAGE_COLLECTION')
+
+                # List all the images ('IMAGE' type assets only) in the source directory
+                manifest = {
+                    'action': 'copy',
+                    'source': src_full_path,
+                    'destination': dst_full_path,
+                    'items': [asset['name'] for asset in self.index.children(src_full_path) if asset['type'] == 'IMAGE'],
+                    'done': [],
+                }
+                if manifest_path:  # Save the listing now, so an early interruption does not lose it
+                    _write_json_atomic(manifest_path, manifest)
+
+            if not manifest['items']:
                 print(f"No assets found in source: {src_full_path}")
                 return
 
-            # Copy each image to the destination
-            for asset in assets:
-                if asset['type'] != 'IMAGE':  # Only copy 'IMAGE' type assets
-                    continue
-                img_name = asset['name'].split('/')[-1]  # Get image name
-                src_img_path = asset['name']  # Source image path
+            def copy_one(src_img_path):
+                img_name = src_img_path.split('/')[-1]  # Get image name
                 dst_img_path = f"{dst_full_path}/{img_name}"  # Destination image path
-
                 try:
-                    ee.data.copyAsset(src_img_path, dst_img_path)  # Perform the copy operation
-                    print(f"Copied: {img_name}")
+                    self._call('copyAsset', src_img_path, dst_img_path)  # Perform the copy operation
+                    self.index.add(dst_img_path, 'IMAGE')
+                    return src_img_path, None
                 except Exception as e:
-                    print(f"Failed to copy {img_name}: {e}")
-            print(print_message)
+                    return src_img_path, e
+
+            failures = self._run_manifest_jobs(manifest, manifest_path, copy_one, manifest['items'], 'Copied')
+            if failures:
+                print(f"{failures} images failed to copy; rerun with the same manifest to retry them.")
+            else:
+                print(print_message)
         else:
             print("Copy operation was cancelled by the user.")
 
 
-
 __all__ = [
     "generate_rect_grid", 
     "generate_hex_grid", 
+    "Tile",
+    "tiles_for_region",
+    "estimate_tile_pixels",
+    "adaptive_tiles",
+    "partition_tiles",
+    "tiles_to_feature_collection",
     "imgCol_date", 
+    "imgCol_metadata",
     "imgCol_merge", 
+    "AssetIndex",
     "GEEAssetManager"
 ]
\ No newline at end of file
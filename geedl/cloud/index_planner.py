@@ -0,0 +1,199 @@
+# index_planner.py
+# 将 awesome-spectral-indices 公式编译为共享子表达式的计算图，避免逐个指数构建 expression
+
+import ast
+import operator
+import functools
+import ee
+
+from .para import BAND_MAPPING
+
+# Binary operators supported in the catalog formulas
+_BINARY_OPS = {
+    ast.Add: 'add',
+    ast.Sub: 'subtract',
+    ast.Mult: 'multiply',
+    ast.Div: 'divide',
+    ast.Pow: 'pow',
+}
+
+# Operand order does not matter for these, so (N + R) and (R + N) share one node
+_COMMUTATIVE_OPS = {'add', 'multiply'}
+
+# Python equivalents used to fold constant-only subexpressions
+_PY_OPS = {
+    'add': operator.add,
+    'subtract': operator.sub,
+    'multiply': operator.mul,
+    'divide': operator.truediv,
+    'pow': operator.pow,
+}
+
+
+class IndexPlan:
+    """
+    A compiled set of spectral indices.
+
+    Formulas are parsed once into a single DAG of nodes shared by all requested indices:
+    identical subexpressions such as ``(N - R)`` or ``(N + R)`` become one node, constants are
+    substituted and folded, and each index is an output node. Nodes are tuples:
+
+        ('band', symbol)         an input band (a key of ``BAND_MAPPING``)
+        ('const', value)         a folded numeric constant
+        ('neg', a)               unary minus of node a
+        (op, a, b)               a binary operation ('add', 'subtract', 'multiply', 'divide', 'pow')
+
+    where ``a`` and ``b`` are node ids (positions in ``nodes``). Nodes are stored in topological
+    order, so evaluating them in sequence always finds the operands already computed.
+    """
+
+    def __init__(self, indices, spectral_indices, constant_values):
+        """
+        Compile the formulas of the requested indices.
+
+        Args:
+            indices (list): Spectral index names (e.g., ["NDVI", "EVI"]).
+            spectral_indices (dict): The ``SpectralIndices`` section of the awesome-spectral-indices catalog.
+            constant_values (dict): Default values of the catalog constants.
+
+        Raises:
+            ValueError: If an index is not in the catalog or uses a band or constant that is not available.
+        """
+        self.indices = tuple(indices)
+        self.nodes = []
+        self.outputs = []
+        self._node_ids = {}
+
+        for index in self.indices:
+            if index not in spectral_indices:
+                raise ValueError(f"Index {index} is not present in the JSON file.")
+            formula = spectral_indices[index]["formula"]
+            tree = ast.parse(formula, mode='eval').body
+            self.outputs.append(self._compile(tree, index, constant_values))
+
+    @property
+    def bands(self):
+        """
+        list: The band symbols (keys of ``BAND_MAPPING``) read by the plan.
+        """
+        return [node[1] for node in self.nodes if node[0] == 'band']
+
+    def _intern(self, node):
+        """
+        Return the id of a node, adding it to the DAG only if an identical node does not exist yet.
+        """
+        node_id = self._node_ids.get(node)
+        if node_id is None:
+            node_id = len(self.nodes)
+            self.nodes.append(node)
+            self._node_ids[node] = node_id
+        return node_id
+
+    def _constant(self, node_id):
+        node = self.nodes[node_id]
+        return node[1] if node[0] == 'const' else None
+
+    def _compile(self, tree, index, constant_values):
+        """
+        Recursively convert a formula AST into DAG nodes, folding constant subexpressions.
+        """
+        if isinstance(tree, ast.Constant) and isinstance(tree.value, (int, float)):
+            return self._intern(('const', float(tree.value)))
+
+        if isinstance(tree, ast.Name):
+            symbol = tree.id
+            if symbol in BAND_MAPPING:
+                return self._intern(('band', symbol))
+            if symbol in constant_values:
+                return self._intern(('const', float(constant_values[symbol])))
+            raise ValueError(f"Index {index} uses '{symbol}', which is neither a supported band nor a constant with a default value.")
+
+        if isinstance(tree, ast.UnaryOp) and isinstance(tree.op, (ast.USub, ast.UAdd)):
+            operand = self._compile(tree.operand, index, constant_values)
+            if isinstance(tree.op, ast.UAdd):
+                return operand
+            value = self._constant(operand)
+            if value is not None:
+                return self._intern(('const', -value))
+            return self._intern(('neg', operand))
+
+        if isinstance(tree, ast.BinOp) and type(tree.op) in _BINARY_OPS:
+            op = _BINARY_OPS[type(tree.op)]
+            left = self._compile(tree.left, index, constant_values)
+            right = self._compile(tree.right, index, constant_values)
+            left_value, right_value = self._constant(left), self._constant(right)
+            if left_value is not None and right_value is not None:
+                return self._intern(('const', float(_PY_OPS[op](left_value, right_value))))
+            if op in _COMMUTATIVE_OPS and left > right:
+                left, right = right, left
+            return self._intern((op, left, right))
+
+        raise ValueError(f"Unsupported syntax in the formula of index {index}: {ast.dump(tree)}")
+
+    def apply(self, image, keep_original=True):
+        """
+        Evaluate the plan on an Earth Engine image.
+
+        Every node is built exactly once, so shared subexpressions appear once in the serialized
+        graph, and all indices are added with a single ``addBands`` call.
+
+        Args:
+            image (ee.Image): The input image with renamed bands (see ``RENAMED_BANDS``).
+            keep_original (bool): Whether to keep the original image bands.
+
+        Returns:
+            ee.Image: The image with the computed spectral indices.
+        """
+        values = []
+        for node in self.nodes:
+            kind = node[0]
+            if kind == 'band':
+                value = image.select(BAND_MAPPING[node[1]])
+            elif kind == 'const':
+                value = node[1]
+            elif kind == 'neg':
+                value = values[node[1]].multiply(-1)
+            else:
+                left, right = values[node[1]], values[node[2]]
+                if not isinstance(left, ee.Image):
+                    if kind in _COMMUTATIVE_OPS:
+                        left, right = right, left
+                    else:
+                        # Constant on the left of a non-commutative operation, e.g. (1 - N)
+                        left = ee.Image.constant(left)
+                value = getattr(left, kind)(right)
+            values.append(value)
+
+        index_bands = [
+            values[node_id] if isinstance(values[node_id], ee.Image) else image.constant(values[node_id])
+            for node_id in self.outputs
+        ]
+        index_image = ee.Image.cat(index_bands).rename(list(self.indices))
+        result_image = image.addBands(index_image)
+        return result_image if keep_original else result_image.select(list(self.indices))
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_plan(indices):
+    from .data_processing import _load_index_catalog
+    spectral_indices, constant_values = _load_index_catalog()
+    return IndexPlan(indices, spectral_indices, constant_values)
+
+
+def get_index_plan(indices):
+    """
+    Return the compiled plan for a set of spectral indices, compiling it only on first use.
+
+    Args:
+        indices (list): Spectral index names (e.g., ["NDVI", "EVI"]).
+
+    Returns:
+        IndexPlan: The compiled plan, shared by all calls with the same indices.
+    """
+    return _cached_plan(tuple(indices))
+
+
+__all__ = [
+    "IndexPlan",
+    "get_index_plan",
+]
@@ -0,0 +1,255 @@
+# memo.py
+# 计算图记忆化：按规范化序列化参数的哈希缓存 ee 对象构建结果与 getInfo 结果（LRU，可选磁盘持久化）
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import ee
+
+from .executor import get_executor
+from .notebook_utils import _read_json, _write_json_atomic
+from .para import CATALOG_CACHE_DIR
+
+
+def _normalize(value):
+    """
+    Turn an argument into a JSON-compatible value that is equal for equal ee graphs.
+
+    ee objects are replaced by their serialized graph, whose node ids are content hashes,
+    so two separately built but identical expressions normalize to the same value.
+    """
+    if isinstance(value, ee.ComputedObject):
+        return {'__ee__': ee.serializer.encode(value, for_cloud_api=True)}
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+def make_key(*parts):
+    """
+    Return the cache key (a SHA-256 hex digest) of normalized values.
+    """
+    payload = json.dumps(_normalize(list(parts)), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class MemoCache:
+    def __init__(self, maxsize=256, cache_dir=None):
+        """
+        Initialize a thread-safe LRU cache with hit / miss counters.
+
+        Args:
+            maxsize (int): Maximum number of entries kept in memory (default is 256).
+            cache_dir (str, optional): Directory where JSON-compatible values are also persisted,
+                one file per key (default is None, memory only).
+        """
+        self.maxsize = maxsize
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key, default=None):
+        """
+        Return the cached value of ``key`` (memory first, then disk) and count the hit or miss.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+        if self.cache_dir:
+            entry = _read_json(self._disk_path(key))
+            if entry is not None:
+                self._store(key, entry['value'])
+                with self._lock:
+                    self.hits += 1
+                return entry['value']
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def _store(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def put(self, key, value, persist=False):
+        """
+        Store a value; ``persist`` also writes it to ``cache_dir`` (the value must be JSON-compatible).
+        """
+        self._store(key, value)
+        if persist and self.cache_dir:
+            try:
+                _write_json_atomic(self._disk_path(key), {'value': value})
+            except (OSError, TypeError, ValueError):
+                pass  # Not persistable or read-only disk: the in-memory entry is enough
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def clear(self, disk=False):
+        """
+        Drop the in-memory entries and reset the counters; ``disk=True`` also deletes the persisted files.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+        if disk and self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def stats(self):
+        """
+        Return the counters as a dict: hits, misses, evictions, size and hit_rate.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'size': len(self._data), 'hit_rate': self.hits / total if total else 0.0}
+
+
+# Caches of every memoized builder, by qualified function name
+_REGISTRY = {}
+
+
+def memoize(fn=None, maxsize=256):
+    """
+    Decorator caching the ee object returned by a builder function.
+
+    Arguments are bound to the signature (so defaults and keyword / positional spellings match)
+    and normalized with their serialized ee graphs; a call with an equal key returns the object
+    built the first time. ee objects are immutable, so sharing them is safe.
+
+    The wrapper exposes ``cache`` (the ``MemoCache``), ``cache_info()`` and ``cache_clear()``.
+    """
+    if fn is None:
+        return functools.partial(memoize, maxsize=maxsize)
+
+    signature = inspect.signature(fn)
+    name = f"{fn.__module__}.{fn.__qualname__}"
+    cache = MemoCache(maxsize)
+    _REGISTRY[name] = cache
+    missing = object()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = make_key(name, bound.arguments)
+        result = cache.get(key, missing)
+        if result is missing:
+            result = fn(*args, **kwargs)
+            cache.put(key, result)
+        return result
+
+    wrapper.cache = cache
+    wrapper.cache_info = cache.stats
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+
+# ------------------------
+# getInfo results
+# ------------------------
+
+_getinfo_cache = MemoCache(maxsize=1024)
+
+
+def configure_getinfo_cache(maxsize=None, cache_dir=None, persist=None):
+    """
+    Configure the cache used by ``cached_getInfo``.
+
+    Args:
+        maxsize (int, optional): Maximum number of results kept in memory.
+        cache_dir (str, optional): Directory of the persisted results
+            (default is 'getinfo' under ``$GEEDL_CACHE_DIR`` or ``CATALOG_CACHE_DIR``).
+        persist (bool, optional): Persist results to disk by default.
+    """
+    if maxsize is not None:
+        _getinfo_cache.maxsize = maxsize
+    if persist is not None or cache_dir is not None:
+        if persist is False:
+            _getinfo_cache.cache_dir = None
+        else:
+            root = os.environ.get('GEEDL_CACHE_DIR', CATALOG_CACHE_DIR)
+            _getinfo_cache.cache_dir = os.path.expanduser(cache_dir or os.path.join(root, 'getinfo'))
+
+
+def cached_getInfo(obj, persist=None, executor=None):
+    """
+    Return ``obj.getInfo()``, reusing the result of any earlier call on an identical graph.
+
+    Only use it for results that do not change over time (e.g. not for collections that are
+    still receiving new scenes, unless a stale answer is acceptable).
+
+    Args:
+        obj (ee.ComputedObject): The object to evaluate.
+        persist (bool, optional): Write the result to the disk cache (default is True when
+            ``configure_getinfo_cache`` set a cache directory).
+        executor (GEEExecutor, optional): Executor used for the request (default is the shared executor).
+
+    Returns:
+        The result of ``getInfo``.
+    """
+    key = make_key('getInfo', obj)
+    missing = object()
+    result = _getinfo_cache.get(key, missing)
+    if result is missing:
+        result = (executor or get_executor()).call(obj.getInfo)
+        _getinfo_cache.put(key, result, persist=persist if persist is not None else True)
+    return result
+
+
+def memo_stats():
+    """
+    Return the hit / miss counters of every memoized builder and of ``cached_getInfo``.
+
+    Returns:
+        dict: Function name -> counters (see ``MemoCache.stats``).
+    """
+    stats = {name: cache.stats() for name, cache in _REGISTRY.items()}
+    stats['getInfo'] = _getinfo_cache.stats()
+    return stats
+
+
+def clear_memo_caches(disk=False):
+    """
+    Empty every memoization cache; ``disk=True`` also deletes the persisted getInfo results.
+    """
+    for cache in _REGISTRY.values():
+        cache.clear()
+    _getinfo_cache.clear(disk=disk)
+
+
+__all__ = [
+    "MemoCache",
+    "make_key",
+    "memoize",
+    "cached_getInfo",
+    "configure_getinfo_cache",
+    "memo_stats",
+    "clear_memo_caches",
+]
@@ -1,7 +1,17 @@
 from datetime import datetime
-from IPython import get_ipython
-import urllib.request
+import threading
+import hashlib
 import json
+import time
+import os
+
+from .para import CATALOG_CACHE_DIR, CATALOG_CACHE_VERSION, CATALOG_CACHE_TTL, CATALOG_FETCH_TIMEOUT, CATALOG_SNAPSHOTS
+from .profiling import Profiler
+
+try:
+    from IPython import get_ipython
+except ImportError:
+    get_ipython = None
 
 
 # ------------------------
@@ -22,16 +32,59 @@ def jup_log_start(info=None):
     print(f"\nStart Time: {start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
     return start_time
 
-def jup_register_hook():
+_cell_profiler = None
+
+
+def jup_profile_start(info=None):
+    """
+    Start profiling a code cell (see ``Profiler``); registered as a pre-run hook by ``jup_register_hook(profile=True)``.
+
+    Args:
+        info (optional): Cell information passed by IPython (unused).
+
+    Returns:
+        Profiler: The running profiler.
+    """
+    global _cell_profiler
+    if _cell_profiler is not None:
+        jup_profile_report()
+    _cell_profiler = Profiler(name='cell').__enter__()
+    return _cell_profiler
+
+def jup_profile_report(result=None):
+    """
+    Stop the cell profiler and print its report: function timings, ee calls, graph sizes and local I/O.
+
+    Args:
+        result (optional): Execution result passed by IPython (unused).
+
+    Returns:
+        Profiler: The stopped profiler, or None if no cell was being profiled.
+    """
+    global _cell_profiler
+    profiler, _cell_profiler = _cell_profiler, None
+    if profiler is None:
+        return None
+    profiler.__exit__(None, None, None)
+    profiler.report()
+    return profiler
+
+def jup_register_hook(profile=False):
     """
     Register a hook in Jupyter Notebook to automatically record time before each cell execution.
 
+    Args:
+        profile (bool): Also profile every cell and print its report when it finishes (default is False).
+
     Returns:
         bool: True if hook is successfully registered, False otherwise.
     """
-    ipython = get_ipython()
+    ipython = get_ipython() if get_ipython is not None else None
     if ipython:
         ipython.events.register('pre_run_cell', jup_log_start)
+        if profile:
+            ipython.events.register('pre_run_cell', jup_profile_start)
+            ipython.events.register('post_run_cell', jup_profile_report)
         return True
     else:
         print("This environment is not Jupyter Notebook, hook cannot be registered.")
@@ -44,28 +97,183 @@ def jup_register_hook():
 # Data Fetching
 # ------------------------
 
-def json_fetch(url):
+_JSON_MEMO = {}
+_JSON_MEMO_LOCK = threading.Lock()
+_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def _download_json(url, headers=None):
+    """
+    Download a JSON document, honouring conditional request headers.
+
+    A server that does not answer within ``CATALOG_FETCH_TIMEOUT`` seconds raises, so the
+    caller falls back to the cached copy or the bundled snapshot instead of hanging.
+
+    Returns:
+        tuple: (data, response headers), or (None, None) if the server answered 304 Not Modified.
+    """
+    # Imported here: urllib.request pulls in http.client and ssl, which most imports of geedl never need
+    import urllib.error
+    import urllib.request
+
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request, timeout=CATALOG_FETCH_TIMEOUT) as response:
+            return json.loads(response.read().decode()), response.headers
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, None
+        raise
+
+
+def _catalog_cache_paths(url):
+    """
+    Return the (data, metadata) file paths of the on-disk cache entry for a URL.
+    """
+    cache_root = os.path.expanduser(os.environ.get('GEEDL_CACHE_DIR', CATALOG_CACHE_DIR))
+    cache_dir = os.path.join(cache_root, f"catalog-v{CATALOG_CACHE_VERSION}")
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{key}.json"), os.path.join(cache_dir, f"{key}.meta.json")
+
+
+def _write_json_atomic(path, data):
+    """
+    Write JSON to a temporary file and move it into place, so readers never see partial files.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _load_snapshot(url):
+    """
+    Load the bundled offline snapshot for a URL, or None if no snapshot is shipped for it.
+    """
+    name = CATALOG_SNAPSHOTS.get(url)
+    return _read_json(os.path.join(_SNAPSHOT_DIR, name)) if name else None
+
+
+def _cached_json_fetch(url, ttl, offline):
+    """
+    Resolve a URL through the file cache: fresh entry -> conditional download -> stale entry -> snapshot.
+    """
+    data_path, meta_path = _catalog_cache_paths(url)
+    cached = _read_json(data_path)
+    meta = _read_json(meta_path) or {}
+
+    if cached is not None and (offline or time.time() - meta.get('fetched_at', 0) < ttl):
+        return cached
+
+    if not offline:
+        headers = {}
+        if cached is not None and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if cached is not None and meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        try:
+            data, response_headers = _download_json(url, headers)
+        except Exception as e:
+            if cached is None and url not in CATALOG_SNAPSHOTS:
+                raise RuntimeError(f"Error fetching JSON from {url}: {e}")
+        else:
+            try:
+                if data is None:  # 304: the cached copy is still current
+                    data = cached
+                else:
+                    _write_json_atomic(data_path, data)
+                    meta = {
+                        'url': url,
+                        'etag': response_headers.get('ETag'),
+                        'last_modified': response_headers.get('Last-Modified'),
+                    }
+                meta['fetched_at'] = time.time()
+                _write_json_atomic(meta_path, meta)
+            except OSError:
+                pass  # Read-only cache directory; the downloaded data is still usable
+            return data
+
+    if cached is not None:
+        return cached
+    snapshot = _load_snapshot(url)
+    if snapshot is not None:
+        return snapshot
+    raise RuntimeError(f"Error fetching JSON from {url}: no cached copy or offline snapshot available")
+
+
+def json_fetch(url, use_cache=True, ttl=None, offline=None):
     """
     Fetch JSON data from the given URL.
 
+    With caching enabled, each URL is downloaded at most once per process and persisted in a
+    versioned file cache (see ``CATALOG_CACHE_DIR``). Cached files are revalidated with
+    ETag / Last-Modified once they are older than ``ttl``. When the network is unavailable,
+    a stale cached copy or the snapshot bundled with geedl (``CATALOG_SNAPSHOTS``) is used.
+
     Args:
         url (str): The URL of the JSON file to be fetched.
+        use_cache (bool): Whether to use the in-process and on-disk caches (default is True).
+        ttl (float, optional): Seconds before a cached file is revalidated (default is ``CATALOG_CACHE_TTL``).
+        offline (bool, optional): Never touch the network. Defaults to the ``GEEDL_OFFLINE`` environment variable.
 
     Returns:
-        dict: The parsed JSON data as a Python dictionary.
+        dict: The parsed JSON data as a Python dictionary. Cached results are shared, do not modify them.
 
     Raises:
         RuntimeError: If there is an error while fetching or decoding the JSON file.
     """
-    try:
-        with urllib.request.urlopen(url) as response:
-            return json.loads(response.read().decode())
-    except Exception as e:
-        raise RuntimeError(f"Error fetching JSON from {url}: {e}")
+    if not use_cache:
+        try:
+            return _download_json(url)[0]
+        except Exception as e:
+            raise RuntimeError(f"Error fetching JSON from {url}: {e}")
+
+    data = _JSON_MEMO.get(url)
+    if data is not None:
+        return data
+
+    if ttl is None:
+        ttl = CATALOG_CACHE_TTL
+    if offline is None:
+        offline = os.environ.get('GEEDL_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+    with _JSON_MEMO_LOCK:
+        if url not in _JSON_MEMO:
+            _JSON_MEMO[url] = _cached_json_fetch(url, ttl, offline)
+        return _JSON_MEMO[url]
+
+
+def clear_json_cache(disk=False):
+    """
+    Clear the in-process JSON memo, and optionally the on-disk catalog cache.
+
+    Args:
+        disk (bool): Also delete the cached files of every memoized or snapshot URL (default is False).
+    """
+    with _JSON_MEMO_LOCK:
+        urls = set(_JSON_MEMO) | set(CATALOG_SNAPSHOTS)
+        _JSON_MEMO.clear()
+    if disk:
+        for url in urls:
+            for path in _catalog_cache_paths(url):
+                if os.path.exists(path):
+                    os.remove(path)
     
 
 __all__ = [
     "jup_log_start", 
     "jup_register_hook", 
+    "jup_profile_start",
+    "jup_profile_report",
     "json_fetch",
+    "clear_json_cache",
 ]
\ No newline at end of file
@@ -3,6 +3,22 @@
 SPECTRAL_INDICES_URL = "https://raw.githubusercontent.com/awesome-spectral-indices/awesome-spectral-indices/main/output/spectral-indices-dict.json"
 CONSTANTS_URL = "https://raw.githubusercontent.com/awesome-spectral-indices/awesome-spectral-indices/main/output/constants.json"
 
+# Catalog cache: downloaded JSON files are kept under CATALOG_CACHE_DIR (override with the
+# GEEDL_CACHE_DIR environment variable) and revalidated against the server once they are
+# older than CATALOG_CACHE_TTL seconds. Bump CATALOG_CACHE_VERSION when the on-disk layout changes.
+CATALOG_CACHE_DIR = "~/.cache/geedl"
+CATALOG_CACHE_VERSION = 1
+CATALOG_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Seconds to wait for the catalog server before falling back to the cache or the bundled snapshot
+CATALOG_FETCH_TIMEOUT = 10
+
+# Offline snapshots bundled in geedl/cloud/data, used when the network is unavailable
+CATALOG_SNAPSHOTS = {
+    SPECTRAL_INDICES_URL: "spectral-indices-dict.json",
+    CONSTANTS_URL: "constants.json",
+}
+
 DATASET_IDS = {
     'L9': "LANDSAT/LC09/C02/T1_L2", 
     'L8': "LANDSAT/LC08/C02/T1_L2", 
@@ -30,6 +46,48 @@ RENAMED_BANDS = {
     'MCD43A4': ['red', 'nir', 'blue', 'green', 'mir', 'swir1', 'swir2']
 }
 
+# Quality band read by the cloud masking function of each series
+QA_BANDS = {
+    'L9': 'QA_PIXEL',
+    'L8': 'QA_PIXEL',
+    'L7': 'QA_PIXEL',
+    'L5': 'QA_PIXEL',
+    'MOD09A1': 'StateQA',
+    'MCD43A4': 'BRDF_Albedo_Band_Mandatory_Quality_Band2'
+}
+
+# Operational windows of the Collection 2 Level-2 archives (None: still acquiring)
+SERIES_DATE_RANGES = {
+    'L5': ('1984-03-16', '2012-05-06'),
+    'L7': ('1999-05-28', None),
+    'L8': ('2013-03-18', None),
+    'L9': ('2021-10-31', None),
+}
+
+# Cross-sensor harmonization of TM/ETM+ surface reflectance to OLI (Roy et al., 2016, RMA coefficients):
+# OLI = slope * ETM+ + intercept
+ETM_TO_OLI_COEFFICIENTS = {
+    'blue': (0.9785, -0.0095),
+    'green': (0.9542, -0.0016),
+    'red': (0.9825, -0.0022),
+    'nir': (1.0073, -0.0021),
+    'swir1': (1.0171, -0.0030),
+    'swir2': (0.9949, 0.0029),
+}
+
+# Months of each meteorological season (northern hemisphere naming)
+SEASON_MONTHS = {
+    'DJF': [12, 1, 2],
+    'MAM': [3, 4, 5],
+    'JJA': [6, 7, 8],
+    'SON': [9, 10, 11],
+}
+
+# DEM used by the terrain functions and the features a terrain pyramid level can hold
+TERRAIN_DEM = 'USGS/SRTMGL1_003'
+TERRAIN_DEM_SCALE = 30  # Native resolution of TERRAIN_DEM in meters, so the default needs no request
+TERRAIN_FEATURES = ['elevation', 'slope', 'aspect', 'hillshade', 'tpi', 'roughness']
+
 BAND_MAPPING = {
     'B': 'blue',
     'G': 'green',
@@ -45,8 +103,20 @@ BAND_MAPPING = {
 __all__ = [
     "SPECTRAL_INDICES_URL",  # The URL to fetch spectral indices data (e.g., NDVI, EVI)
     "CONSTANTS_URL",         # The URL to fetch constants related to spectral indices
+    "CATALOG_CACHE_DIR",     # Default directory of the on-disk JSON catalog cache
+    "CATALOG_CACHE_VERSION", # Version of the on-disk catalog cache layout
+    "CATALOG_CACHE_TTL",     # Seconds before a cached catalog is revalidated against the server
+    "CATALOG_FETCH_TIMEOUT", # Seconds to wait for the catalog server before falling back offline
+    "CATALOG_SNAPSHOTS",     # Bundled offline snapshot file for each catalog URL
     "DATASET_IDS",           # A dictionary of dataset IDs for different satellite data (Landsat, MODIS)
     "ORIGINAL_BANDS",        # A dictionary mapping datasets to their original band names (before renaming)
     "RENAMED_BANDS",         # A dictionary mapping datasets to their renamed band names (after renaming)
+    "QA_BANDS",              # The quality band used for cloud masking in each dataset
+    "SERIES_DATE_RANGES",    # Operational date windows of each Landsat series
+    "ETM_TO_OLI_COEFFICIENTS",  # TM/ETM+ to OLI harmonization (slope, intercept) per renamed band
+    "SEASON_MONTHS",         # Months of each season code (e.g., 'JJA' -> [6, 7, 8])
+    "TERRAIN_DEM",           # Default DEM of the terrain functions (SRTM 30 m)
+    "TERRAIN_DEM_SCALE",     # Native resolution of TERRAIN_DEM, in meters
+    "TERRAIN_FEATURES",      # Features available in each terrain pyramid level
     "BAND_MAPPING"           # A mapping of band abbreviations to full names (e.g., 'B' -> 'blue', 'G' -> 'green')
 ]
\ No newline at end of file
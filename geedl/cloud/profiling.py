@@ -0,0 +1,298 @@
+# profiling.py
+# 流水线性能剖析：记录函数耗时、ee 网络请求次数与延迟、计算图节点数与字节数、本地读写字节数，可导出 JSON / Chrome trace
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_active = []                # Running profilers, innermost last
+_patch_lock = threading.Lock()
+_originals = {}             # (owner, attribute) -> original function, while the hooks are installed
+
+
+# ------------------------
+# Hooks
+# ------------------------
+
+def _emit(method, *args):
+    for profiler in list(_active):
+        getattr(profiler, method)(*args)
+
+
+def _graph_stats_from_body(body):
+    """
+    Return (node count, bytes) of the serialized expression in a request body, or (0, bytes) if it has none.
+    """
+    if not body:
+        return 0, 0
+    size = len(body)
+    try:
+        expression = json.loads(body).get('expression')
+    except (TypeError, ValueError, AttributeError):
+        return 0, size
+    return (len(expression.get('values', {})) if isinstance(expression, dict) else 0), size
+
+
+def _install_hooks():
+    """
+    Wrap the single entry point of ee network calls and the rasterio dataset read / write methods.
+    """
+    import ee
+
+    def execute_cloud_call(call, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(call, *args, **kwargs)
+        finally:
+            nodes, size = _graph_stats_from_body(getattr(call, 'body', None))
+            _emit('_record_ee_call', getattr(call, 'methodId', None) or 'unknown', start,
+                  time.perf_counter() - start, nodes, size)
+
+    original = ee.data._execute_cloud_call
+    _originals[(ee.data, '_execute_cloud_call')] = original
+    ee.data._execute_cloud_call = execute_cloud_call
+
+    try:
+        import rasterio.io
+    except ImportError:
+        return
+
+    def wrap(owner, name, direction):
+        method = getattr(owner, name)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            data = result if direction == 'read' else (args[0] if args else kwargs.get('arr'))
+            _emit('add_io', direction, getattr(data, 'nbytes', 0))
+            return result
+
+        _originals[(owner, name)] = owner.__dict__.get(name)
+        setattr(owner, name, wrapper)
+
+    for owner in (rasterio.io.DatasetReader, rasterio.io.DatasetWriter, rasterio.io.BufferedDatasetWriter):
+        wrap(owner, 'read', 'read')
+    for owner in (rasterio.io.DatasetWriter, rasterio.io.BufferedDatasetWriter):
+        wrap(owner, 'write', 'written')
+
+
+def _remove_hooks():
+    for (owner, name), original in _originals.items():
+        if original is None:
+            delattr(owner, name)  # The method was inherited: drop the override
+        else:
+            setattr(owner, name, original)
+    _originals.clear()
+
+
+# ------------------------
+# Profiler
+# ------------------------
+
+class Profiler:
+    def __init__(self, name='geedl', graph_stats=True):
+        """
+        Initialize a profiler. Use it as a context manager around the code to measure.
+
+        While it runs, every Earth Engine network call (getInfo, computePixels, listAssets, ...)
+        is timed, with the node count and size of the serialized graph it sends, rasterio reads
+        and writes are counted, and functions decorated with ``profiled`` record their wall time.
+
+        Args:
+            name (str): Name of the profiled run, used in the reports (default is 'geedl').
+            graph_stats (bool): Serialize the ee objects returned by ``profiled`` functions to record
+                their graph size; costs one serialization per call (default is True).
+        """
+        self.name = name
+        self.graph_stats = graph_stats
+        self.events = []
+        self.graphs = []
+        self.io = {'read': 0, 'written': 0}
+        self.started = None
+        self.elapsed = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with _patch_lock:
+            if not _active:
+                _install_hooks()
+            _active.append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.started
+        with _patch_lock:
+            _active.remove(self)
+            if not _active:
+                _remove_hooks()
+
+    # Recording
+
+    def _add_event(self, category, name, start, duration, **args):
+        with self._lock:
+            self.events.append({
+                'cat': category, 'name': name, 'start': start, 'dur': duration,
+                'tid': threading.get_ident(), 'args': args,
+            })
+
+    def _record_ee_call(self, method, start, duration, nodes, size):
+        self._add_event('ee', method, start, duration, nodes=nodes, bytes=size)
+
+    def add_io(self, direction, nbytes):
+        """
+        Count local I/O bytes; ``direction`` is 'read' or 'written'.
+        """
+        with self._lock:
+            self.io[direction] += int(nbytes)
+
+    def record_graph(self, obj, label=None):
+        """
+        Record the node count and serialized size (bytes) of an ee object's graph.
+
+        Returns:
+            tuple: (nodes, bytes).
+        """
+        import ee
+        encoded = ee.serializer.encode(obj, for_cloud_api=True)
+        nodes, size = len(encoded.get('values', {})), len(json.dumps(encoded))
+        with self._lock:
+            self.graphs.append({'label': label or type(obj).__name__, 'nodes': nodes, 'bytes': size})
+        return nodes, size
+
+    @contextmanager
+    def span(self, name, category='function', **args):
+        """
+        Time a block of code as a named span.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_event(category, name, start, time.perf_counter() - start, **args)
+
+    # Reports
+
+    def summary(self):
+        """
+        Aggregate the recorded events.
+
+        Returns:
+            dict: 'name', 'elapsed' (s), 'functions' and 'ee_calls' (per name: count, total, mean and
+                max seconds; ee calls also the request graph nodes and bytes), 'graphs' and 'io' (bytes).
+        """
+        groups = {'function': defaultdict(list), 'ee': defaultdict(list)}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            groups.setdefault(event['cat'], defaultdict(list))[event['name']].append(event)
+
+        def aggregate(items):
+            durations = [item['dur'] for item in items]
+            row = {'count': len(items), 'total': sum(durations), 'mean': sum(durations) / len(items),
+                   'max': max(durations)}
+            if items[0]['cat'] == 'ee':
+                row['nodes'] = sum(item['args'].get('nodes', 0) for item in items)
+                row['bytes'] = sum(item['args'].get('bytes', 0) for item in items)
+            return row
+
+        return {
+            'name': self.name,
+            'elapsed': self.elapsed if self.elapsed is not None else time.perf_counter() - self.started,
+            'functions': {name: aggregate(items) for name, items in groups['function'].items()},
+            'ee_calls': {name: aggregate(items) for name, items in groups['ee'].items()},
+            'graphs': list(self.graphs),
+            'io': dict(self.io),
+        }
+
+    def report(self):
+        """
+        Print the summary as tables.
+        """
+        summary = self.summary()
+        print(f"Profile '{summary['name']}': {summary['elapsed']:.2f} s")
+        for title, rows in (('Functions', summary['functions']), ('ee calls', summary['ee_calls'])):
+            if not rows:
+                continue
+            print(f"\n{title:<48}{'count':>7}{'total (s)':>11}{'mean (s)':>10}{'max (s)':>10}")
+            for name, row in sorted(rows.items(), key=lambda item: -item[1]['total']):
+                print(f"{name[-48:]:<48}{row['count']:>7}{row['total']:>11.3f}{row['mean']:>10.3f}{row['max']:>10.3f}")
+        if summary['graphs']:
+            print(f"\n{'Graph':<48}{'nodes':>8}{'bytes':>12}")
+            for graph in summary['graphs']:
+                print(f"{graph['label'][-48:]:<48}{graph['nodes']:>8}{graph['bytes']:>12}")
+        io = summary['io']
+        if io['read'] or io['written']:
+            print(f"\nLocal I/O: {io['read'] / 1e6:.1f} MB read, {io['written'] / 1e6:.1f} MB written")
+
+    def to_json(self, path):
+        """
+        Write the summary and the raw events to a JSON file.
+        """
+        data = dict(self.summary(), events=[dict(event, start=event['start'] - self.started) for event in self.events])
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    def to_chrome_trace(self, path):
+        """
+        Write the events in the Chrome trace format (open in chrome://tracing or https://ui.perfetto.dev).
+        """
+        pid = os.getpid()
+        trace = [
+            {'name': event['name'], 'cat': event['cat'], 'ph': 'X', 'pid': pid, 'tid': event['tid'],
+             'ts': (event['start'] - self.started) * 1e6, 'dur': event['dur'] * 1e6, 'args': event['args']}
+            for event in self.events
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f)
+        return path
+
+
+def profiled(fn=None, name=None):
+    """
+    Decorator recording the wall time of a function in every running ``Profiler``.
+
+    If the function returns an ee object and the profiler has ``graph_stats`` enabled, the size of
+    its graph is recorded too. Without a running profiler the call goes straight through.
+    """
+    if fn is None:
+        return functools.partial(profiled, name=name)
+    label = name or f"{fn.__module__.replace('geedl.', '')}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _active:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            for profiler in list(_active):
+                profiler._add_event('function', label, start, duration)
+        if any(profiler.graph_stats for profiler in _active) and type(result).__module__.startswith('ee.'):
+            for profiler in list(_active):
+                if profiler.graph_stats:
+                    profiler.record_graph(result, label)
+        return result
+
+    return wrapper
+
+
+def current_profiler():
+    """
+    Return the innermost running profiler, or None.
+    """
+    return _active[-1] if _active else None
+
+
+__all__ = [
+    "Profiler",
+    "profiled",
+    "current_profiler",
+]
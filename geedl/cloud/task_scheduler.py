@@ -0,0 +1,309 @@
+# task_scheduler.py
+# 批量导出任务调度：限制同时运行的任务数、批量轮询状态、失败重试，并用 SQLite 持久化以便断点重连
+
+import sqlite3
+import time
+
+import ee
+
+from .executor import get_executor
+
+# Earth Engine task states, grouped by what the scheduler does with them
+ACTIVE_STATES = ('UNSUBMITTED', 'READY', 'RUNNING', 'CANCEL_REQUESTED', 'PENDING')
+SUCCEEDED_STATES = ('COMPLETED', 'SUCCEEDED')
+FAILED_STATES = ('FAILED',)
+CANCELLED_STATES = ('CANCELLED',)
+
+# Local job states stored in the database
+QUEUED = 'QUEUED'
+SUBMITTED = 'SUBMITTED'
+COMPLETED = 'COMPLETED'
+FAILED = 'FAILED'
+CANCELLED = 'CANCELLED'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    name TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    task_id TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    added_at REAL,
+    submitted_at REAL,
+    finished_at REAL
+)
+"""
+
+
+class EETaskBackend:
+    """
+    Task backend talking to Earth Engine: starts ``ee.batch.Task`` objects and lists all tasks in one call.
+
+    Stand-in backends (e.g. for tests) implement the same three methods.
+    """
+
+    def start(self, task):
+        """
+        Start an unstarted task and return its id.
+        """
+        task.start()
+        return task.id
+
+    def list_tasks(self):
+        """
+        Return the recent tasks of the account as dicts with at least 'id', 'state' and 'description'.
+        """
+        return ee.data.getTaskList()
+
+    def cancel(self, task_id):
+        ee.data.cancelTask(task_id)
+
+
+class ExportScheduler:
+    def __init__(self, db_path='geedl_tasks.sqlite', max_running=10, max_retries=2, poll_interval=30,
+                 backend=None, executor=None, clock=time.time, sleep=time.sleep):
+        """
+        Initialize the scheduler.
+
+        Job states are stored in a SQLite file, so a restarted driver that adds the same jobs again
+        reattaches to the tasks already submitted instead of starting them a second time.
+
+        Args:
+            db_path (str): Path of the SQLite state file (default is 'geedl_tasks.sqlite').
+            max_running (int): Maximum number of tasks queued or running on the server at once (default is 10).
+            max_retries (int): Number of resubmissions of a failed task (default is 2).
+            poll_interval (float): Seconds between status polls in ``run`` (default is 30).
+            backend (optional): Task backend with ``start``, ``list_tasks`` and ``cancel`` (default is ``EETaskBackend``).
+            executor (GEEExecutor, optional): Executor retrying rate-limited calls (default is the shared executor).
+            clock (callable): Time source used for timestamps and metrics (default is ``time.time``).
+            sleep (callable): Function used to wait between polls (default is ``time.sleep``).
+        """
+        self.db_path = db_path
+        self.max_running = max_running
+        self.max_retries = max_retries
+        self.poll_interval = poll_interval
+        self.backend = backend or EETaskBackend()
+        self.executor = executor or get_executor()
+        self.clock = clock
+        self.sleep = sleep
+        self._factories = {}
+        self._started_at = None
+        self._db = sqlite3.connect(db_path)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    # ------------------------
+    # Queue
+    # ------------------------
+
+    def add(self, name, factory):
+        """
+        Queue an export job.
+
+        Args:
+            name (str): Unique job name. Use the export description, so a job whose start did not return
+                can still be matched to the task it created on the server.
+            factory (callable): Function returning the unstarted task, e.g.
+                ``lambda: ee.batch.Export.image.toDrive(image, description=name, ...)``.
+                It is called on every (re)submission.
+        """
+        self._factories[name] = factory
+        self._db.execute(
+            "INSERT OR IGNORE INTO jobs (name, state, added_at) VALUES (?, ?, ?)", (name, QUEUED, self.clock())
+        )
+        self._db.commit()
+
+    def add_many(self, jobs):
+        """
+        Queue several jobs given as a dict or an iterable of (name, factory) pairs.
+        """
+        for name, factory in (jobs.items() if isinstance(jobs, dict) else jobs):
+            self.add(name, factory)
+
+    def jobs(self, state=None):
+        """
+        Return the stored jobs as dicts, optionally only those in one local state.
+        """
+        query = "SELECT name, state, task_id, attempts, error, added_at, submitted_at, finished_at FROM jobs"
+        rows = self._db.execute(query + (" WHERE state = ?" if state else ""), (state,) if state else ())
+        columns = ('name', 'state', 'task_id', 'attempts', 'error', 'added_at', 'submitted_at', 'finished_at')
+        return [dict(zip(columns, row)) for row in rows]
+
+    # ------------------------
+    # Scheduling
+    # ------------------------
+
+    def _update(self, name, **fields):
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        self._db.execute(f"UPDATE jobs SET {assignments} WHERE name = ?", (*fields.values(), name))
+
+    def _reattachable(self, job, tasks):
+        """
+        Return the task a queued job without task id should adopt, or None.
+
+        Only a job whose start was attempted (``submitted_at`` is written before ``start``) can have a task
+        on the server, and only a task created after the job was queued can be it: older tasks with the
+        same description belong to earlier runs of the pipeline.
+        """
+        if job['submitted_at'] is None:
+            return None
+        for task in tasks:  # The listing is newest first
+            created = task.get('creation_timestamp_ms')
+            if created is None or created < (job['added_at'] or 0) * 1000:
+                continue
+            if task['state'] not in FAILED_STATES + CANCELLED_STATES:
+                return task
+        return None
+
+    def _poll(self):
+        """
+        Refresh every submitted job from a single task listing call.
+        """
+        tasks = self.executor.call(self.backend.list_tasks)
+        by_id = {task['id']: task for task in tasks}
+        by_description = {}
+        for task in tasks:
+            by_description.setdefault(task.get('description'), []).append(task)
+
+        now = self.clock()
+        for job in self.jobs(SUBMITTED) + self.jobs(QUEUED):
+            task = by_id.get(job['task_id']) if job['task_id'] else None
+            if task is None and job['state'] == QUEUED:
+                # Reattach to a task whose start did not return (or was not recorded) before the driver stopped
+                task = self._reattachable(job, by_description.get(job['name'], []))
+                if task is None:
+                    continue
+                self._update(job['name'], task_id=task['id'], state=SUBMITTED, attempts=max(job['attempts'], 1),
+                             error=None)
+            if task is None:
+                continue  # Not listed yet; check again on the next poll
+            state = task['state']
+            if state in SUCCEEDED_STATES:
+                self._update(job['name'], state=COMPLETED, finished_at=now, error=None)
+            elif state in FAILED_STATES:
+                attempts = max(job['attempts'], 1)
+                error = task.get('error_message')
+                if attempts > self.max_retries:
+                    self._update(job['name'], state=FAILED, finished_at=now, error=error)
+                else:
+                    self._update(job['name'], state=QUEUED, task_id=None, error=error)
+            elif state in CANCELLED_STATES:
+                self._update(job['name'], state=CANCELLED, finished_at=now)
+        self._db.commit()
+
+    def _submit(self):
+        """
+        Start queued jobs until ``max_running`` tasks are active.
+
+        ``start`` is called once, outside the executor's retries: a start that times out may still have
+        created the task, and retrying it would export twice. The next poll matches such a task by description.
+        """
+        running = len(self.jobs(SUBMITTED))
+        queued = [job for job in self.jobs(QUEUED) if job['name'] in self._factories]
+        queued.sort(key=lambda job: job['added_at'] or 0)
+        for job in queued[:max(self.max_running - running, 0)]:
+            try:
+                task = self._factories[job['name']]()
+                # Record the attempt before starting, so a restarted driver knows a task may exist
+                self._update(job['name'], submitted_at=self.clock())
+                self._db.commit()
+                task_id = self.backend.start(task)
+            except Exception as e:
+                # Typically the account's task quota: leave the job queued and try again next round
+                self._update(job['name'], error=str(e))
+                break
+            self._update(job['name'], state=SUBMITTED, task_id=task_id, attempts=job['attempts'] + 1, error=None)
+            self._db.commit()
+        self._db.commit()
+
+    def step(self):
+        """
+        Poll the task states once and fill the free slots.
+
+        Returns:
+            dict: The progress metrics, see ``stats``.
+        """
+        if self._started_at is None:
+            self._started_at = self.clock()
+        self._poll()
+        self._submit()
+        return self.stats()
+
+    def run(self, timeout=None, verbose=True):
+        """
+        Schedule until every job has completed, failed for good or been cancelled.
+
+        Jobs loaded from the database without a factory in this session are only tracked, never started.
+
+        Args:
+            timeout (float, optional): Stop after this many seconds even if jobs remain (default is None).
+            verbose (bool): Print the progress after every poll (default is True).
+
+        Returns:
+            dict: The final progress metrics.
+        """
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            stats = self.step()
+            if verbose:
+                eta = f"{stats['eta'] / 60:.1f} min" if stats['eta'] is not None else "unknown"
+                print(f"Completed {stats[COMPLETED]}/{stats['total']}, running {stats[SUBMITTED]}, "
+                      f"queued {stats[QUEUED]}, failed {stats[FAILED]}, "
+                      f"{stats['throughput'] * 3600:.1f} tasks/h, ETA {eta}")
+            waiting = stats[SUBMITTED] + sum(1 for job in self.jobs(QUEUED) if job['name'] in self._factories)
+            if waiting == 0 or (deadline is not None and self.clock() >= deadline):
+                return stats
+            self.sleep(self.poll_interval)
+
+    def cancel_all(self):
+        """
+        Cancel the submitted tasks and drop the queued jobs.
+        """
+        for job in self.jobs(SUBMITTED):
+            self.executor.call(self.backend.cancel, job['task_id'])
+            self._update(job['name'], state=CANCELLED, finished_at=self.clock())
+        self._db.execute("UPDATE jobs SET state = ? WHERE state = ?", (CANCELLED, QUEUED))
+        self._db.commit()
+
+    # ------------------------
+    # Metrics
+    # ------------------------
+
+    def stats(self):
+        """
+        Return the progress metrics.
+
+        Returns:
+            dict: Job counts per local state, 'total', 'throughput' (jobs finished per second since the
+                scheduler started in this session) and 'eta' (seconds to finish the remaining jobs at that
+                throughput, None before the first job finishes).
+        """
+        counts = dict.fromkeys((QUEUED, SUBMITTED, COMPLETED, FAILED, CANCELLED), 0)
+        for state, count in self._db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"):
+            counts[state] = count
+        counts['total'] = sum(counts[state] for state in (QUEUED, SUBMITTED, COMPLETED, FAILED, CANCELLED))
+
+        since = self._started_at if self._started_at is not None else self.clock()
+        finished = self._db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE state IN (?, ?) AND finished_at >= ?", (COMPLETED, FAILED, since)
+        ).fetchone()[0]
+        elapsed = self.clock() - since
+        counts['throughput'] = finished / elapsed if finished and elapsed > 0 else 0.0
+        remaining = counts[QUEUED] + counts[SUBMITTED]
+        counts['eta'] = remaining / counts['throughput'] if counts['throughput'] else (0.0 if not remaining else None)
+        return counts
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+__all__ = [
+    "EETaskBackend",
+    "ExportScheduler",
+]
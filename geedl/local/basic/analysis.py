@@ -1,48 +1,144 @@
 # geedl/local/basic/analysis.py
 
-from .helper import get_wbt
+from .helper import get_wbt, use_native
+from . import raster_engine as engine_ops
+from ..windowed import process_raster
+from ..sampling import sample_points
+from ...cloud.profiling import profiled
+import numpy as np
 import os
 
-wbt = get_wbt()
+try:
+    import geopandas
+except ImportError:
+    geopandas = None
 
-def aspect(in_raster, out_raster):
+
+def _native_terrain(in_dem, out_raster, compute, dtype='float32', block_size=None, workers=None):
+    """
+    读取 DEM，按像元大小（地理坐标系换算为米）执行模板运算并写出。
+
+    给定 block_size 时按带 1 像元 halo 的块逐块计算（见 geedl.local.windowed），结果与整幅计算一致。
     """
-    仿 ArcGIS "坡向" (Aspect) 工具。
+    if block_size:
+        with engine_ops.rasterio.open(in_dem) as src:
+            dx, dy = engine_ops.cell_sizes(src.transform, src.crs, src.shape)
+
+        def compute_block(dem, block):
+            result = compute(dem, dx, dy)
+            result[np.isnan(dem)] = np.nan
+            return result
+
+        process_raster(in_dem, out_raster, compute_block, halo=1, block_size=block_size, workers=workers,
+                       dtype=dtype, nodata=-32768.0)
+        return 0
+    dem, profile = engine_ops.read_raster(in_dem)
+    dx, dy = engine_ops.cell_sizes(profile['transform'], profile.get('crs'), dem.shape)
+    result = compute(dem, dx, dy)
+    result[np.isnan(dem)] = np.nan
+    engine_ops.write_raster(out_raster, result, profile, dtype=dtype, nodata=-32768.0)
+    return 0
+
+
+@profiled
+def slope(in_raster, out_raster, units="degrees", z_factor=1.0, engine="auto", block_size=None, workers=None):
     """
-    return wbt.aspect(dem=in_raster, output=out_raster)
+    仿 ArcGIS "坡度" (Slope) 工具。
 
-def hillshade(in_dem, out_raster, azimuth=315.0, altitude=45.0):
+    参数:
+        units (str): "degrees" 或 "percent"。
+        engine (str): 'auto'、'numpy' 或 'whitebox'，见 helper.use_native。
+        block_size (int): NumPy 引擎按此大小分块处理，用于超出内存的大栅格。默认整幅处理。
+        workers (int): 分块处理的并行线程数。默认 CPU 核数。
     """
-    仿 ArcGIS "山体阴影" (Hillshade) 工具。
+    if use_native(engine, engine_ops.rasterio is not None):
+        return _native_terrain(in_raster, out_raster,
+                               lambda dem, dx, dy: engine_ops.slope_array(dem, dx, dy, z_factor, units),
+                               block_size=block_size, workers=workers)
+    return get_wbt().slope(dem=in_raster, output=out_raster, zfactor=z_factor, units=units)
+
+
+@profiled
+def aspect(in_raster, out_raster, engine="auto", block_size=None, workers=None):
     """
-    return wbt.hillshade(
-        dem=in_dem, 
-        output=out_raster, 
-        azimuth=azimuth, 
+    仿 ArcGIS "坡向" (Aspect) 工具。block_size / workers 见 slope。
+    """
+    if use_native(engine, engine_ops.rasterio is not None):
+        return _native_terrain(in_raster, out_raster, engine_ops.aspect_array,
+                               block_size=block_size, workers=workers)
+    return get_wbt().aspect(dem=in_raster, output=out_raster)
+
+@profiled
+def hillshade(in_dem, out_raster, azimuth=315.0, altitude=45.0, engine="auto", block_size=None, workers=None):
+    """
+    仿 ArcGIS "山体阴影" (Hillshade) 工具。NumPy 引擎输出 0-255（ArcGIS 公式）。block_size / workers 见 slope。
+    """
+    if use_native(engine, engine_ops.rasterio is not None):
+        return _native_terrain(
+            in_dem, out_raster,
+            lambda dem, dx, dy: engine_ops.hillshade_array(dem, dx, dy, azimuth, altitude),
+            block_size=block_size, workers=workers,
+        )
+    return get_wbt().hillshade(
+        dem=in_dem,
+        output=out_raster,
+        azimuth=azimuth,
         altitude=altitude
     )
 
-def reclassify(in_raster, out_raster, reclass_field, remap):
+@profiled
+def reclassify(in_raster, out_raster, reclass_field, remap, assign_mode=False, engine="auto",
+               block_size=None, workers=None):
     """
     仿 ArcGIS "重分类" (Reclassify) 工具。
-    
+
     参数:
-        remap (str): 重分类规则，Whitebox 格式通常为 "new_val;lower;upper"。
-                     这里可以根据需求进一步封装简化。
+        remap (str): 重分类规则，Whitebox 格式为 "new_val;lower;upper"（assign_mode 时为 "new_val;old_val"）。
+                     NumPy 引擎还支持元组列表或 {旧值: 新值} 字典，见 raster_engine.parse_remap。
+        assign_mode (bool): 是否按值赋值而非按区间重分类。
+        block_size / workers: 见 slope。
     """
+    if use_native(engine, engine_ops.rasterio is not None):
+        if block_size:
+            process_raster(in_raster, out_raster,
+                           lambda data, block: engine_ops.reclassify_array(data, remap, assign_mode),
+                           block_size=block_size, workers=workers)
+            return 0
+        data, profile = engine_ops.read_raster(in_raster)
+        result = engine_ops.reclassify_array(data, remap, assign_mode)
+        engine_ops.write_raster(out_raster, result, profile, dtype='float32')
+        return 0
     # 这里我们直接调用 whitebox 的 reclassify
-    return wbt.reclassify(
-        i=in_raster, 
-        output=out_raster, 
-        reclass_vals=remap
+    return get_wbt().reclassify(
+        i=in_raster,
+        output=out_raster,
+        reclass_vals=remap,
+        assign_mode=assign_mode
     )
 
-def extract_values_to_points(in_raster, in_point_features, out_point_features):
+@profiled
+def extract_values_to_points(in_raster, in_point_features, out_point_features, engine="auto"):
     """
     仿 ArcGIS "值提取至点" (Extract Values to Points) 工具。
+
+    NumPy 引擎按栅格块批量采样全部点（需要 geopandas，见 geedl.local.sampling），结果写入 VALUE1 字段（与 Whitebox 一致）。
     """
-    return wbt.extract_raster_values_at_points(
-        inputs=in_raster, 
-        points=in_point_features, 
+    if use_native(engine, engine_ops.rasterio is not None and geopandas is not None):
+        points = geopandas.read_file(in_point_features)
+        points['VALUE1'] = sample_points(points, in_raster, names=['VALUE1'])['VALUE1'].to_numpy()
+        points.to_file(out_point_features)
+        return 0
+    return get_wbt().extract_raster_values_at_points(
+        inputs=in_raster,
+        points=in_point_features,
         output=out_point_features
-    )
\ No newline at end of file
+    )
+
+
+__all__ = [
+    "slope",
+    "aspect",
+    "hillshade",
+    "reclassify",
+    "extract_values_to_points",
+]
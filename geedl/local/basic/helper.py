@@ -1,7 +1,40 @@
 # geedl/local/basic/helper.py
-import whitebox
+
+_wbt = None
+
 
 def init_engine():
+    import whitebox
+
     wbt = whitebox.WhiteboxTools()
 
-    return wbt
\ No newline at end of file
+    return wbt
+
+
+def get_wbt():
+    """
+    返回共享的 WhiteboxTools 实例，首次调用时创建（未用到 Whitebox 的工具不会加载它）。
+    """
+    global _wbt
+    if _wbt is None:
+        _wbt = init_engine()
+    return _wbt
+
+
+def use_native(engine, supported=True):
+    """
+    判断是否使用进程内 NumPy 引擎。
+
+    参数:
+        engine (str): 'auto'（默认，支持时使用 NumPy，否则回退 Whitebox）、'numpy' 或 'whitebox'。
+        supported (bool): NumPy 引擎是否支持当前参数及所需的可选依赖是否已安装。
+    """
+    if engine == 'whitebox':
+        return False
+    if engine == 'numpy':
+        if not supported:
+            raise ValueError("The NumPy engine does not support these options; use engine='whitebox'.")
+        return True
+    if engine != 'auto':
+        raise ValueError(f"Unsupported engine: {engine}")
+    return supported
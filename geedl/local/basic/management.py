@@ -1,12 +1,22 @@
 # geedl/local/basic/management.py
 
 import os
-from .helper import get_wbt
+import numpy as np
+from .helper import get_wbt, use_native
+from . import raster_engine as engine_ops
+from ..windowed import DEFAULT_BLOCK_SIZE, process_raster
+from ..mosaic import MOSAIC_METHODS, mosaic_rasters
+from ...cloud.profiling import profiled
 
+try:
+    import geopandas
+    from rasterio.features import geometry_mask
+except ImportError:
+    geopandas = None
 
-wbt = get_wbt()
-
-def mosaic_to_new_raster(input_rasters, output_location, raster_dataset_name_with_extension, mosaic_method="FIRST"):
+@profiled
+def mosaic_to_new_raster(input_rasters, output_location, raster_dataset_name_with_extension, mosaic_method="FIRST",
+                         engine="auto", block_size=DEFAULT_BLOCK_SIZE, workers=None):
     """
     仿 ArcGIS "镶嵌到新栅格" (Mosaic To New Raster) 工具。
     
@@ -16,10 +26,19 @@ def mosaic_to_new_raster(input_rasters, output_location, raster_dataset_name_wit
         raster_dataset_name_with_extension (str): 带扩展名的输出文件名（如 'result.tif'）。
         mosaic_method (str): 镶嵌方法。支持: "FIRST", "LAST", "MINIMUM", "MAXIMUM", "MEAN", "BLEND"。
                              默认值为 "FIRST"。
+        engine (str): 'auto'、'numpy'（流式镶嵌引擎，见 geedl.local.mosaic）或 'whitebox'，见 helper.use_native。
+        block_size (int): 流式镶嵌的输出块边长（像元）。默认 1024。
+        workers (int): 流式镶嵌的并行线程数。默认 CPU 核数。
     """
     
     # 1. 构造完整的输出路径
     output_path = os.path.join(output_location, raster_dataset_name_with_extension)
+
+    if use_native(engine, engine_ops.rasterio is not None and mosaic_method.upper() in MOSAIC_METHODS):
+        print(f"正在将 {len(input_rasters)} 个栅格镶嵌至: {output_path}")
+        stats = mosaic_rasters(input_rasters, output_path, mosaic_method, block_size=block_size, workers=workers)
+        print(f"镶嵌成功！{stats['blocks']} 个块，耗时 {stats['seconds']:.1f} 秒，吞吐量 {stats['mb_per_s']:.1f} MB/s")
+        return output_path
     
     # 2. 将输入的列表转换为 Whitebox 要求的分号分隔字符串
     # WhiteboxTools 的 inputs 参数接受 "file1.tif;file2.tif;file3.tif" 格式
@@ -41,7 +60,7 @@ def mosaic_to_new_raster(input_rasters, output_location, raster_dataset_name_wit
     
     # 4. 调用 Whitebox 引擎执行操作
     print(f"正在将 {len(input_rasters)} 个栅格镶嵌至: {output_path}")
-    result = wbt.mosaic(
+    result = get_wbt().mosaic(
         inputs=input_str, 
         output=output_path, 
         method=wbt_method
@@ -55,7 +74,9 @@ def mosaic_to_new_raster(input_rasters, output_location, raster_dataset_name_wit
         return None
     
 
-def clip_raster_by_mask(in_raster, in_template_dataset, out_raster, nodata_value=None):
+@profiled
+def clip_raster_by_mask(in_raster, in_template_dataset, out_raster, nodata_value=None, engine="auto",
+                        block_size=None, workers=None):
     """
     仿 ArcGIS "裁剪" (Clip) 工具。
     注意：此函数使用矢量多边形对栅格进行裁剪。
@@ -65,14 +86,37 @@ def clip_raster_by_mask(in_raster, in_template_dataset, out_raster, nodata_value
         in_template_dataset (str): 用作裁剪边界的矢量文件路径 (.shp)。
         out_raster (str): 输出栅格路径。
         nodata_value (float): 裁剪后外部区域的填充值。
+        engine (str): 'auto'、'numpy'（需要 geopandas）或 'whitebox'，见 helper.use_native。
+        block_size (int): NumPy 引擎按此大小分块处理，用于超出内存的大栅格。默认整幅处理。
+        workers (int): 分块处理的并行线程数。默认 CPU 核数。
     """
-    return wbt.clip_raster_to_polygon(
+    if use_native(engine, engine_ops.rasterio is not None and geopandas is not None):
+        with engine_ops.rasterio.open(in_raster) as src:
+            crs, raster_dtype = src.crs, src.dtypes[0]
+        polygons = geopandas.read_file(in_template_dataset)
+        if crs is not None and polygons.crs is not None and polygons.crs != crs:
+            polygons = polygons.to_crs(crs)
+        if block_size:
+            def clip_block(data, block):
+                data[geometry_mask(polygons.geometry, out_shape=data.shape, transform=block.transform)] = np.nan
+                return data
+
+            process_raster(in_raster, out_raster, clip_block, block_size=block_size, workers=workers,
+                           dtype=raster_dtype, nodata=nodata_value)
+            return 0
+        data, profile = engine_ops.read_raster(in_raster)
+        outside = geometry_mask(polygons.geometry, out_shape=data.shape, transform=profile['transform'])
+        data[outside] = np.nan
+        engine_ops.write_raster(out_raster, data, profile, dtype=profile['dtype'], nodata=nodata_value)
+        return 0
+    return get_wbt().clip_raster_to_polygon(
         i=in_raster, 
         polygons=in_template_dataset, 
         output=out_raster,
         maintain_dimensions=True # 保持原有的栅格行列结构
     )
 
+@profiled
 def project_raster(in_raster, out_raster, out_coor_system):
     """
     仿 ArcGIS "投影栅格" (Project Raster) 工具。
@@ -83,27 +127,41 @@ def project_raster(in_raster, out_raster, out_coor_system):
         out_coor_system (str): 目标坐标系的 EPSG 代码或 WKT 字符串。
     """
     # Whitebox 使用 reproject 函数
-    return wbt.reproject_raster(
+    return get_wbt().reproject_raster(
         i=in_raster, 
         output=out_raster, 
         crs=str(out_coor_system)
     )
 
-def resample(in_raster, out_raster, cell_size, resampling_type="NEAREST"):
+@profiled
+def resample(in_raster, out_raster, cell_size, resampling_type="NEAREST", engine="auto"):
     """
     仿 ArcGIS "重采样" (Resample) 工具。
     
     参数:
         cell_size (float): 新的像元大小。
-        resampling_type (str): 方法，支持 "NEAREST", "BILINEAR", "BICUBIC"。
+        resampling_type (str): 方法，支持 "NEAREST", "BILINEAR", "BICUBIC"（BICUBIC 由 Whitebox 计算）。
+        engine (str): 'auto'、'numpy' 或 'whitebox'，见 helper.use_native。
     """
+    native_methods = {"NEAREST": "nearest", "BILINEAR": "bilinear"}
+    if use_native(engine, engine_ops.rasterio is not None and resampling_type.upper() in native_methods):
+        data, profile = engine_ops.read_raster(in_raster)
+        result, transform = engine_ops.resample_array(data, profile['transform'], cell_size,
+                                                      native_methods[resampling_type.upper()])
+        profile.update(width=result.shape[1], height=result.shape[0],
+                       transform=engine_ops.rasterio.Affine(*transform))
+        profile.pop('blockxsize', None)
+        profile.pop('blockysize', None)
+        profile.pop('tiled', None)
+        engine_ops.write_raster(out_raster, result, profile, dtype=profile['dtype'])
+        return 0
     method_map = {
         "NEAREST": "nn",
         "BILINEAR": "bilinear",
         "BICUBIC": "cc"
     }
-    return wbt.resample(
-        i=in_raster, 
+    return get_wbt().resample(
+        inputs=in_raster, 
         output=out_raster, 
         cell_size=cell_size, 
         method=method_map.get(resampling_type.upper(), "nn")
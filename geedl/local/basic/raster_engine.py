@@ -0,0 +1,253 @@
+# geedl/local/basic/raster_engine.py
+# 进程内 NumPy 栅格引擎：坡度/坡向/山体阴影模板运算、重分类、批量点采样与重采样
+
+import math
+
+import numpy as np
+
+try:
+    import rasterio
+except ImportError:
+    rasterio = None
+
+# 地理坐标系下每度对应的米数（赤道处），用于将经纬度像元大小换算为米
+METERS_PER_DEGREE = 111320.0
+
+
+# ------------------------
+# 栅格读写
+# ------------------------
+
+def read_raster(path, band=1, dtype='float64'):
+    """
+    读取单波段栅格为数组，NoData 像元替换为 NaN。
+
+    返回:
+        tuple: (数组, rasterio profile)。
+    """
+    if rasterio is None:
+        raise ImportError("rasterio is required to read rasters.")
+    with rasterio.open(path) as src:
+        array = src.read(band, masked=True).astype(dtype).filled(np.nan)
+        return array, src.profile.copy()
+
+
+def write_raster(path, array, profile, dtype=None, nodata=None):
+    """
+    将数组写出为单波段栅格，NaN 像元写为 NoData。
+    """
+    if rasterio is None:
+        raise ImportError("rasterio is required to write rasters.")
+    dtype = np.dtype(dtype or array.dtype)
+    if nodata is None:
+        nodata = profile.get('nodata')
+    if nodata is None:
+        nodata = np.nan if dtype.kind == 'f' else 0
+    profile = dict(profile, count=1, dtype=dtype.name, nodata=nodata)
+    data = np.where(np.isnan(array), nodata, array) if array.dtype.kind == 'f' else array
+    if dtype.kind in 'iu':
+        data = np.rint(data)
+    with rasterio.open(path, 'w', **profile) as dst:
+        dst.write(data.astype(dtype, copy=False), 1)
+    return path
+
+
+def cell_sizes(transform, crs=None, shape=None):
+    """
+    返回以米为单位的像元宽、高。地理坐标系按栅格中心纬度换算（与 WhiteboxTools 的做法一致）。
+    """
+    dx, dy = abs(transform[0]), abs(transform[4])
+    if crs is not None and getattr(crs, 'is_geographic', False):
+        rows = shape[0] if shape else 0
+        mid_lat = transform[5] + transform[4] * rows / 2
+        dx *= METERS_PER_DEGREE * math.cos(math.radians(mid_lat))
+        dy *= METERS_PER_DEGREE
+    return dx, dy
+
+
+# ------------------------
+# 地形模板运算 (Horn 3x3)
+# ------------------------
+
+def _horn_gradients(dem, dx, dy, z_factor=1.0):
+    """
+    用 Horn (1981) 3x3 模板计算东向与南向的高程梯度，边缘按最近像元外推。
+    """
+    z = np.pad(np.asarray(dem, dtype='float64'), 1, mode='edge')
+    a, b, c = z[:-2, :-2], z[:-2, 1:-1], z[:-2, 2:]
+    d, f = z[1:-1, :-2], z[1:-1, 2:]
+    g, h, i = z[2:, :-2], z[2:, 1:-1], z[2:, 2:]
+    dz_dx = ((c + 2 * f + i) - (a + 2 * d + g)) * (z_factor / (8 * dx))
+    dz_dy = ((g + 2 * h + i) - (a + 2 * b + c)) * (z_factor / (8 * dy))
+    return dz_dx, dz_dy
+
+
+def slope_array(dem, dx, dy, z_factor=1.0, units='degrees'):
+    """
+    计算坡度。units 为 'degrees'（默认）或 'percent'。
+    """
+    dz_dx, dz_dy = _horn_gradients(dem, dx, dy, z_factor)
+    rise = np.hypot(dz_dx, dz_dy)
+    if units == 'percent':
+        return rise * 100
+    return np.degrees(np.arctan(rise))
+
+
+def aspect_array(dem, dx, dy, z_factor=1.0):
+    """
+    计算坡向（自正北顺时针的度数，0-360），平坦像元为 -1（与 ArcGIS 一致）。
+    """
+    dz_dx, dz_dy = _horn_gradients(dem, dx, dy, z_factor)
+    math_aspect = np.degrees(np.arctan2(dz_dy, -dz_dx))
+    aspect = np.where(math_aspect > 90, 450 - math_aspect, 90 - math_aspect)
+    aspect = np.where((dz_dx == 0) & (dz_dy == 0), -1.0, aspect)
+    return np.where(np.isnan(dz_dx), np.nan, aspect)
+
+
+def hillshade_array(dem, dx, dy, azimuth=315.0, altitude=45.0, z_factor=1.0):
+    """
+    计算山体阴影（0-255，ArcGIS 公式）。
+    """
+    dz_dx, dz_dy = _horn_gradients(dem, dx, dy, z_factor)
+    zenith = math.radians(90 - altitude)
+    azimuth_math = math.radians((360 - azimuth + 90) % 360)
+    slope = np.arctan(np.hypot(dz_dx, dz_dy))
+    aspect = np.arctan2(dz_dy, -dz_dx)
+    shade = 255 * (math.cos(zenith) * np.cos(slope)
+                   + math.sin(zenith) * np.sin(slope) * np.cos(azimuth_math - aspect))
+    return np.clip(shade, 0, 255)
+
+
+# ------------------------
+# 重分类
+# ------------------------
+
+def parse_remap(remap, assign_mode=False):
+    """
+    解析重分类规则。
+
+    支持 WhiteboxTools 格式字符串："新值;起始;终止(不含)" 三元组（区间模式），
+    或 assign_mode=True 时的 "新值;旧值" 二元组（赋值模式），也支持直接传入元组列表或 {旧值: 新值} 字典。
+
+    返回:
+        tuple: ('ranges', [(新值, 起始, 终止), ...]) 或 ('values', {旧值: 新值})。
+    """
+    if isinstance(remap, dict):
+        return 'values', {float(old): float(new) for old, new in remap.items()}
+    if isinstance(remap, str):
+        numbers = [float(token) for token in remap.replace(',', ';').split(';') if token.strip()]
+        width = 2 if assign_mode else 3
+        if len(numbers) % width:
+            raise ValueError(f"Invalid remap string: {remap}")
+        remap = [tuple(numbers[k:k + width]) for k in range(0, len(numbers), width)]
+    remap = [tuple(float(value) for value in rule) for rule in remap]
+    if all(len(rule) == 3 for rule in remap):
+        return 'ranges', remap
+    if all(len(rule) == 2 for rule in remap):
+        return 'values', {old: new for new, old in remap}
+    raise ValueError("remap rules must all be (new, from, to) or all be (new, old).")
+
+
+def reclassify_array(array, remap, assign_mode=False):
+    """
+    按规则重分类数组；未命中任何规则的像元保持原值，NaN 保持为 NaN。
+
+    区间模式通过 np.digitize 一次定位所有像元所在区间，再查表得到新值；
+    赋值模式通过 np.searchsorted 查表。
+    """
+    mode, rules = parse_remap(remap, assign_mode)
+    array = np.asarray(array, dtype='float64')
+    if mode == 'values':
+        olds = np.array(sorted(rules), dtype='float64')
+        news = np.array([rules[old] for old in olds])
+        position = np.clip(np.searchsorted(olds, array), 0, len(olds) - 1)
+        hit = olds[position] == array
+        return np.where(hit, news[position], array)
+
+    # 区间边界排序后，第 k 个区间 [edges[k-1], edges[k]) 对应 digitize 结果 k
+    edges = np.unique([bound for _, low, high in rules for bound in (low, high)])
+    table = np.full(len(edges) + 1, np.nan)
+    for new, low, high in rules:
+        table[np.searchsorted(edges, low) + 1:np.searchsorted(edges, high) + 1] = new
+    bins = np.digitize(array, edges)
+    result = table[bins]
+    return np.where(np.isnan(result), array, result)
+
+
+# ------------------------
+# 点采样与重采样
+# ------------------------
+
+def _inverse_transform(transform):
+    a, b, c, d, e, f = (float(value) for value in tuple(transform)[:6])
+    det = a * e - b * d
+    return e / det, -b / det, d / det, a / det, c, f
+
+
+def sample_array(array, transform, xs, ys, nodata=np.nan):
+    """
+    批量提取坐标点所在像元的值；落在栅格之外的点返回 nodata。
+
+    参数:
+        transform: 仿射变换 (a, b, c, d, e, f)，如 rasterio 的 Affine。
+        xs, ys: 点的 x、y 坐标数组（与栅格同一坐标系）。
+    """
+    ia, ib, id_, ie, c, f = _inverse_transform(transform)
+    dx, dy = np.asarray(xs, dtype='float64') - c, np.asarray(ys, dtype='float64') - f
+    cols = np.floor(ia * dx + ib * dy).astype(np.int64)
+    rows = np.floor(-id_ * dx + ie * dy).astype(np.int64)
+    inside = (rows >= 0) & (rows < array.shape[0]) & (cols >= 0) & (cols < array.shape[1])
+    values = np.full(rows.shape, nodata, dtype=np.result_type(array.dtype, np.float64))
+    values[inside] = array[rows[inside], cols[inside]]
+    return values
+
+
+def resample_array(array, transform, cell_size, method='nearest'):
+    """
+    将数组重采样到新的像元大小（范围不变），支持 'nearest' 与 'bilinear'。
+
+    返回:
+        tuple: (重采样后的数组, 新的仿射变换 (a, b, c, d, e, f))。
+    """
+    a, b, c, d, e, f = (float(value) for value in tuple(transform)[:6])
+    if b or d:
+        raise ValueError("Rotated rasters are not supported.")
+    height, width = array.shape
+    out_width = max(1, int(round(width * abs(a) / cell_size)))
+    out_height = max(1, int(round(height * abs(e) / cell_size)))
+    new_a, new_e = math.copysign(cell_size, a), math.copysign(cell_size, e)
+
+    # 输出像元中心在输入栅格中的（小数）行列号
+    cols = (np.arange(out_width) + 0.5) * (new_a / a) - 0.5
+    rows = (np.arange(out_height) + 0.5) * (new_e / e) - 0.5
+    if method == 'nearest':
+        col_index = np.clip(np.floor(cols + 0.5).astype(np.int64), 0, width - 1)
+        row_index = np.clip(np.floor(rows + 0.5).astype(np.int64), 0, height - 1)
+        out = array[np.ix_(row_index, col_index)]
+    elif method == 'bilinear':
+        cols, rows = np.clip(cols, 0, width - 1), np.clip(rows, 0, height - 1)
+        c0 = np.minimum(np.floor(cols).astype(np.int64), width - 2 if width > 1 else 0)
+        r0 = np.minimum(np.floor(rows).astype(np.int64), height - 2 if height > 1 else 0)
+        c1, r1 = np.minimum(c0 + 1, width - 1), np.minimum(r0 + 1, height - 1)
+        wc, wr = (cols - c0)[None, :], (rows - r0)[:, None]
+        data = np.asarray(array, dtype='float64')
+        top = data[np.ix_(r0, c0)] * (1 - wc) + data[np.ix_(r0, c1)] * wc
+        bottom = data[np.ix_(r1, c0)] * (1 - wc) + data[np.ix_(r1, c1)] * wc
+        out = top * (1 - wr) + bottom * wr
+    else:
+        raise ValueError(f"Unsupported resampling method: {method}")
+    return out, (new_a, 0.0, c, 0.0, new_e, f)
+
+
+__all__ = [
+    "read_raster",
+    "write_raster",
+    "cell_sizes",
+    "slope_array",
+    "aspect_array",
+    "hillshade_array",
+    "parse_remap",
+    "reclassify_array",
+    "sample_array",
+    "resample_array",
+]
@@ -0,0 +1,229 @@
+# geedl/local/basic/spectral.py
+
+import numpy as np
+
+from ...cloud.para import BAND_MAPPING
+from ...cloud.index_planner import get_index_plan
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+try:
+    import rasterio
+except ImportError:
+    rasterio = None
+
+
+# 每个分块处理的像元数上限，用于控制中间结果的内存占用
+DEFAULT_CHUNK_PIXELS = 1 << 20
+
+
+def _as_band_dict(bands, band_names):
+    """
+    将多种输入统一为 {波段名: 数组} 字典。
+
+    支持 dict、(波段, ...) 形状的 NumPy 数组、带 'band' 维度的 xarray.DataArray 以及 xarray.Dataset。
+    """
+    if isinstance(bands, dict):
+        return dict(bands)
+    if hasattr(bands, 'data_vars'):  # xarray.Dataset
+        return {name: np.asarray(bands[name].data) for name in bands.data_vars}
+    if hasattr(bands, 'dims'):  # xarray.DataArray
+        if band_names is None:
+            band_names = [str(name) for name in bands['band'].values]
+        bands = bands.transpose('band', ...).data
+    bands = np.asarray(bands)
+    if band_names is None:
+        raise ValueError("band_names is required when bands is an array.")
+    if len(band_names) != bands.shape[0]:
+        raise ValueError(f"Got {len(band_names)} band names for {bands.shape[0]} bands.")
+    return {name: bands[i] for i, name in enumerate(band_names)}
+
+
+def _last_uses(plan):
+    """
+    计算每个节点最后一次被引用的位置，便于及时释放中间结果。
+    """
+    last_use = list(range(len(plan.nodes)))
+    for node_id, node in enumerate(plan.nodes):
+        for operand in node[1:] if node[0] not in ('band', 'const') else ():
+            last_use[operand] = node_id
+    for node_id in plan.outputs:
+        last_use[node_id] = len(plan.nodes)
+    return last_use
+
+
+def _numpy_op(kind, left, right):
+    """
+    与 GEE 的 ee.Image 运算保持一致：除以 0 的结果为 0。
+    """
+    if kind == 'add':
+        return np.add(left, right)
+    if kind == 'subtract':
+        return np.subtract(left, right)
+    if kind == 'multiply':
+        return np.multiply(left, right)
+    if kind == 'pow':
+        return np.power(left, right)
+    left, right = np.broadcast_arrays(left, right)
+    result = np.zeros(left.shape, dtype=np.result_type(left, right, np.float32))
+    return np.divide(left, right, out=result, where=right != 0)
+
+
+def _evaluate_numpy(plan, chunk, out_views, dtype):
+    values = [None] * len(plan.nodes)
+    last_use = _last_uses(plan)
+    for node_id, node in enumerate(plan.nodes):
+        kind = node[0]
+        if kind == 'band':
+            values[node_id] = chunk[node[1]]
+        elif kind == 'const':
+            values[node_id] = dtype.type(node[1])
+        elif kind == 'neg':
+            values[node_id] = np.negative(values[node[1]])
+        else:
+            values[node_id] = _numpy_op(kind, values[node[1]], values[node[2]])
+        # 释放不再使用的中间结果
+        for operand in node[1:] if kind not in ('band', 'const') else ():
+            if last_use[operand] == node_id:
+                values[operand] = None
+    for k, node_id in enumerate(plan.outputs):
+        np.copyto(out_views[k], values[node_id], casting='unsafe')
+
+
+def _numexpr_sources(plan):
+    """
+    将计划中的每个输出节点转换为 numexpr 表达式字符串（除以 0 同样返回 0）。
+    """
+    sources = []
+    for node in plan.nodes:
+        kind = node[0]
+        if kind == 'band':
+            sources.append(node[1])
+        elif kind == 'const':
+            sources.append(repr(node[1]))
+        elif kind == 'neg':
+            sources.append(f"(-{sources[node[1]]})")
+        else:
+            left, right = sources[node[1]], sources[node[2]]
+            if kind == 'divide':
+                sources.append(f"where({right} == 0, 0.0, {left} / {right})")
+            else:
+                symbol = {'add': '+', 'subtract': '-', 'multiply': '*', 'pow': '**'}[kind]
+                sources.append(f"({left} {symbol} {right})")
+    return [sources[node_id] for node_id in plan.outputs]
+
+
+def compute_spectral_indices(bands, indices, band_names=None, out=None, dtype='float64',
+                             chunk_pixels=DEFAULT_CHUNK_PIXELS, use_numexpr=None):
+    """
+    在本地数组上计算光谱指数，与 geedl.cloud.data_processing.add_spectral_indices 使用同一套公式。
+
+    参数:
+        bands: 输入波段，可以是 {波段名: 数组} 字典、形状为 (波段, 行, 列) 的数组、
+               带 'band' 维度的 xarray.DataArray 或 xarray.Dataset。
+               波段名使用 RENAMED_BANDS 中的名称（如 'red', 'nir'）。
+        indices (list): 光谱指数名称列表，如 ["NDVI", "EVI"]。
+        band_names (list): 当 bands 为数组时对应的波段名。
+        out (np.ndarray): 预分配的输出数组，形状为 (len(indices), 行, 列)。默认自动分配。
+        dtype (str): 计算与输出的数据类型，默认 'float64'（与 GEE 的双精度计算一致）。
+        chunk_pixels (int): 每个分块处理的像元数上限，用于限制中间结果的内存。
+        use_numexpr (bool): 是否使用 numexpr。默认在已安装时使用。
+
+    返回:
+        np.ndarray 或 xarray.DataArray: 指数结果，第一维对应 indices 顺序。
+            输入为 xarray.DataArray 时返回带 'band' 坐标的 DataArray。
+    """
+    plan = get_index_plan(indices)
+    band_dict = _as_band_dict(bands, band_names)
+    dtype = np.dtype(dtype)
+
+    missing = [BAND_MAPPING[symbol] for symbol in plan.bands if BAND_MAPPING[symbol] not in band_dict]
+    if missing:
+        raise ValueError(f"Missing bands required by {list(indices)}: {missing}")
+    arrays = {symbol: np.asarray(band_dict[BAND_MAPPING[symbol]]) for symbol in plan.bands}
+    shape = next(iter(arrays.values())).shape if arrays else np.shape(next(iter(band_dict.values())))
+    for symbol, array in arrays.items():
+        if array.shape != shape:
+            raise ValueError(f"Band '{BAND_MAPPING[symbol]}' has shape {array.shape}, expected {shape}.")
+
+    if out is None:
+        out = np.empty((len(plan.indices),) + shape, dtype=dtype)
+    elif out.shape != (len(plan.indices),) + shape:
+        raise ValueError(f"out has shape {out.shape}, expected {(len(plan.indices),) + shape}.")
+
+    if use_numexpr is None:
+        use_numexpr = numexpr is not None
+    if use_numexpr and numexpr is None:
+        raise ImportError("numexpr is not installed.")
+    sources = _numexpr_sources(plan) if use_numexpr else None
+
+    # 沿第一个空间维度分块，切片均为视图，不产生额外拷贝
+    row_pixels = int(np.prod(shape[1:])) if len(shape) > 1 else 1
+    rows_per_chunk = max(1, chunk_pixels // max(row_pixels, 1))
+    n_rows = shape[0] if shape else 1
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for start in range(0, n_rows, rows_per_chunk):
+            rows = slice(start, min(start + rows_per_chunk, n_rows)) if shape else ()
+            chunk = {symbol: array[rows].astype(dtype, copy=False) for symbol, array in arrays.items()}
+            out_views = [out[k][rows] for k in range(len(plan.indices))]
+            if use_numexpr:
+                for k, source in enumerate(sources):
+                    if out_views[k].flags.c_contiguous:
+                        numexpr.evaluate(source, local_dict=chunk, out=out_views[k], casting='same_kind')
+                    else:
+                        out_views[k][...] = numexpr.evaluate(source, local_dict=chunk)
+            else:
+                _evaluate_numpy(plan, chunk, out_views, dtype)
+
+    if hasattr(bands, 'dims') and not hasattr(bands, 'data_vars'):
+        template = bands.isel(band=0, drop=True)
+        return type(bands)(out, dims=('band',) + template.dims,
+                           coords=dict(template.coords, band=list(plan.indices)))
+    return out
+
+
+def compute_spectral_indices_raster(in_raster, out_raster, indices, band_names=None,
+                                    dtype='float32', use_numexpr=None):
+    """
+    逐块读取多波段 GeoTIFF 并计算光谱指数，写出为新的 GeoTIFF（需要安装 rasterio）。
+
+    参数:
+        in_raster (str): 输入多波段栅格路径。
+        out_raster (str): 输出栅格路径，每个指数一个波段。
+        indices (list): 光谱指数名称列表。
+        band_names (list): 输入波段名（RENAMED_BANDS 名称）。默认读取栅格的波段描述。
+        dtype (str): 输出数据类型，默认 'float32'。
+        use_numexpr (bool): 是否使用 numexpr。默认在已安装时使用。
+    """
+    if rasterio is None:
+        raise ImportError("rasterio is required to read and write GeoTIFF files.")
+
+    with rasterio.open(in_raster) as src:
+        band_names = list(band_names or src.descriptions)
+        if None in band_names:
+            raise ValueError("band_names is required because the raster has no band descriptions.")
+        profile = src.profile.copy()
+        profile.update(count=len(indices), dtype=dtype, nodata=np.nan)
+
+        with rasterio.open(out_raster, 'w', **profile) as dst:
+            dst.descriptions = tuple(indices)
+            out = None
+            for _, window in src.block_windows(1):
+                data = src.read(window=window, masked=True).astype(dtype).filled(np.nan)
+                shape = (len(indices), data.shape[1], data.shape[2])
+                if out is None or out.shape != shape:
+                    out = np.empty(shape, dtype=dtype)  # 预分配输出缓冲区，块大小相同时复用
+                compute_spectral_indices(data, indices, band_names, out=out, dtype=dtype,
+                                         use_numexpr=use_numexpr)
+                dst.write(out, window=window)
+    return out_raster
+
+
+__all__ = [
+    "compute_spectral_indices",
+    "compute_spectral_indices_raster",
+]
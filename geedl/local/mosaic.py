@@ -0,0 +1,273 @@
+# geedl/local/mosaic.py
+# 流式镶嵌引擎：按输出块建立输入范围索引，逐块只读取相交的输入并做 FIRST/LAST/MIN/MAX/MEAN/BLEND 归约
+
+import itertools
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from .windowed import DEFAULT_BLOCK_SIZE, iter_blocks
+
+try:
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.transform import Affine
+    from rasterio.windows import Window, from_bounds
+except ImportError:
+    rasterio = None
+
+MOSAIC_METHODS = ("FIRST", "LAST", "MINIMUM", "MAXIMUM", "MEAN", "BLEND")
+
+# 每个线程最多同时保持打开的输入栅格数，镶嵌上千个瓦片时避免耗尽文件句柄
+_MAX_OPEN_PER_THREAD = 64
+
+RasterInfo = namedtuple('RasterInfo', ['path', 'bounds', 'res', 'crs', 'count', 'dtype', 'nodata'])
+
+
+def _read_info(path):
+    with rasterio.open(path) as src:
+        return RasterInfo(path, tuple(src.bounds), src.res, src.crs, src.count, src.dtypes[0], src.nodata)
+
+
+def _output_grid(infos):
+    """
+    输出网格：覆盖全部输入的范围，像元大小与对齐方式取自第一个输入（与 ArcGIS 默认一致）。
+    """
+    first = infos[0]
+    res_x, res_y = first.res
+    left = first.bounds[0] - math.ceil((first.bounds[0] - min(i.bounds[0] for i in infos)) / res_x - 1e-9) * res_x
+    top = first.bounds[3] + math.ceil((max(i.bounds[3] for i in infos) - first.bounds[3]) / res_y - 1e-9) * res_y
+    width = math.ceil((max(i.bounds[2] for i in infos) - left) / res_x - 1e-9)
+    height = math.ceil((top - min(i.bounds[1] for i in infos)) / res_y - 1e-9)
+    return Affine(res_x, 0, left, 0, -res_y, top), width, height
+
+
+def _footprint(info, transform):
+    """
+    输入范围在输出网格中的（小数）像元坐标 (col0, row0, col1, row1)。
+    """
+    left, bottom, right, top = info.bounds
+    return ((left - transform.c) / transform.a, (transform.f - top) / -transform.e,
+            (right - transform.c) / transform.a, (transform.f - bottom) / -transform.e)
+
+
+def build_block_index(footprints, block_size):
+    """
+    为每个输出块列出与之相交的输入序号（保持输入顺序），即按块划分的空间索引。
+    """
+    index = defaultdict(list)
+    for k, (col0, row0, col1, row1) in enumerate(footprints):
+        for block_row in range(max(int(row0), 0) // block_size, max(math.ceil(row1) - 1, 0) // block_size + 1):
+            for block_col in range(max(int(col0), 0) // block_size, max(math.ceil(col1) - 1, 0) // block_size + 1):
+                index[block_row, block_col].append(k)
+    return index
+
+
+class _HandleCache:
+    """
+    每个线程独立的输入数据集 LRU 缓存（rasterio 数据集不是线程安全的）。
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._all = []
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        handles = getattr(self._local, 'handles', None)
+        if handles is None:
+            handles = self._local.handles = OrderedDict()
+            with self._lock:
+                self._all.append(handles)
+        if path in handles:
+            handles.move_to_end(path)
+            return handles[path]
+        if len(handles) >= _MAX_OPEN_PER_THREAD:
+            handles.popitem(last=False)[1].close()
+        handles[path] = rasterio.open(path)
+        return handles[path]
+
+    def close(self):
+        with self._lock:
+            for handles in self._all:
+                for handle in handles.values():
+                    handle.close()
+                handles.clear()
+
+
+def _blend_weights(footprint, col, row, width, height):
+    """
+    羽化权重：像元中心到输入边缘的最短距离（像元），越靠近边缘权重越低。
+    """
+    col0, row0, col1, row1 = footprint
+    cols = np.arange(col, col + width) + 0.5
+    rows = np.arange(row, row + height) + 0.5
+    col_distance = np.minimum(cols - col0, col1 - cols)
+    row_distance = np.minimum(rows - row0, row1 - rows)
+    return np.clip(np.minimum.outer(row_distance, col_distance), 0, None)
+
+
+def _source_window(src, left, bottom, right, top):
+    """
+    输出块中的地理范围对应的输入窗口，以及是否需要 boundless 读取。
+
+    完全落在输入内部的窗口（允许浮点误差）裁剪到输入范围后普通读取；boundless 读取会经过
+    GDAL 的 VRT 包装，明显更慢，只用于确实越过输入边缘的窗口。
+    """
+    window = from_bounds(left, bottom, right, top, transform=src.transform)
+    col0, row0 = window.col_off, window.row_off
+    col1, row1 = col0 + window.width, row0 + window.height
+    tolerance = 1e-6
+    if col0 < -tolerance or row0 < -tolerance or col1 > src.width + tolerance or row1 > src.height + tolerance:
+        return window, True
+    col0, row0 = max(col0, 0), max(row0, 0)
+    return Window(col0, row0, min(col1, src.width) - col0, min(row1, src.height) - row0), False
+
+
+def _mosaic_block(window, inputs, infos, footprints, transform, method, handles):
+    """
+    计算一个输出块：依次读取相交输入的对应窗口并归约。返回 (窗口, 结果, 读取字节数)。
+    """
+    col, row, width, height = window
+    count = infos[0].count
+    shape = (count, height, width)
+    bytes_read = 0
+    if method in ("MEAN", "BLEND"):
+        total, weight = np.zeros(shape), np.zeros(shape)
+    else:
+        result = np.full(shape, np.nan)
+
+    for k in inputs:
+        col0, row0, col1, row1 = footprints[k]
+        # 输入与块的交集（输出网格中的整数像元范围）
+        c0, c1 = max(col, int(math.floor(col0 + 1e-9))), min(col + width, int(math.ceil(col1 - 1e-9)))
+        r0, r1 = max(row, int(math.floor(row0 + 1e-9))), min(row + height, int(math.ceil(row1 - 1e-9)))
+        if c0 >= c1 or r0 >= r1:
+            continue
+        src = handles.get(infos[k].path)
+        left, top = transform * (c0, r0)
+        right, bottom = transform * (c1, r1)
+        source_window, boundless = _source_window(src, left, bottom, right, top)
+        data = src.read(window=source_window, out_shape=(count, r1 - r0, c1 - c0), masked=True,
+                        boundless=boundless, resampling=Resampling.nearest)
+        bytes_read += data.data.nbytes
+        values = data.astype('float64').filled(np.nan)
+        valid = ~np.isnan(values)
+        target = (slice(None), slice(r0 - row, r1 - row), slice(c0 - col, c1 - col))
+
+        if method == "FIRST":
+            current = result[target]
+            np.copyto(current, values, where=np.isnan(current) & valid)
+        elif method == "LAST":
+            np.copyto(result[target], values, where=valid)
+        elif method == "MINIMUM":
+            result[target] = np.fmin(result[target], values)
+        elif method == "MAXIMUM":
+            result[target] = np.fmax(result[target], values)
+        else:
+            w = valid.astype('float64')
+            if method == "BLEND":
+                w *= _blend_weights(footprints[k], c0, r0, c1 - c0, r1 - r0)[None]
+            total[target] += np.where(valid, values, 0) * w
+            weight[target] += w
+
+    if method in ("MEAN", "BLEND"):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = np.where(weight > 0, total / weight, np.nan)
+    return window, result, bytes_read
+
+
+def mosaic_rasters(input_rasters, out_raster, method="FIRST", block_size=DEFAULT_BLOCK_SIZE, workers=None,
+                   dtype=None, nodata=None, compress='deflate'):
+    """
+    将多个栅格流式镶嵌为一个分块 GeoTIFF，内存占用只与块大小有关。
+
+    参数:
+        input_rasters (list): 输入栅格路径列表（需同一坐标系、同一波段数）。FIRST/LAST 按列表顺序取值。
+        out_raster (str): 输出栅格路径。
+        method (str): "FIRST", "LAST", "MINIMUM", "MAXIMUM", "MEAN" 或 "BLEND"（按到输入边缘距离羽化）。
+        block_size (int): 输出块边长（像元）。默认 1024。
+        workers (int): 读取解码与归约的并行线程数，同时用于 GDAL 压缩编码。默认 CPU 核数。
+        dtype (str): 输出数据类型。默认与第一个输入相同。
+        nodata (float): 输出 NoData 值。默认与第一个输入相同。
+        compress (str): 输出压缩方式。默认 'deflate'。
+
+    返回:
+        dict: 统计信息，包括 blocks、bytes_read、bytes_written、seconds 与 mb_per_s（读写总字节的吞吐量）。
+    """
+    if rasterio is None:
+        raise ImportError("rasterio is required to mosaic rasters.")
+    method = method.upper()
+    if method not in MOSAIC_METHODS:
+        raise ValueError(f"Unsupported mosaic method: {method}")
+    if not input_rasters:
+        raise ValueError("No input rasters to mosaic.")
+    workers = workers or os.cpu_count() or 1
+    block_size = max(16, block_size // 16 * 16)
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(workers) as pool:
+        infos = list(pool.map(_read_info, input_rasters))
+    if len({info.crs for info in infos}) > 1:
+        raise ValueError("Input rasters have different coordinate systems; reproject them first.")
+    if len({info.count for info in infos}) > 1:
+        raise ValueError("Input rasters have different band counts.")
+
+    transform, width, height = _output_grid(infos)
+    footprints = [_footprint(info, transform) for info in infos]
+    index = build_block_index(footprints, block_size)
+    dtype = np.dtype(dtype or infos[0].dtype)
+    if nodata is None:
+        nodata = infos[0].nodata
+    if nodata is None:
+        nodata = np.nan if dtype.kind == 'f' else 0
+    profile = dict(driver='GTiff', width=width, height=height, count=infos[0].count, dtype=dtype.name,
+                   crs=infos[0].crs, transform=transform, nodata=nodata, tiled=True,
+                   blockxsize=min(block_size, 512), blockysize=min(block_size, 512), compress=compress,
+                   BIGTIFF='IF_SAFER', NUM_THREADS=str(workers))
+
+    # 只处理与至少一个输入相交的块，其余块保持 NoData
+    windows = (window for window in iter_blocks(width, height, block_size)
+               if (window[1] // block_size, window[0] // block_size) in index)
+    handles = _HandleCache()
+    stats = {'blocks': 0, 'bytes_read': 0, 'bytes_written': 0}
+    try:
+        with rasterio.open(out_raster, 'w', **profile) as dst, ThreadPoolExecutor(workers) as pool:
+            def submit(window):
+                inputs = index[window[1] // block_size, window[0] // block_size]
+                return pool.submit(_mosaic_block, window, inputs, infos, footprints, transform, method, handles)
+
+            in_flight = deque(submit(window) for window in itertools.islice(windows, 2 * workers))
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    in_flight.remove(future)
+                    (col, row, w, h), result, bytes_read = future.result()
+                    result = np.where(np.isnan(result), nodata, result)
+                    if dtype.kind in 'iu':
+                        result = np.rint(result)
+                    result = result.astype(dtype, copy=False)
+                    dst.write(result, window=Window(col, row, w, h))
+                    stats['blocks'] += 1
+                    stats['bytes_read'] += bytes_read
+                    stats['bytes_written'] += result.nbytes
+                    for window in itertools.islice(windows, 1):
+                        in_flight.append(submit(window))
+    finally:
+        handles.close()
+
+    stats['seconds'] = time.perf_counter() - start
+    stats['mb_per_s'] = (stats['bytes_read'] + stats['bytes_written']) / 1e6 / max(stats['seconds'], 1e-9)
+    return stats
+
+
+__all__ = [
+    "MOSAIC_METHODS",
+    "build_block_index",
+    "mosaic_rasters",
+]
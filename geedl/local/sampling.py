@@ -0,0 +1,123 @@
+# geedl/local/sampling.py
+# 批量点采样：按栅格块对点排序，每个块只读取一次，一次性提取多个栅格的值并输出列式表
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    import rasterio
+    from rasterio.warp import transform as transform_coords
+    from rasterio.windows import Window
+except ImportError:
+    rasterio = None
+
+# 未使用栅格内部分块时的默认采样块边长（像元）
+DEFAULT_SAMPLE_BLOCK = 512
+
+
+def points_xy(points, x='x', y='y'):
+    """
+    将点统一为 (DataFrame, xs, ys, crs)。
+
+    支持 geopandas.GeoDataFrame（使用其点几何与坐标系）、带 x/y 列的 pandas.DataFrame 以及 (xs, ys) 二元组。
+    """
+    import pandas as pd  # 仅在采样时导入，避免拖慢 geedl.local 工具的导入
+
+    if isinstance(points, tuple) and len(points) == 2:
+        points = pd.DataFrame({x: np.asarray(points[0], dtype='float64'), y: np.asarray(points[1], dtype='float64')})
+    if hasattr(points, 'geometry') and hasattr(points, 'crs'):
+        return points, points.geometry.x.to_numpy(), points.geometry.y.to_numpy(), points.crs
+    return points, points[x].to_numpy(dtype='float64'), points[y].to_numpy(dtype='float64'), None
+
+
+def _column_names(path, count, names):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if names is not None:
+        return [names] if isinstance(names, str) else list(names)
+    return [stem] if count == 1 else [f"{stem}_b{band}" for band in range(1, count + 1)]
+
+
+def _sample_raster(path, xs, ys, points_crs, block_size):
+    """
+    在一个栅格上采样全部点：计算行列号，按块排序后逐块读取（每块一次）并向量化取值。
+
+    返回:
+        np.ndarray: 形状为 (波段数, 点数) 的数组，栅格外或 NoData 为 NaN。
+    """
+    with rasterio.open(path) as src:
+        if points_crs is not None and src.crs is not None and points_crs != src.crs:
+            xs, ys = (np.asarray(values) for values in transform_coords(points_crs, src.crs, xs, ys))
+        inverse = ~src.transform
+        cols, rows = inverse * (np.asarray(xs), np.asarray(ys))
+        cols, rows = np.floor(cols).astype(np.int64), np.floor(rows).astype(np.int64)
+        values = np.full((src.count, len(cols)), np.nan)
+        inside = np.flatnonzero((rows >= 0) & (rows < src.height) & (cols >= 0) & (cols < src.width))
+        if inside.size == 0:
+            return values
+
+        # 块大小取栅格内部分块（若为条带则取 DEFAULT_SAMPLE_BLOCK）
+        block_h, block_w = src.block_shapes[0]
+        if block_h < 16 or block_w < 16 or block_w == src.width:
+            block_h = block_w = block_size
+        block_rows, block_cols = rows[inside] // block_h, cols[inside] // block_w
+        order = np.lexsort((block_cols, block_rows))
+        inside, block_rows, block_cols = inside[order], block_rows[order], block_cols[order]
+        keys = block_rows * (src.width // block_w + 1) + block_cols
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)]
+
+        for start, end in zip(starts, ends):
+            row0, col0 = int(block_rows[start] * block_h), int(block_cols[start] * block_w)
+            window = Window(col0, row0, min(block_w, src.width - col0), min(block_h, src.height - row0))
+            block = src.read(window=window, masked=True).astype('float64').filled(np.nan)
+            members = inside[start:end]
+            values[:, members] = block[:, rows[members] - row0, cols[members] - col0]
+        return values
+
+
+def sample_points(points, rasters, x='x', y='y', names=None, block_size=DEFAULT_SAMPLE_BLOCK, workers=None,
+                  as_arrow=False):
+    """
+    批量提取点在多个栅格上的值。每个栅格只打开一次，点按栅格块排序后每个块只读取一次。
+
+    参数:
+        points: geopandas.GeoDataFrame、带 x/y 列的 pandas.DataFrame（坐标与栅格同一坐标系）或 (xs, ys)。
+        rasters (str 或 list): 栅格路径或路径列表。
+        x, y (str): DataFrame 中的坐标列名。默认 'x', 'y'。
+        names (list): 每个栅格的输出列名（多波段栅格为列名列表）。默认使用文件名（多波段加 _b1, _b2...）。
+        block_size (int): 栅格无内部分块时的采样块边长。默认 512。
+        workers (int): 并行处理栅格的线程数。默认 CPU 核数。
+        as_arrow (bool): 返回 pyarrow.Table 而非 pandas.DataFrame。默认 False。
+
+    返回:
+        pandas.DataFrame: 输入点的属性列加上每个栅格（波段）一列采样值，栅格外或 NoData 为 NaN。
+    """
+    import pandas as pd
+
+    if rasterio is None:
+        raise ImportError("rasterio is required to sample rasters.")
+    rasters = [rasters] if isinstance(rasters, str) else list(rasters)
+    names = names or [None] * len(rasters)
+    frame, xs, ys, crs = points_xy(points, x, y)
+
+    with ThreadPoolExecutor(workers or os.cpu_count() or 1) as pool:
+        results = list(pool.map(lambda path: _sample_raster(path, xs, ys, crs, block_size), rasters))
+
+    columns = {}
+    for path, values, raster_names in zip(rasters, results, names):
+        for name, column in zip(_column_names(path, values.shape[0], raster_names), values):
+            columns[name] = column
+    table = pd.concat([frame.reset_index(drop=True), pd.DataFrame(columns)], axis=1)
+    table.index = frame.index
+    if as_arrow:
+        import pyarrow
+        return pyarrow.Table.from_pandas(pd.DataFrame(table.drop(columns='geometry', errors='ignore')))
+    return table
+
+
+__all__ = [
+    "points_xy",
+    "sample_points",
+]
@@ -0,0 +1,141 @@
+# geedl/local/windowed.py
+# 分块（窗口）外存处理框架：带重叠边（halo）读取、线程池并行计算、写出分块 GeoTIFF，内存占用只与块大小有关
+
+import itertools
+import os
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+try:
+    import rasterio
+    from rasterio.windows import Window
+except ImportError:
+    rasterio = None
+
+# 默认块大小（像元），为 GeoTIFF 内部分块 (16 的倍数) 的整数倍
+DEFAULT_BLOCK_SIZE = 1024
+
+
+class Block(namedtuple('Block', ['col', 'row', 'width', 'height', 'halo', 'transform'])):
+    """
+    一个处理块：col/row/width/height 为核心区域在整幅栅格中的位置，
+    halo 为四周重叠的像元数，transform 为含 halo 的块数组左上角对应的仿射变换。
+    """
+    __slots__ = ()
+
+
+def iter_blocks(width, height, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    按行优先顺序生成覆盖整幅栅格的核心窗口 (col, row, width, height)。
+    """
+    for row in range(0, height, block_size):
+        for col in range(0, width, block_size):
+            yield col, row, min(block_size, width - col), min(block_size, height - row)
+
+
+def read_block(src, col, row, width, height, halo, band=1, dtype='float64'):
+    """
+    读取带 halo 的块，NoData 替换为 NaN；超出栅格范围的 halo 按最近像元外推（与整幅数组的边缘处理一致）。
+    """
+    col0, row0 = max(col - halo, 0), max(row - halo, 0)
+    col1, row1 = min(col + width + halo, src.width), min(row + height + halo, src.height)
+    data = src.read(band, window=Window(col0, row0, col1 - col0, row1 - row0), masked=True)
+    data = data.astype(dtype).filled(np.nan)
+    pad = ((row0 - (row - halo), (row + height + halo) - row1), (col0 - (col - halo), (col + width + halo) - col1))
+    if any(pad[0]) or any(pad[1]):
+        data = np.pad(data, pad, mode='edge')
+    return data
+
+
+def process_raster(in_raster, out_raster, func, halo=0, block_size=DEFAULT_BLOCK_SIZE, workers=None,
+                   dtype='float32', nodata=None, band=1, compress='deflate'):
+    """
+    逐块处理单波段栅格并写出为分块 GeoTIFF，整幅栅格不会同时载入内存。
+
+    参数:
+        in_raster (str): 输入栅格路径。
+        out_raster (str): 输出栅格路径。
+        func (callable): func(block_array, block) -> 数组。block_array 为含 halo 的 float64 块（NoData 为 NaN），
+                         block 为 Block 信息；返回与 block_array 同形状（将自动裁去 halo）或核心区域形状的数组。
+        halo (int): 邻域运算需要的重叠像元数，如 3x3 模板为 1。默认 0。
+        block_size (int): 块边长（像元）。默认 1024。
+        workers (int): 并行线程数。默认 CPU 核数。
+        dtype (str): 输出数据类型。默认 'float32'。
+        nodata (float): 输出 NoData 值。默认沿用输入的 NoData（无则浮点型为 NaN）。
+        band (int): 处理的输入波段。默认 1。
+        compress (str): 输出压缩方式。默认 'deflate'。
+
+    返回:
+        str: 输出栅格路径。
+    """
+    if rasterio is None:
+        raise ImportError("rasterio is required for windowed processing.")
+    workers = workers or os.cpu_count() or 1
+    block_size = max(16, block_size // 16 * 16)
+    dtype = np.dtype(dtype)
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+
+    def source():
+        # rasterio 数据集不是线程安全的：每个线程各自打开一个句柄
+        if not hasattr(local, 'src'):
+            local.src = rasterio.open(in_raster)
+            with handles_lock:
+                handles.append(local.src)
+        return local.src
+
+    with rasterio.open(in_raster) as src:
+        profile = src.profile.copy()
+        transform = src.transform
+        width, height = src.width, src.height
+    if nodata is None:
+        nodata = profile.get('nodata')
+    if nodata is None or (dtype.kind in 'iu' and np.isnan(nodata)):
+        nodata = np.nan if dtype.kind == 'f' else 0
+    profile.update(driver='GTiff', count=1, dtype=dtype.name, nodata=nodata, tiled=True,
+                   blockxsize=min(block_size, 512), blockysize=min(block_size, 512), compress=compress,
+                   BIGTIFF='IF_SAFER')
+
+    def run(window):
+        col, row, w, h = window
+        data = read_block(source(), col, row, w, h, halo, band)
+        block = Block(col, row, w, h, halo, transform * transform.translation(col - halo, row - halo))
+        result = np.asarray(func(data, block))
+        if result.shape == data.shape and halo:
+            result = result[halo:halo + h, halo:halo + w]
+        if result.dtype.kind == 'f':
+            result = np.where(np.isnan(result), nodata, result)
+        if dtype.kind in 'iu':
+            result = np.rint(result)
+        return window, result.astype(dtype, copy=False)
+
+    windows = iter_blocks(width, height, block_size)
+    try:
+        with rasterio.open(out_raster, 'w', **profile) as dst, ThreadPoolExecutor(workers) as pool:
+            # 在途块数有上限，峰值内存约为 2 * workers 个块
+            in_flight = deque(pool.submit(run, window) for window in itertools.islice(windows, 2 * workers))
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    in_flight.remove(future)
+                    (col, row, w, h), result = future.result()
+                    dst.write(result, 1, window=Window(col, row, w, h))
+                    for window in itertools.islice(windows, 1):
+                        in_flight.append(pool.submit(run, window))
+    finally:
+        for handle in handles:
+            handle.close()
+    return out_raster
+
+
+__all__ = [
+    "DEFAULT_BLOCK_SIZE",
+    "Block",
+    "iter_blocks",
+    "read_block",
+    "process_raster",
+]
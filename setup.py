@@ -18,6 +18,7 @@ setup(
     author_email='zhanglei1136@163.com',
     url='https://github.com/gogo-zl/geedl',
     packages=find_packages(), 
+    package_data={'geedl.cloud': ['data/*.json']},
     install_requires=[
         'numpy',              
         'earthengine-api',     